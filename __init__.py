@@ -27,24 +27,30 @@ If you want to contact the author, please send an email to aethergeoofficial@gma
 
 import sys
 import os
+from collections import OrderedDict
 import numpy as np
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QHBoxLayout, QPushButton, QLabel, QCheckBox,
                             QFileDialog, QToolBar, QListWidget, QListWidgetItem,
                             QMessageBox, QStackedWidget, QScrollArea, QSizePolicy, 
-                            QMenu
+                            QMenu, QProgressBar
                             )
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import Qt, QTimer, QSize
 
 from preprocessing_control_view.wavelength_assignment import WavelengthsControlsView
 from preprocessing_control_view.normalization import NormalizationControlsView
+from preprocessing_control_view.normalization_engine import create_scaler, normalize_pixels, scaler_from_json, scaler_to_json
+from preprocessing_control_view.pixel_normalization import DEFAULT_THREADS as NORMALIZATION_THREADS
+from preprocessing_control_view.continuum_removal_control_view import ContinuumRemovalControlsView
+from preprocessing_control_view.continuum_removal import ContinuumRemovalOperations, shutdown_process_pool
 
 from dim_red_control_view.dim_red_control_view import DimRedFunctionControlsView
 from dim_red_control_view.pca_reduction import PCAOperations
 from dim_red_control_view.ica_reduction import ICAOperations
 from dim_red_control_view.nmf_reduction import NMFOperations
+from dim_red_control_view.mnf_reduction import MNFOperations
 
 from endmember_extraction_control_view.point_cloud_control_view import PointCloudControlsView
 from endmember_extraction_control_view.point_cloud import PointCloudOperations
@@ -67,11 +73,20 @@ from spectra_analyst_window.spectra_analyst_window import SpectraAnalystWindow
 
 from others_control_view.band_ratios_control_view import BandRatiosControlsView
 
-from image_manipulation import manipulation, loading
+from image_manipulation import loading
+from image_manipulation.background_loading import ImageLoader
+from image_manipulation.background_saving import ImageSaver
+from image_manipulation.background_tasks import TaskRunner
+from image_manipulation.gather_scatter import gather_pixels
+from image_manipulation.image_store import ImageStore
+from image_manipulation.result_store import ResultStore
+from image_manipulation.tiled_reading import read_overview_bip
+from image_manipulation.working_dtype import get_working_dtype
 
 from image_configs.band_selection_panel import BandSelectionPanel
 from image_configs.image_adjustment_panel import ImageAdjustmentPanel
 from image_configs.metadata_dialog_panel import MetadataDialog
+from image_configs.result_cache_dialog import ResultCacheDialog
 
 from gl_widget import ImageGLWidget
 
@@ -114,6 +129,28 @@ class ImageListItem(QWidget):
                 return parent
             parent = parent.parentWidget()
         return None
+
+class LoadingListItem(QWidget):
+    """Row shown while an image is loading (or being saved) in the background: name, progress and cancel button"""
+    def __init__(self, image_name, path, cancel_callback, parent=None, cancel_tooltip="Cancel loading"):
+        super().__init__(parent)
+        self.path = path
+        layout = QHBoxLayout()
+        layout.setContentsMargins(5, 2, 5, 2)
+
+        self.name_label = QLabel(image_name)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setFixedWidth(60)
+        self.cancel_btn = QPushButton("x")
+        self.cancel_btn.setFixedSize(20, 20)
+        self.cancel_btn.setToolTip(cancel_tooltip)
+        self.cancel_btn.clicked.connect(lambda: cancel_callback(self.path))
+
+        layout.addWidget(self.name_label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.cancel_btn)
+        self.setLayout(layout)
        
 class FunctionListItem(QWidget):
     """Main widget listing available analysis functions"""
@@ -157,6 +194,7 @@ class FunctionListItem(QWidget):
         layout.addWidget(pre_process_functions_label)
         
         self.add_function_button("Data Normalization", self.show_normalization_controls)
+        self.add_function_button("Continuum Removal", self.show_continuum_removal_controls)
         self.add_function_button("Attribute Wavelengths", self.show_wavelengths_controls)
         
         Dim_Red_functions_label = QLabel("Dimensionality Reduction")
@@ -167,6 +205,7 @@ class FunctionListItem(QWidget):
         self.add_function_button("Principal Component Analysis", self.show_pca_controls)
         self.add_function_button("Independent Component Analysis", self.show_ica_controls)
         self.add_function_button("Non-negative Matrix Factorization", self.show_nmf_controls)
+        self.add_function_button("Minimum Noise Fraction", self.show_mnf_controls)
         
         End_Extract_functions_label = QLabel("Endmember Extraction")
         End_Extract_functions_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -236,6 +275,10 @@ class FunctionListItem(QWidget):
         """Show normalization control view."""
         self.show_function_controls("Data Normalization")
 
+    def show_continuum_removal_controls(self):
+        """Show continuum removal control view."""
+        self.show_function_controls("Continuum Removal")
+
     def show_wavelengths_controls(self):
         """Show wavelength assignment control view"""
         self.show_function_controls("Wavelengths from Satellite")
@@ -252,6 +295,10 @@ class FunctionListItem(QWidget):
         """Show NMF control view"""
         self.show_function_controls("NMF")
 
+    def show_mnf_controls(self):
+        """Show MNF control view"""
+        self.show_function_controls("MNF")
+
     def show_ppi_controls(self):
         """Show Pixel Purity Index control view"""
         self.show_function_controls("Pixel Purity Index")
@@ -315,6 +362,13 @@ class FunctionListItem(QWidget):
                 parent=self,
                 run_callback=run_callback
         )
+        elif function_name == "Continuum Removal":
+            run_callback = self.run_continuum_removal
+            control_view = ContinuumRemovalControlsView(
+                function_name=function_name,
+                parent=self,
+                run_callback=run_callback
+        )
         elif function_name == "Wavelengths from Satellite":
             run_callback = self.run_wavelengths  
             control_view = WavelengthsControlsView(
@@ -343,6 +397,13 @@ class FunctionListItem(QWidget):
             parent=self,  
             run_callback=run_callback
         )
+        elif function_name == "MNF":
+            run_callback = self.run_mnf
+            control_view = DimRedFunctionControlsView(
+            function_name=function_name,
+            parent=self,  
+            run_callback=run_callback
+        )
         elif function_name == "Pixel Purity Index":   
             run_callback = self.run_ppi
             control_view = PixelPurityIdxControlView(
@@ -421,14 +482,17 @@ class FunctionListItem(QWidget):
         """Return to main function menu"""
         self.stack.setCurrentWidget(self.main_scroll_area)
 
-    def run_normalization(self, path, mask_path):
-        """Execute pixel-wise Min-Max normalization to [0, 1]."""
+    def run_normalization(self, path, mask_path, method='pixel_minmax', scaler=None):
+        """
+        Execute a normalization (pixel-wise Min-Max to [0, 1] by default, see normalization_engine).
+        scaler = already fitted scaler (loaded parameters); otherwise the statistics
+        of method are computed on the selected image.
+        """
         try:
             main_window = self.parent
             image_data = main_window.image_data[path]
-            array = image_data["array"]  
             metadata = image_data["metadata"]
-            rows, cols, bands = array.shape
+            rows, cols = metadata["rows"], metadata["cols"]
 
             if mask_path and mask_path in main_window.image_data:
                 mask_data = main_window.image_data[mask_path]
@@ -439,26 +503,38 @@ class FunctionListItem(QWidget):
             else:
                 non_masked_indices = image_data["non_masked_indices"]
 
-            masked = manipulation.apply_mask(array, non_masked_indices)
-            masked.sort(key=lambda x: x[0])  
-            img_2d = np.column_stack([band_values for _, band_values in masked])  
+            result_store = main_window.result_store
+            if scaler is None:
+                scaler = create_scaler(method)
+            else:
+                scaler.check_bands(metadata["bands"])
+            
+            def normalize():
+                img_2d = gather_pixels(image_data["array"], non_masked_indices)  # (n_pixels, bands)
 
-            #--- Pixel-wise Min-Max scaling to [0, 1] ---
-            min_vals = img_2d.min(axis=1, keepdims=True)
-            max_vals = img_2d.max(axis=1, keepdims=True)
-            range_vals = max_vals - min_vals
-            range_vals[range_vals == 0] = 1  # Avoid division by zero for flat pixels
-            img_normalized = (img_2d - min_vals) / range_vals
+                #--- Statistics in one streaming pass (unless loaded), then scaling in place, block by block ---
+                normalize_pixels(scaler, img_2d, n_threads=NORMALIZATION_THREADS)
+                return img_2d, {"scaler": scaler_to_json(scaler)}, None
 
-            img_normalized = img_normalized.T  
+            result_key = result_store.key(path, f"{scaler.label} normalization", scaler.params, non_masked_indices)
+            img_normalized = result_store.get_or_compute(result_key, normalize)
+            if not scaler.fitted:
+                # Reused from the store: the fitted parameters are kept with the pixels
+                scaler = scaler_from_json(img_normalized.attrs["scaler"])
 
             control_view = self.control_views["Data Normalization"].widget()
             control_view.result_data = img_normalized
+            control_view.fitted_scaler = scaler
 
-            QMessageBox.information(self, "Success", "Pixel normalization to [0, 1] completed!")
+            QMessageBox.information(self, "Success", f"{scaler.label} completed!")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Normalization failed: {str(e)}")
+
+    def run_continuum_removal(self, path, mask_path):
+        """Delegate continuum removal to ContinuumRemovalOperations class"""
+        self.continuum_removal_operations = ContinuumRemovalOperations(self)
+        self.continuum_removal_operations.execute(path, mask_path)
     
     def run_wavelengths(self, path, satellite):
         """Placeholder for satellite wavelength assignment"""
@@ -511,20 +587,25 @@ class FunctionListItem(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Wavelength assignment failed: {str(e)}")
     
-    def run_pca(self, path, n_components):
+    def run_pca(self, path, n_components, streaming=None, solver="auto", **options):
         """Delegate PCA execution to PCAOperations class"""
         self.pca_operations = PCAOperations(self)
-        self.pca_operations.execute(path, n_components)
+        self.pca_operations.execute(path, n_components, streaming, solver, **options)
 
-    def run_ica(self, path, n_components):
+    def run_ica(self, path, n_components, **options):
         """Delegate ICA execution to ICAOperations class"""
         self.ica_operations = ICAOperations(self)
-        self.ica_operations.execute(path, n_components)
+        self.ica_operations.execute(path, n_components, **options)
 
-    def run_nmf(self, path, n_components):
+    def run_nmf(self, path, n_components, **options):
         """Delegate NMF execution to ICAOperations class"""
         self.nmf_operations = NMFOperations(self)
-        self.nmf_operations.execute(path, n_components)
+        self.nmf_operations.execute(path, n_components, **options)
+
+    def run_mnf(self, path, n_components, **options):
+        """Delegate MNF execution to MNFOperations class"""
+        self.mnf_operations = MNFOperations(self)
+        self.mnf_operations.execute(path, n_components, **options)
     
     def run_point_cloud(self, path, mask_path, ppi_path):
         """Delegate point cloud generation to PointCloudOperations class"""
@@ -585,12 +666,7 @@ class FunctionListItem(QWidget):
             metadata = image_data["metadata"]
             non_masked_indices = image_data["non_masked_indices"]
             
-            masked_data = manipulation.extract_bands(array, non_masked_indices)
-            
-            if isinstance(masked_data[0], np.ndarray): 
-                masked_array = np.array(masked_data)
-            else:  # Single-band (reshape to 2D)
-                masked_array = np.array(masked_data).reshape(-1, 1)
+            masked_array = gather_pixels(array, non_masked_indices)
 
             if masked_array.ndim != 2:
                 raise ValueError("Masked array must be 2D (n_pixels, n_bands)")
@@ -606,14 +682,14 @@ class FunctionListItem(QWidget):
             band_arrays = {}
             for b in bands_used:
                 band_idx = b - 1  # 0-based index
-                band_data = masked_array[:, band_idx].astype(float)
+                band_data = masked_array[:, band_idx].astype(get_working_dtype(), copy=False)
                 band_arrays[f'B{b}'] = band_data
 
             with np.errstate(divide='ignore', invalid='ignore'):
                 result = eval(equation, {'__builtins__': None}, band_arrays)
                 result = np.squeeze(result)  
             
-            result = np.nan_to_num(result, nan=0.0, posinf=0.0, neginf=0.0)
+            result = np.nan_to_num(result, nan=0.0, posinf=0.0, neginf=0.0).astype(get_working_dtype(), copy=False)
 
             control_view = self.control_views["Band Ratios"].widget()
             control_view.result_data = result
@@ -629,8 +705,38 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("AetherGeo")
         self.setGeometry(5, 50, 1900, 900)
         self.image_paths = []
-        self.image_data = {}
+        # LRU store with a RAM budget: evicted cubes are reloaded from their file on access
+        self.image_data = ImageStore()
+        # Decoded display overviews of GeoTIFFs, (path, bands) -> array or None, least recently used first
+        self.overview_cache = OrderedDict()
+        self.overview_cache_size = 8
+        # Intermediate results, kept on disk between sessions so analyses are not recomputed
+        self.result_store = ResultStore()
         self.band_indices = {}
+        self.loading_items = {}
+
+        # Images are loaded on a thread pool; image_data is only filled once a file is ready
+        self.image_loader = ImageLoader(self.process_image, parent=self)
+        self.image_loader.progress.connect(self.on_image_load_progress)
+        self.image_loader.loaded.connect(self.on_image_loaded)
+        self.image_loader.failed.connect(self.on_image_load_failed)
+        self.image_loader.cancelled.connect(self.on_image_load_cancelled)
+
+        # Results are written by a background queue too, so saving never freezes the window
+        self.saving_items = {}
+        self.image_saver = ImageSaver(parent=self)
+        self.image_saver.progress.connect(self.on_image_save_progress)
+        self.image_saver.saved.connect(self.on_image_saved)
+        self.image_saver.failed.connect(self.on_image_save_failed)
+        self.image_saver.cancelled.connect(self.on_image_save_cancelled)
+
+        # Long analysis operations run on a background queue too, listed with the loads and saves
+        self.task_items = {}
+        self.task_runner = TaskRunner(parent=self)
+        self.task_runner.progress.connect(self.on_task_progress)
+        self.task_runner.finished.connect(self.on_task_finished)
+        self.task_runner.failed.connect(self.on_task_failed)
+        self.task_runner.cancelled.connect(self.on_task_cancelled)
 
         self.toolbar = QToolBar()
         self.toolbar.setStyleSheet("""
@@ -724,10 +830,19 @@ class MainWindow(QMainWindow):
         browse_btn.clicked.connect(self.browse_files)
         left_layout.addWidget(browse_btn)
 
+        self.loading_list = QListWidget()
+        self.loading_list.setMaximumHeight(120)
+        self.loading_list.hide()
+        left_layout.addWidget(self.loading_list)
+
         self.image_list = QListWidget()
         self.image_list.itemClicked.connect(self.on_image_select)
         left_layout.addWidget(self.image_list)
 
+        result_cache_btn = QPushButton("Result Cache")
+        result_cache_btn.clicked.connect(self.result_cache_settings)
+        left_layout.addWidget(result_cache_btn)
+
         right_panel = QWidget()
         right_panel.setFixedWidth(300) 
         right_layout = QVBoxLayout(right_panel)
@@ -780,6 +895,10 @@ class MainWindow(QMainWindow):
         """Show license information"""
         self.license_window = LicenseWindow(self)
         self.license_window.show()
+
+    def result_cache_settings(self):
+        """Result store settings: enable/disable, disk budget and clearing it"""
+        ResultCacheDialog(self.result_store, self).exec()
     
     def update_display_image(self):
         current_path = None
@@ -794,16 +913,14 @@ class MainWindow(QMainWindow):
             self.gl_widget.setImageData(None)
             return
 
-        image_array = self.image_data[current_path]['array']
-
         if current_path in self.band_indices:
             indices = self.band_indices[current_path]
             r_idx = indices['R'] - 1
             g_idx = indices['G'] - 1
             b_idx = indices['B'] - 1
-            image = image_array[:, :, [r_idx, g_idx, b_idx]]
+            image = self.display_array(current_path, [r_idx, g_idx, b_idx])
         else:
-            image = image_array
+            image = self.display_array(current_path)
 
         sat = float(self.adjust_panel.saturation_value.text()) if self.adjust_panel.isVisible() else 1.5
         gamma = float(self.adjust_panel.gamma_value.text()) if self.adjust_panel.isVisible() else 0.7
@@ -815,6 +932,42 @@ class MainWindow(QMainWindow):
         data = (non_masked_indices, image)
         self.gl_widget.setImageData(data)
     
+    def display_array(self, path, bands=None):
+        """
+        Bands of path to show in the GL widget. GeoTIFFs with internal overviews (e.g. COG exports)
+        are read at the overview level that fits the texture instead of at full resolution,
+        for the loaded subset only. Overviews are cached per (path, bands), so refreshing
+        the display (adjustments, band sliders) does not reopen the file.
+        """
+        if os.path.splitext(path)[1].lower() in ('.tif', '.tiff'):
+            key = (path, None if bands is None else tuple(bands))
+            if key in self.overview_cache:
+                self.overview_cache.move_to_end(key)
+                overview = self.overview_cache[key]
+            else:
+                overview = self.read_overview(path, bands)
+                self.overview_cache[key] = overview
+                while len(self.overview_cache) > self.overview_cache_size:
+                    self.overview_cache.popitem(last=False)
+            if overview is not None:
+                return overview
+
+        image_array = self.image_data[path]['array']
+        return image_array if bands is None else image_array[:, :, bands]
+
+    def read_overview(self, path, bands):
+        """Overview of the loaded subset of a GeoTIFF (see display_array), or None to use the array"""
+        subset = self.image_data[path].get('subset')
+        window = None
+        if subset is not None:
+            window = subset.window
+            bands = subset.file_bands(bands)
+        try:
+            return read_overview_bip(path, bands, self.gl_widget.max_tex_size, window)
+        except Exception as e:
+            print(f"Could not read overview, using full resolution: {str(e)}")
+            return None
+
     def update_image_adjustments(self):
         self.update_display_image()
     
@@ -839,38 +992,37 @@ class MainWindow(QMainWindow):
         super().showEvent(event)
         self.update_panel_position()
 
+    def closeEvent(self, event):
+        if self.saving_items:
+            answer = QMessageBox.question(self, "Saving", "Some results are still being saved. Cancel them and quit?")
+            if answer != QMessageBox.StandardButton.Yes:
+                event.ignore()
+                return
+        self.image_saver.cancel_all()
+        self.image_loader.cancel_all()
+        self.task_runner.cancel_all()
+        self.image_saver.wait()
+        self.image_loader.wait()
+        self.task_runner.wait()
+        shutdown_process_pool()
+        self.result_store.close()
+        super().closeEvent(event)
+
     def browse_files(self):
-        file_name, _ = QFileDialog.getOpenFileName(
+        file_names, _ = QFileDialog.getOpenFileNames(
             self,
             "Select Image",
             "",
             "Image Files (*.hdr *.tif *.tiff *.he5);;All Files (*)"
         )
-        if file_name:
+        for file_name in file_names:
             self.process_and_display_image(file_name)
 
-    def process_image(self, file_path):
-        image_tuple = loading.normal_image_load(file_path)
-        raw_metadata = loading.metadata_extract(file_path)
-        
-        non_masked_indices = image_tuple[0]
-        image_array = image_tuple[1]
-        # Convert tuple to structured dictionary
-        metadata = {
-            'map_info': raw_metadata[0],
-            'coordinates': raw_metadata[1],
-            'cols': raw_metadata[2],
-            'rows': raw_metadata[3],
-            'bands': raw_metadata[4],
-            'interleave': raw_metadata[5],
-            'wavelengths': raw_metadata[6],
-            'pixel_size_x': raw_metadata[7],
-            'pixel_size_y': raw_metadata[8],
-            'x_origin': raw_metadata[9],
-            'y_origin': raw_metadata[10],
-        }
-        
-        return image_array, metadata, non_masked_indices
+    def process_image(self, file_path, progress_callback=None):
+        """Runs on a loader thread: must not touch any widget"""
+        # Data, mask and metadata all come from a single open of the file
+        record = loading.load_image(file_path, progress_callback)
+        return record.array, record.metadata.as_dict(), record.mask, record.subset
     
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -933,28 +1085,155 @@ class MainWindow(QMainWindow):
                 self.adjust_panel.hide()
 
     def process_and_display_image(self, file_path):
-        if file_path not in self.image_paths:
-            try:
-                image_array, metadata, non_masked_indices = self.process_image(file_path)
-                self.image_data[file_path] = {
-                    'array': image_array,
-                    'metadata': metadata,
-                    'non_masked_indices': non_masked_indices
-                }
-                self.image_paths.append(file_path)
-                
-                item = QListWidgetItem(self.image_list)
-                item_widget = ImageListItem(os.path.basename(file_path), file_path)
-                item.setSizeHint(item_widget.sizeHint())
-                self.image_list.addItem(item)
-                self.image_list.setItemWidget(item, item_widget)
-                
-                item_widget.selection_toggle.stateChanged.connect(
-                    lambda state, path=file_path: self.handle_image_selection(state, path)
-                )
-                    
-            except Exception as e:
-                print(f"Error loading image: {str(e)}")
+        """Starts loading file_path in the background; the image is listed once it is ready"""
+        if file_path in self.image_paths or self.image_loader.is_loading(file_path):
+            return
+        
+        item = QListWidgetItem(self.loading_list)
+        item_widget = LoadingListItem(os.path.basename(file_path), file_path, self.image_loader.cancel)
+        item.setSizeHint(item_widget.sizeHint())
+        self.loading_list.addItem(item)
+        self.loading_list.setItemWidget(item, item_widget)
+        self.loading_list.show()
+        self.loading_items[file_path] = (item, item_widget)
+
+        self.image_loader.load(file_path)
+
+    def on_image_load_progress(self, file_path, percent):
+        if file_path in self.loading_items:
+            self.loading_items[file_path][1].progress_bar.setValue(percent)
+
+    def on_image_loaded(self, file_path, result):
+        self.remove_loading_item(file_path)
+        image_array, metadata, non_masked_indices, subset = result
+        self.image_data[file_path] = {
+            'array': image_array,
+            'metadata': metadata,
+            'non_masked_indices': non_masked_indices,
+            'subset': subset
+        }
+        self.image_paths.append(file_path)
+        
+        item = QListWidgetItem(self.image_list)
+        item_widget = ImageListItem(os.path.basename(file_path), file_path)
+        item.setSizeHint(item_widget.sizeHint())
+        self.image_list.addItem(item)
+        self.image_list.setItemWidget(item, item_widget)
+        
+        item_widget.selection_toggle.stateChanged.connect(
+            lambda state, path=file_path: self.handle_image_selection(state, path)
+        )
+
+    def on_image_load_failed(self, file_path, message):
+        self.remove_loading_item(file_path)
+        print(f"Error loading image: {message}")
+        QMessageBox.warning(self, "Error", f"Could not load {os.path.basename(file_path)}:\n{message}")
+
+    def on_image_load_cancelled(self, file_path):
+        self.remove_loading_item(file_path)
+
+    def remove_loading_item(self, file_path):
+        if file_path not in self.loading_items:
+            return
+        
+        item, _ = self.loading_items.pop(file_path)
+        self.remove_list_item(item)
+
+    def remove_list_item(self, item):
+        """Takes a row out of the background work list, hidden once nothing is running"""
+        self.loading_list.takeItem(self.loading_list.row(item))
+        if not self.loading_items and not self.saving_items and not self.task_items:
+            self.loading_list.hide()
+
+    def save_in_background(self, output_path, save_function, *args, success_message=None, **kwargs):
+        """
+        Hands a save (e.g. saving.save_pixels) to the background writer queue and lists it
+        with a progress bar; success_message is shown once the file is written.
+        """
+        if self.image_saver.is_saving(output_path):
+            QMessageBox.warning(self, "Error", f"{os.path.basename(output_path)} is already being saved.")
+            return False
+        
+        item = QListWidgetItem(self.loading_list)
+        item_widget = LoadingListItem(f"Saving {os.path.basename(output_path)}", output_path,
+                                      self.image_saver.cancel, cancel_tooltip="Cancel saving")
+        item.setSizeHint(item_widget.sizeHint())
+        self.loading_list.addItem(item)
+        self.loading_list.setItemWidget(item, item_widget)
+        self.loading_list.show()
+        self.saving_items[output_path] = (item, item_widget, success_message)
+
+        return self.image_saver.save(output_path, save_function, *args, **kwargs)
+
+    def on_image_save_progress(self, output_path, percent):
+        if output_path in self.saving_items:
+            self.saving_items[output_path][1].progress_bar.setValue(percent)
+
+    def on_image_saved(self, output_path, saved_path):
+        message = self.remove_saving_item(output_path)
+        QMessageBox.information(self, "Success", message or f"{os.path.basename(saved_path)} saved successfully!")
+
+    def on_image_save_failed(self, output_path, message):
+        self.remove_saving_item(output_path)
+        print(f"Error saving image: {message}")
+        QMessageBox.critical(self, "Error", f"Failed to save {os.path.basename(output_path)}:\n{message}")
+
+    def on_image_save_cancelled(self, output_path):
+        self.remove_saving_item(output_path)
+
+    def remove_saving_item(self, output_path):
+        """Removes the row of a finished save and returns its success message."""
+        if output_path not in self.saving_items:
+            return None
+        
+        item, _, success_message = self.saving_items.pop(output_path)
+        self.remove_list_item(item)
+        return success_message
+
+    def run_in_background(self, name, work, on_finished):
+        """
+        Runs work(progress_callback) on the background task queue, listed as name with a
+        progress bar and a cancel button; on_finished(result) is called on the GUI thread.
+        """
+        if self.task_runner.is_running(name):
+            QMessageBox.warning(self, "Error", f"{name} is already running.")
+            return False
+        
+        item = QListWidgetItem(self.loading_list)
+        item_widget = LoadingListItem(name, name, self.task_runner.cancel, cancel_tooltip="Cancel")
+        item.setSizeHint(item_widget.sizeHint())
+        self.loading_list.addItem(item)
+        self.loading_list.setItemWidget(item, item_widget)
+        self.loading_list.show()
+        self.task_items[name] = (item, item_widget, on_finished)
+
+        return self.task_runner.submit(name, work)
+
+    def on_task_progress(self, name, percent):
+        if name in self.task_items:
+            self.task_items[name][1].progress_bar.setValue(percent)
+
+    def on_task_finished(self, name, result):
+        on_finished = self.remove_task_item(name)
+        if on_finished is not None:
+            on_finished(result)
+
+    def on_task_failed(self, name, message):
+        self.remove_task_item(name)
+        print(f"Error in {name}: {message}")
+        QMessageBox.critical(self, "Error", f"{name} failed: {message}")
+
+    def on_task_cancelled(self, name):
+        self.remove_task_item(name)
+
+    def remove_task_item(self, name):
+        """Removes the row of a finished task and returns its on_finished callback."""
+        if name not in self.task_items:
+            return None
+        
+        item, _, on_finished = self.task_items.pop(name)
+        self.remove_list_item(item)
+        return on_finished
 
     def on_image_select(self, item):
         item_widget = self.image_list.itemWidget(item)
@@ -1000,8 +1279,7 @@ class MainWindow(QMainWindow):
             g_idx = self.band_indices[current_path]['G'] - 1
             b_idx = self.band_indices[current_path]['B'] - 1
             
-            image_array = self.image_data[current_path]['array']
-            composite = image_array[:, :, [r_idx, g_idx, b_idx]]
+            composite = self.display_array(current_path, [r_idx, g_idx, b_idx])
             non_masked_indices = self.image_data[current_path]['non_masked_indices']
             data = (non_masked_indices,composite)
             self.gl_widget.setImageData(data)
@@ -34,7 +34,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
 
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
 
 class KMeansOperations:
     def __init__(self, parent):
@@ -49,7 +49,6 @@ class KMeansOperations:
         """Execute K-Means with given parameters"""
         try:
             image_data = self.main_window.image_data[path]
-            array = image_data["array"]
             metadata = image_data["metadata"]
             # Default: use the image's own non_masked_indices
             non_masked_indices = image_data["non_masked_indices"]
@@ -66,11 +65,12 @@ class KMeansOperations:
                         QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")    
                         return
             
-            masked_array = manipulation.retrieve_reduction_on_ppi(array, non_masked_indices)
+            result_store = self.main_window.result_store
+            result_key = result_store.key(path, "K-means", {"n_components": n_components}, non_masked_indices)
+            labels = result_store.get_or_compute(
+                result_key, lambda: self.k_means(gather_pixels(image_data["array"], non_masked_indices), n_components))
             
-            labels = self.k_means(masked_array, n_components)
-            
-            canvas = self.k_means_finalwindow(labels)
+            canvas = self.k_means_finalwindow(np.asarray(labels))
             dialog = QDialog(self.parent)
             dialog.setWindowTitle("K-means Results")
             QVBoxLayout(dialog).addWidget(canvas)
@@ -34,7 +34,7 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
 
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
 
 class OPTICSOperations:
     def __init__(self, parent):
@@ -49,7 +49,6 @@ class OPTICSOperations:
         """Execute OPTICS with given parameters"""
         try:
             image_data = self.main_window.image_data[path]
-            array = image_data["array"]
             metadata = image_data["metadata"]
             # Default: use the image's own non_masked_indices
             non_masked_indices = image_data["non_masked_indices"]
@@ -66,11 +65,13 @@ class OPTICSOperations:
                         QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")    
                         return
             
-            masked_array = manipulation.retrieve_reduction_on_ppi(array, non_masked_indices)
+            result_store = self.main_window.result_store
+            result_key = result_store.key(path, "OPTICS", {"min_samples": min_samples, "xi": xi, "min_cluster_size": min_cluster_size}, non_masked_indices)
+            labels = result_store.get_or_compute(
+                result_key,
+                lambda: self.optics(gather_pixels(image_data["array"], non_masked_indices), min_samples, xi, min_cluster_size))
             
-            labels = self.optics(masked_array, min_samples, xi, min_cluster_size)
-            
-            canvas = self.optics_finalwindow(labels)
+            canvas = self.optics_finalwindow(np.asarray(labels))
             dialog = QDialog(self.parent)
             dialog.setWindowTitle("OPTICS Results")
             QVBoxLayout(dialog).addWidget(canvas)
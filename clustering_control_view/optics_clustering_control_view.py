@@ -26,7 +26,6 @@ If you want to contact the author, please send an email to aethergeoofficial@gma
 """
 
 import os
-import numpy as np
 
 from PyQt6.QtCore import Qt, QLocale
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QComboBox, QMessageBox, QFileDialog, QSpinBox, QDoubleSpinBox
@@ -158,7 +157,7 @@ class OPTICSControlsView(QWidget):
                 self,
                 "Save Results",
                 "",
-                "TIF Files (*.tif);;All Files (*.*)"
+                "TIF Files (*.tif);;ENVI Files (*.hdr);;All Files (*.*)"
             )
             if not output_path:
                 return
@@ -181,26 +180,14 @@ class OPTICSControlsView(QWidget):
                     non_masked_indices = self.parent.parent.image_data[selected_mask]["non_masked_indices"]
                 
                 if hasattr(self, 'result_data'):
-                    reconstructed = np.full((metadata["rows"], metadata["cols"]), np.nan)
-                    for idx, (row, col) in enumerate(non_masked_indices):
-                        if idx < len(self.result_data):  # Ensure we don't go out of bounds
-                            reconstructed[row, col] = self.result_data[idx]
-                    
-                    saving.save_image(
+                    self.parent.parent.save_in_background(
                         output_path,
-                        reconstructed,
-                        metadata["map_info"],
-                        metadata["coordinates"],
-                        metadata["cols"],
-                        metadata["rows"],
-                        metadata["pixel_size_x"],
-                        metadata["pixel_size_y"],
-                        metadata["x_origin"],
-                        metadata["y_origin"],
-                        wavelengths=None
+                        saving.save_pixels,
+                        self.result_data,
+                        non_masked_indices,
+                        metadata,
+                        success_message=f"{self.function_name} results saved successfully!"
                     )
-                    
-                    QMessageBox.information(self, "Success", f"{self.function_name} results saved successfully!")
                 else:
                     QMessageBox.warning(self, "Error", "No results available to save. Please run the analysis first.")
                         
@@ -28,9 +28,16 @@ If you want to contact the author, please send an email to aethergeoofficial@gma
 import os
 
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QComboBox, QSlider, QMessageBox, QFileDialog
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QSlider, QMessageBox,
+                             QFileDialog, QSpinBox, QCheckBox)
 
 from image_manipulation import saving
+from dim_red_control_view.pca_solvers import PCA_SOLVERS
+from dim_red_control_view.sampling import DEFAULT_SAMPLE_SIZE, SAMPLING_STRATEGIES
+from dim_red_control_view.dim_red_model import load_model, save_model
+
+# Functions that can be fitted on a sample of the pixels (MNF streams over all of them)
+SAMPLED_FUNCTIONS = ("PCA", "ICA", "NMF")
 
 class DimRedFunctionControlsView(QWidget):
     """Generic control view for dimensionality reduction functions."""
@@ -40,6 +47,8 @@ class DimRedFunctionControlsView(QWidget):
         self.run_callback = run_callback
         self.parent = parent  
         self.result_data = None
+        self.fitted_model = None  # DimRedModel that produced result_data
+        self.loaded_model = None  # Saved model applied instead of fitting
         self.setup_ui()
 
     def setup_ui(self):
@@ -80,6 +89,55 @@ class DimRedFunctionControlsView(QWidget):
         layout.addWidget(self.components_slider)
         layout.addWidget(self.components_value)
 
+        if self.function_name == "PCA":
+            self.mode_combo = QComboBox()
+            self.mode_combo.setFixedHeight(35)
+            self.mode_combo.addItem("Auto (stream large images)", None)
+            self.mode_combo.addItem("In memory", False)
+            self.mode_combo.addItem("Streaming (out-of-core)", True)
+            layout.addWidget(QLabel("Mode:"))
+            layout.addWidget(self.mode_combo)
+
+            self.solver_combo = QComboBox()
+            self.solver_combo.setFixedHeight(35)
+            for solver, label in PCA_SOLVERS.items():
+                self.solver_combo.addItem(label, solver)
+            layout.addWidget(QLabel("Solver (in memory):"))
+            layout.addWidget(self.solver_combo)
+
+        if self.function_name in SAMPLED_FUNCTIONS:
+            self.sampling_combo = QComboBox()
+            self.sampling_combo.setFixedHeight(35)
+            for strategy, label in SAMPLING_STRATEGIES.items():
+                self.sampling_combo.addItem(label, strategy)
+            self.sampling_combo.currentIndexChanged.connect(self.update_sampling_options)
+            layout.addWidget(QLabel("Fit on:"))
+            layout.addWidget(self.sampling_combo)
+
+            self.sample_size_spin = QSpinBox()
+            self.sample_size_spin.setRange(1000, 100000000)
+            self.sample_size_spin.setSingleStep(10000)
+            self.sample_size_spin.setValue(DEFAULT_SAMPLE_SIZE)
+            layout.addWidget(QLabel("Sample Size (pixels):"))
+            layout.addWidget(self.sample_size_spin)
+
+            self.compare_check = QCheckBox("Compare with a fit on all pixels")
+            layout.addWidget(self.compare_check)
+            self.update_sampling_options()
+
+        model_layout = QHBoxLayout()
+        load_model_btn = QPushButton("Load Model")
+        load_model_btn.clicked.connect(self.load_model)
+        save_model_btn = QPushButton("Save Model")
+        save_model_btn.clicked.connect(self.save_model)
+        model_layout.addWidget(load_model_btn)
+        model_layout.addWidget(save_model_btn)
+        layout.addLayout(model_layout)
+
+        self.model_label = QLabel("Model: fitted on the selected image")
+        self.model_label.setWordWrap(True)
+        layout.addWidget(self.model_label)
+
         run_btn = QPushButton(f"Run {self.function_name}")
         run_btn.clicked.connect(self.execute_function)
         layout.addWidget(run_btn, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -116,6 +174,79 @@ class DimRedFunctionControlsView(QWidget):
                 self.components_slider.setMaximum(bands)
                 self.components_slider.setValue(min(self.components_slider.value(), bands))
     
+    def update_sampling_options(self):
+        """Sample size and comparison only apply when fitting on a sample"""
+        sampled = self.sampling_combo.currentData() != "none"
+        self.sample_size_spin.setEnabled(sampled)
+        self.compare_check.setEnabled(sampled)
+
+    def run_options(self):
+        """Extra keyword arguments for the run callback"""
+        options = {}
+        if self.function_name in SAMPLED_FUNCTIONS:
+            options.update(
+                sampling=self.sampling_combo.currentData(),
+                sample_size=self.sample_size_spin.value(),
+                compare_full=self.compare_check.isChecked()
+            )
+        if self.function_name == "PCA":
+            options.update(streaming=self.mode_combo.currentData(), solver=self.solver_combo.currentData())
+        if self.loaded_model is not None:
+            options["model"] = self.loaded_model
+        return options
+
+    def load_model(self):
+        """Load a saved model, to apply it instead of fitting one (click again to go back to fitting)"""
+        if self.loaded_model is not None:
+            self.loaded_model = None
+            self.model_label.setText("Model: fitted on the selected image")
+            self.components_slider.setEnabled(True)
+            return
+
+        model_path, _ = QFileDialog.getOpenFileName(
+            self,
+            f"Load {self.function_name} Model",
+            "",
+            "Dimensionality Reduction Models (*.npz);;All Files (*.*)"
+        )
+        if not model_path:
+            return
+        try:
+            model = load_model(model_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not load model: {str(e)}")
+            return
+        if model.method != self.function_name:
+            QMessageBox.warning(self, "Error", f"This is a {model.method} model, not {self.function_name}.")
+            return
+
+        self.loaded_model = model
+        self.components_slider.setEnabled(False)
+        self.model_label.setText(f"Model: {os.path.basename(model_path)} ({model.describe()}), "
+                                 "click Load Model again to clear")
+
+    def save_model(self):
+        """Save the model of the last run"""
+        if self.fitted_model is None:
+            QMessageBox.warning(self, "Error", "No fitted model to save. Run processing first.")
+            return
+
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            f"Save {self.function_name} Model",
+            "",
+            "Dimensionality Reduction Models (*.npz);;All Files (*.*)"
+        )
+        if not output_path:
+            return
+        if not output_path.lower().endswith('.npz'):
+            output_path += '.npz'
+        try:
+            save_model(self.fitted_model, output_path)
+            QMessageBox.information(self, "Success", f"{self.function_name} model saved.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save model: {str(e)}")
+
     def execute_function(self):
         """Collect parameters and execute the associated function"""
         path = self.image_combo.currentData()
@@ -127,7 +258,7 @@ class DimRedFunctionControlsView(QWidget):
 
         if self.run_callback:
             try:
-                self.run_callback(path, n_components)
+                self.run_callback(path, n_components, **self.run_options())
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"{self.function_name} failed: {str(e)}")
          
@@ -142,7 +273,7 @@ class DimRedFunctionControlsView(QWidget):
                 self,
                 "Save Results",
                 "",
-                "TIF Files (*.tif);;All Files (*.*)"
+                "TIF Files (*.tif);;ENVI Files (*.hdr);;All Files (*.*)"
             )
             if not output_path:
                 return
@@ -165,28 +296,14 @@ class DimRedFunctionControlsView(QWidget):
                     non_masked_indices = self.parent.parent.image_data[selected_mask]["non_masked_indices"]
                 
                 if hasattr(self, 'result_data'):
-                    reconstructed = saving.image_recovery(
+                    self.parent.parent.save_in_background(
+                        output_path,
+                        saving.save_pixels,
                         self.result_data,
                         non_masked_indices,
-                        metadata["rows"],
-                        metadata["cols"]
-                    )
-                    
-                    saving.save_image(
-                        output_path,
-                        reconstructed,
-                        metadata["map_info"],
-                        metadata["coordinates"],
-                        metadata["cols"],
-                        metadata["rows"],
-                        metadata["pixel_size_x"],
-                        metadata["pixel_size_y"],
-                        metadata["x_origin"],
-                        metadata["y_origin"],
-                        wavelengths=None
+                        metadata,
+                        success_message=f"{self.function_name} results saved successfully!"
                     )
-                    
-                    QMessageBox.information(self, "Success", f"{self.function_name} results saved successfully!")
                 else:
                     QMessageBox.warning(self, "Error", "No results available to save. Please run the analysis first.")
                         
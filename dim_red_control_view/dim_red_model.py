@@ -0,0 +1,222 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import json
+
+import numpy as np
+
+from sklearn.decomposition import non_negative_factorization
+
+from image_manipulation.gather_scatter import iter_gather_chunks
+from dim_red_control_view.streaming_pca import block_rows, write_streamed
+
+MODEL_VERSION = 1
+MODEL_METHODS = ("PCA", "ICA", "NMF", "MNF")
+# Group of the result store entry the model of a run is kept in
+MODEL_GROUP = "model"
+# Iterations of the solver for the NMF activations of new pixels (NMF.transform's default)
+NMF_ITERATIONS = 200
+
+def wavelength_array(wavelengths):
+    """Wavelengths as floats, or an empty array when they are missing or not numeric."""
+    if wavelengths is None:
+        return np.empty(0)
+    try:
+        return np.asarray([float(w) for w in wavelengths], dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.empty(0)
+
+def nmf_activations(pixels, components, n_iter=NMF_ITERATIONS):
+    """
+    W >= 0 minimizing ||pixels - W H|| with H (components) fixed, the same
+    coordinate descent NMF.transform runs.
+    """
+    W, _, _ = non_negative_factorization(
+        np.maximum(pixels, 0), H=components, n_components=components.shape[0],
+        init='custom', update_H=False, max_iter=n_iter)
+    return W
+
+class DimRedModel:
+    """
+    A fitted PCA/ICA/NMF/MNF model, kept to transform other images the same way.
+    PCA, ICA and MNF are linear: scores = (pixels - mean) @ components.T (the ICA components
+    already include the whitening, which is kept too for reference).
+    NMF keeps H (components) and solves pixels ~ W H for W >= 0 with H fixed.
+    fingerprint = result store key of the training run (image file, mask and parameters).
+    stats = eigenvalues for PCA and MNF, empty otherwise.
+    """
+    def __init__(self, method, components, mean=None, whitening=None, wavelengths=None,
+                 fingerprint="", training_pixels=0, stats=None):
+        if method not in MODEL_METHODS:
+            raise ValueError(f"Error creating the model: unknown method {method}")
+        self.method = method
+        self.components = np.asarray(components, dtype=np.float64)
+        bands = self.components.shape[1]
+        self.mean = np.zeros(bands) if mean is None else np.asarray(mean, dtype=np.float64)
+        self.whitening = np.empty((0, bands)) if whitening is None else np.asarray(whitening, dtype=np.float64)
+        self.wavelengths = wavelength_array(wavelengths)
+        self.fingerprint = fingerprint
+        self.training_pixels = int(training_pixels)
+        self.stats = np.empty(0) if stats is None else np.asarray(stats, dtype=np.float64)
+
+    @property
+    def n_components(self):
+        return self.components.shape[0]
+
+    @property
+    def bands(self):
+        return self.components.shape[1]
+
+    def describe(self):
+        return (f"{self.method}, {self.n_components} components, {self.bands} bands, "
+                f"fitted on {self.training_pixels} pixels")
+
+    def check_compatible(self, bands, wavelengths=None):
+        """Raises ValueError if an image with these bands/wavelengths can't be transformed by this model."""
+        if bands != self.bands:
+            raise ValueError(f"Error applying the model: it was fitted on {self.bands} bands, the image has {bands}")
+        wavelengths = wavelength_array(wavelengths)
+        if len(self.wavelengths) and len(wavelengths) == self.bands and self.bands > 1:
+            # Same sensor bands: every wavelength within half a band spacing of the training one
+            tolerance = 0.5 * np.median(np.abs(np.diff(self.wavelengths)))
+            if np.max(np.abs(wavelengths - self.wavelengths)) > tolerance:
+                raise ValueError("Error applying the model: the image wavelengths don't match the ones it was fitted on")
+
+    def transform(self, pixels):
+        """Scores of an (n_pixels, bands) block."""
+        pixels = np.asarray(pixels, dtype=np.float64)
+        if self.method == "NMF":
+            return nmf_activations(pixels, self.components)
+        return (pixels - self.mean) @ self.components.T
+
+    def to_arrays(self):
+        info = {
+            "version": MODEL_VERSION,
+            "method": self.method,
+            "fingerprint": self.fingerprint,
+            "training_pixels": self.training_pixels
+        }
+        return {
+            "info": json.dumps(info),
+            "components": self.components,
+            "mean": self.mean,
+            "whitening": self.whitening,
+            "wavelengths": self.wavelengths,
+            "stats": self.stats
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        info = arrays["info"]
+        info = json.loads(info.decode('utf-8') if isinstance(info, bytes) else str(info))
+        if info.get("version", MODEL_VERSION) > MODEL_VERSION:
+            raise ValueError("Error loading the model: it was saved by a newer version")
+        whitening = arrays["whitening"]
+        return cls(
+            info["method"],
+            arrays["components"],
+            mean=arrays["mean"],
+            whitening=whitening if whitening.size else None,
+            wavelengths=arrays["wavelengths"],
+            fingerprint=info.get("fingerprint", ""),
+            training_pixels=info.get("training_pixels", 0),
+            stats=arrays["stats"]
+        )
+
+def set_training_info(model, wavelengths, fingerprint, training_pixels):
+    """Records what the model was fitted on. Returns model."""
+    model.wavelengths = wavelength_array(wavelengths)
+    model.fingerprint = fingerprint
+    model.training_pixels = int(training_pixels)
+    return model
+
+def model_from_estimator(method, estimator):
+    """DimRedModel of a fitted sklearn PCA, FastICA or NMF."""
+    if method == "PCA":
+        return DimRedModel("PCA", estimator.components_, estimator.mean_, stats=estimator.explained_variance_)
+    if method == "ICA":
+        return DimRedModel("ICA", estimator.components_, getattr(estimator, "mean_", None),
+                           whitening=getattr(estimator, "whitening_", None))
+    return DimRedModel("NMF", estimator.components_)
+
+def save_model(model, path):
+    """Saves the model as a .npz file (plain arrays, no pickling)."""
+    with open(path, 'wb') as f:
+        np.savez(f, **model.to_arrays())
+
+def load_model(path):
+    with np.load(path, allow_pickle=False) as f:
+        return DimRedModel.from_arrays({name: f[name] for name in f.files})
+
+def model_datasets(model):
+    """The model as result store datasets (see ResultStore.put)."""
+    return {f"{MODEL_GROUP}/{name}": value for name, value in model.to_arrays().items()}
+
+def model_from_result(result):
+    """The model stored with a result store entry, or None (older entries, results kept in memory)."""
+    h5_file = getattr(result, "file", None)
+    if h5_file is None or MODEL_GROUP not in h5_file:
+        return None
+    try:
+        group = h5_file[MODEL_GROUP]
+        return DimRedModel.from_arrays({name: group[name][()] for name in group})
+    except Exception as e:
+        print(f"Warning: could not read the stored model: {e}")
+        return None
+
+def transform_blocks(model, image_array, non_masked_indices, out, chunk_rows, dtype=None):
+    """Writes the model scores of every row block of the image into out[start:stop]."""
+    for start, stop, pixels in iter_gather_chunks(image_array, non_masked_indices, chunk_rows, dtype=np.float64):
+        scores = model.transform(pixels)
+        out[start:stop] = scores if dtype is None else scores.astype(dtype, copy=False)
+    return out
+
+def apply_model(result_store, path, image_data, non_masked_indices, model, method):
+    """
+    Transforms an image with a saved model in one streaming pass over row blocks,
+    straight into the result store. Returns the result (h5py dataset, or an array
+    if the store can't be written).
+    """
+    if model.method != method:
+        raise ValueError(f"Error applying the model: it is a {model.method} model, not {method}")
+    metadata = image_data["metadata"]
+    model.check_compatible(metadata["bands"], metadata["wavelengths"])
+
+    params = {"components": model.components, "mean": model.mean}
+    result_key = result_store.key(path, f"{model.method} model", params, non_masked_indices)
+    image_array = image_data["array"]
+    _, cols, bands = image_array.shape
+    chunk_rows = block_rows(cols, bands)
+    shape = (len(non_masked_indices), model.n_components)
+    return result_store.get_or_compute(
+        result_key,
+        lambda: write_streamed(
+            result_store, result_key, shape,
+            lambda out, dtype: transform_blocks(model, image_array, non_masked_indices, out, chunk_rows, dtype),
+            attrs={"model_fingerprint": model.fingerprint},
+            datasets=model_datasets(model)),
+        streamed=True)
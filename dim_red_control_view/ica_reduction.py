@@ -25,7 +25,6 @@ It is also important to cite that this software is free and open source, in this
 If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
 """
 
-import numpy as np
 
 from PyQt6.QtWidgets import QMessageBox, QDialog, QVBoxLayout
 from sklearn.decomposition import FastICA
@@ -34,7 +33,11 @@ from scipy.stats import kurtosis
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
+from image_manipulation.working_dtype import get_working_dtype
+from dim_red_control_view.sampling import DEFAULT_SAMPLE_SIZE, fit_sample_transform, format_report, stored_report
+from dim_red_control_view.dim_red_model import (apply_model, model_datasets, model_from_estimator, model_from_result,
+                                                set_training_info)
 
 class ICAOperations:
     def __init__(self, parent):
@@ -45,11 +48,14 @@ class ICAOperations:
         self.parent = parent
         self.main_window = parent.parent  
     
-    def execute(self, path, n_components):
-        """Execute ICA with given parameters"""
+    def execute(self, path, n_components, sampling="none", sample_size=DEFAULT_SAMPLE_SIZE, compare_full=False, model=None):
+        """
+        Execute ICA with given parameters
+        sampling = fit on a sample of the pixels (sampling.SAMPLING_STRATEGIES) and apply the model to all of them
+        model = saved DimRedModel to apply instead of fitting (n_components and sampling are ignored)
+        """
         try:
             image_data = self.main_window.image_data[path]
-            array = image_data["array"]
             metadata = image_data["metadata"]
             # Default: use the image's own non_masked_indices
             non_masked_indices = image_data["non_masked_indices"]
@@ -66,11 +72,49 @@ class ICAOperations:
                         QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")    
                         return
                     
-            masked_array = manipulation.apply_mask(array, non_masked_indices)
-            
-            ica_result, ica_kurtosis = self.ICA_spectral(
-                masked_array, 
-                n_components=n_components)
+            result_store = self.main_window.result_store
+            if model is not None:
+                # Saved model: no fitting, one streaming pass over the image
+                ica_result = apply_model(self.main_window.result_store, path, image_data, non_masked_indices, model, "ICA")
+                self.store_results(ica_result, model)
+                QMessageBox.information(self.parent, "Success", f"ICA model applied to {len(non_masked_indices)} pixels.")
+                return
+
+            params = {"n_components": n_components}
+            if sampling != "none":
+                params.update(sampling=sampling, sample_size=sample_size)
+            result_key = result_store.key(path, "ICA", params, non_masked_indices)
+            fitted = {}
+
+            def fit():
+                masked_array = gather_pixels(image_data["array"], non_masked_indices)
+                
+                report = None
+                if sampling != "none":
+                    scores, ica_kurtosis, report, model = self.ICA_sampled(
+                        masked_array,
+                        non_masked_indices,
+                        (metadata["rows"], metadata["cols"]),
+                        n_components=n_components,
+                        sampling=sampling,
+                        sample_size=sample_size,
+                        compare_full=compare_full)
+                else:
+                    scores, ica_kurtosis, model = self.ICA_spectral(
+                        masked_array, 
+                        n_components=n_components)
+                training_pixels = len(masked_array) if report is None else report["sample_size"]
+                set_training_info(model, metadata["wavelengths"], result_key, training_pixels)
+                fitted.update(kurtosis=ica_kurtosis, report=report, model=model)
+                return scores, {"kurtosis": ica_kurtosis, **(report or {})}, model_datasets(model)
+
+            ica_result = result_store.get_or_compute(result_key, fit)
+            if fitted:
+                ica_kurtosis, report, model = fitted["kurtosis"], fitted["report"], fitted["model"]
+            else:
+                ica_kurtosis = ica_result.attrs.get("kurtosis")
+                report = stored_report(ica_result.attrs)
+                model = model_from_result(ica_result)
 
             if ica_kurtosis is not None:
                 canvas = self.plot_ica_kurtosis(ica_kurtosis)
@@ -79,27 +123,46 @@ class ICAOperations:
                 QVBoxLayout(dialog).addWidget(canvas)
                 dialog.exec()
 
-            if "ICA" in self.parent.control_views:
-                control_view = self.parent.control_views["ICA"].widget()
-                control_view.result_data = ica_result
-            else:
-                print("Warning: ICA control view not found to store results.")
+            if report is not None:
+                QMessageBox.information(self.parent, "ICA Sampling", format_report(report, len(non_masked_indices)))
+
+            self.store_results(ica_result, model)
         
         except Exception as e:
             QMessageBox.critical(self.parent, "Error", f"ICA failed: {str(e)}")
+
+    def store_results(self, ica_result, model):
+        """Hand the components and the model they came from to the control view"""
+        if "ICA" in self.parent.control_views:
+            control_view = self.parent.control_views["ICA"].widget()
+            control_view.result_data = ica_result
+            control_view.fitted_model = model
+        else:
+            print("Warning: ICA control view not found to store results.")
             
-    def ICA_spectral(self, non_masked_pixels, n_components=11, random_state=42):
+    def ICA_spectral(self, band_values, n_components=11, random_state=42):
         """
         Apply ICA to spectral data and compute kurtosis for each independent component.
+        Returns results, kurtosis and the fitted model
         """
-        band_values = np.array([pixels for _, pixels in non_masked_pixels])
-        
         ica = FastICA(n_components=n_components, random_state=random_state)
-        results_ica = ica.fit_transform(band_values)
+        results_ica = ica.fit_transform(band_values).astype(get_working_dtype(), copy=False)
         
         ica_kurtosis = kurtosis(results_ica, axis=0)
         
-        return results_ica, ica_kurtosis
+        return results_ica, ica_kurtosis, model_from_estimator("ICA", ica)
+
+    def ICA_sampled(self, band_values, non_masked_indices, shape, n_components=11, sampling="uniform",
+                    sample_size=DEFAULT_SAMPLE_SIZE, compare_full=False, random_state=42):
+        """
+        Fit ICA on a sample of the pixels and apply it to all of them in parallel chunks.
+        Returns results, kurtosis, the sampling report (see sampling.fit_sample_transform) and the fitted model
+        """
+        ica = FastICA(n_components=n_components, random_state=random_state)
+        results_ica, ica, report = fit_sample_transform(
+            ica, band_values, non_masked_indices, shape, sampling, sample_size, compare_full, random_state)
+        
+        return results_ica, kurtosis(results_ica, axis=0), report, model_from_estimator("ICA", ica)
     
     def plot_ica_kurtosis(self, ica_kurtosis):
         """
@@ -0,0 +1,209 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+
+from PyQt6.QtWidgets import QMessageBox, QDialog, QVBoxLayout
+from scipy.linalg import LinAlgError, eigh
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+from image_manipulation.valid_mask import as_valid_mask
+from dim_red_control_view.streaming_pca import CovarianceAccumulator, block_rows, project_blocks, write_streamed
+from dim_red_control_view.dim_red_model import DimRedModel, apply_model, model_datasets, model_from_result
+
+# Ridge added to the noise covariance (relative to its mean diagonal), for bands without noise
+NOISE_RIDGE = 1e-10
+
+def mnf_statistics(image_array, non_masked_indices, chunk_rows):
+    """
+    One pass over row blocks: mean and covariance of the valid pixels, and the noise
+    covariance estimated from shift differences (each valid pixel minus its valid right
+    hand neighbour, whose covariance is twice the noise's for white, spatially uncorrelated noise).
+    Returns (mean, data covariance, noise covariance, n_pixels).
+    """
+    rows, cols, bands = image_array.shape
+    valid = as_valid_mask(non_masked_indices, (rows, cols)).valid
+    data = CovarianceAccumulator(bands)
+    noise = CovarianceAccumulator(bands)
+
+    for row_start in range(0, rows, chunk_rows):
+        row_stop = min(row_start + chunk_rows, rows)
+        block_valid = valid[row_start:row_stop]
+        if not block_valid.any():
+            continue
+        block = np.asarray(image_array[row_start:row_stop], dtype=np.float64)
+        data.partial_fit(block[block_valid])
+
+        pairs = block_valid[:, 1:] & block_valid[:, :-1]
+        if pairs.any():
+            noise.partial_fit(block[:, 1:][pairs] - block[:, :-1][pairs])
+
+    if data.n < 2 or noise.n < 2:
+        raise ValueError("Error running MNF: not enough valid (neighbouring) pixels to estimate the noise")
+    return data.mean, data.covariance(), noise.covariance() / 2, data.n
+
+def mnf_from_covariances(data_covariance, noise_covariance, n_components):
+    """
+    Noise-whitened principal axes: the generalized eigenproblem C v = l N v on the
+    bands x bands matrices. Returns (components, eigenvalues), by decreasing eigenvalue
+    (signal to noise ratio + 1); components are scaled so the noise has unit variance
+    in every score, and each has its largest loading positive.
+    """
+    bands = noise_covariance.shape[0]
+    ridge = NOISE_RIDGE * max(np.trace(noise_covariance) / bands, np.finfo(np.float64).tiny)
+    try:
+        eigenvalues, eigenvectors = eigh(data_covariance, noise_covariance + ridge * np.eye(bands))
+    except LinAlgError as e:
+        raise ValueError(f"Error running MNF: the noise covariance is singular ({e})")
+    
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    components = eigenvectors[:, order].T
+    signs = np.sign(components[np.arange(len(order)), np.argmax(np.abs(components), axis=1)])
+    signs[signs == 0] = 1
+    return components * signs[:, np.newaxis], eigenvalues[order]
+
+class MNFOperations:
+    def __init__(self, parent):
+        """
+        Initialize MNF operations with parent reference to access necessary data
+        parent: FunctionListItem instance
+        """
+        self.parent = parent
+        self.main_window = parent.parent
+
+    def execute(self, path, n_components, model=None):
+        """
+        Execute MNF with given parameters
+        model = saved DimRedModel to apply instead of fitting (n_components is ignored)
+        """
+        try:
+            image_data = self.main_window.image_data[path]
+            metadata = image_data["metadata"]
+            non_masked_indices = image_data["non_masked_indices"]
+
+            if "MNF" in self.parent.control_views:
+                control_view = self.parent.control_views["MNF"].widget()
+                selected_mask = control_view.mask_combo.currentData()
+                if selected_mask is not None and selected_mask in self.main_window.image_data:
+                    non_masked_indices = self.main_window.image_data[selected_mask]["non_masked_indices"]
+
+                    cols, rows = metadata["cols"], metadata["rows"]
+                    mask_cols = self.main_window.image_data[selected_mask]["metadata"]["cols"]
+                    mask_rows = self.main_window.image_data[selected_mask]["metadata"]["rows"]
+                    if cols != mask_cols or rows != mask_rows:
+                        QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")
+                        return
+
+            if model is not None:
+                # Saved model: no fitting, one streaming pass over the image
+                mnf_result = apply_model(self.main_window.result_store, path, image_data, non_masked_indices, model, "MNF")
+                self.store_results(mnf_result, model)
+                QMessageBox.information(self.parent, "Success", f"MNF model applied to {len(non_masked_indices)} pixels.")
+                return
+
+            result_store = self.main_window.result_store
+            result_key = result_store.key(path, "MNF", {"n_components": n_components}, non_masked_indices)
+            fitted = {}
+
+            def fit():
+                scores, fitted["eigenvalues"], fitted["model"] = self.MNF_spectral(
+                    image_data["array"],
+                    non_masked_indices,
+                    n_components=n_components,
+                    result_key=result_key,
+                    wavelengths=metadata["wavelengths"])
+                return scores
+
+            mnf_result = result_store.get_or_compute(result_key, fit, streamed=True)
+            if fitted:
+                eigenvalues, model = fitted["eigenvalues"], fitted["model"]
+            else:
+                eigenvalues = mnf_result.attrs.get("eigenvalues")
+                model = model_from_result(mnf_result)
+
+            if eigenvalues is not None:
+                canvas = self.plot_eigenvalues(eigenvalues)
+                dialog = QDialog(self.parent)
+                dialog.setWindowTitle("MNF Results")
+                QVBoxLayout(dialog).addWidget(canvas)
+                dialog.exec()
+
+            self.store_results(mnf_result, model)
+
+        except Exception as e:
+            QMessageBox.critical(self.parent, "Error", f"MNF failed: {str(e)}")
+
+    def store_results(self, mnf_result, model):
+        """Hand the scores and the model they came from to the control view"""
+        if "MNF" in self.parent.control_views:
+            control_view = self.parent.control_views["MNF"].widget()
+            control_view.result_data = mnf_result
+            control_view.fitted_model = model
+        else:
+            print("Warning: MNF control view not found to store results.")
+
+    def MNF_spectral(self, image_array, non_masked_indices, n_components=11, result_key=None, wavelengths=None):
+        """
+        Minimum Noise Fraction: signal and shift-difference noise covariances in one pass
+        over row blocks, the generalized eigenproblem on the bands x bands matrices, then a
+        second pass projecting each block into the result store. Linear in the pixels and
+        never holds the pixel matrix. Returns results, eigenvalues and the fitted model
+        """
+        _, cols, bands = image_array.shape
+        chunk_rows = block_rows(cols, bands)
+        mean, data_covariance, noise_covariance, n_pixels = mnf_statistics(image_array, non_masked_indices, chunk_rows)
+        components, eigenvalues = mnf_from_covariances(data_covariance, noise_covariance, n_components)
+        model = DimRedModel("MNF", components, mean, wavelengths=wavelengths, fingerprint=result_key or "",
+                            training_pixels=n_pixels, stats=eigenvalues)
+
+        results_mnf = write_streamed(
+            self.main_window.result_store, result_key, (len(non_masked_indices), len(eigenvalues)),
+            lambda out, dtype: project_blocks(image_array, non_masked_indices, mean, components, out, chunk_rows, dtype),
+            attrs={"eigenvalues": eigenvalues},
+            datasets=model_datasets(model))
+        return results_mnf, eigenvalues, model
+
+    def plot_eigenvalues(self, eigenvalues):
+        """
+        Create a plot of the MNF eigenvalues (signal to noise ratio + 1 of each component) and return a FigureCanvas.
+        Components with eigenvalues near 1 are noise dominated.
+        """
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.bar(range(1, len(eigenvalues) + 1), eigenvalues, alpha=0.5, color='b')
+        ax.plot(range(1, len(eigenvalues) + 1), eigenvalues, 'r-')
+        ax.axhline(1, color='k', linestyle='--', linewidth=1)
+        if np.all(np.asarray(eigenvalues) > 0):
+            ax.set_yscale('log')
+        ax.set_xlabel('MNF Component')
+        ax.set_ylabel('Eigenvalue (SNR + 1)')
+        plt.title('MNF Eigenvalues by Component')
+        plt.tight_layout()
+
+        canvas = FigureCanvas(fig)
+        return canvas
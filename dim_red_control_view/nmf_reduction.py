@@ -32,7 +32,11 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from PyQt6.QtWidgets import QVBoxLayout, QMessageBox, QDialog
 from sklearn.decomposition import NMF
 
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
+from image_manipulation.working_dtype import get_working_dtype
+from dim_red_control_view.sampling import DEFAULT_SAMPLE_SIZE, fit_sample_transform, format_report, stored_report
+from dim_red_control_view.dim_red_model import (apply_model, model_datasets, model_from_estimator, model_from_result,
+                                                set_training_info)
 
 class NMFOperations:
     def __init__(self, parent):
@@ -43,11 +47,14 @@ class NMFOperations:
         self.parent = parent
         self.main_window = parent.parent  
         
-    def execute(self, path, n_components):
-        "Execute NMF with given parameters"
+    def execute(self, path, n_components, sampling="none", sample_size=DEFAULT_SAMPLE_SIZE, compare_full=False, model=None):
+        """
+        Execute NMF with given parameters
+        sampling = fit on a sample of the pixels (sampling.SAMPLING_STRATEGIES) and apply the model to all of them
+        model = saved DimRedModel to apply instead of fitting (n_components and sampling are ignored)
+        """
         try:
             image_data = self.main_window.image_data[path]
-            array = image_data["array"]
             metadata = image_data["metadata"]
             # Default: use the image's own non_masked_indices
             non_masked_indices = image_data["non_masked_indices"]
@@ -65,11 +72,49 @@ class NMFOperations:
                         QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")
                         return
             
-            masked_array = manipulation.apply_mask(array, non_masked_indices)
+            result_store = self.main_window.result_store
+            if model is not None:
+                # Saved model: no fitting, one streaming pass over the image
+                nmf_result = apply_model(self.main_window.result_store, path, image_data, non_masked_indices, model, "NMF")
+                self.store_results(nmf_result, model)
+                QMessageBox.information(self.parent, "Success", f"NMF model applied to {len(non_masked_indices)} pixels.")
+                return
+
+            params = {"n_components": n_components}
+            if sampling != "none":
+                params.update(sampling=sampling, sample_size=sample_size)
+            result_key = result_store.key(path, "NMF", params, non_masked_indices)
+            fitted = {}
+
+            def fit():
+                masked_array = gather_pixels(image_data["array"], non_masked_indices)
+
+                report = None
+                if sampling != "none":
+                    scores, significance, report, model = self.NMF_sampled(
+                        masked_array,
+                        non_masked_indices,
+                        (metadata["rows"], metadata["cols"]),
+                        n_components=n_components,
+                        sampling=sampling,
+                        sample_size=sample_size,
+                        compare_full=compare_full)
+                else:
+                    scores, significance, model = self.NMF_spectral(
+                        masked_array, 
+                        n_components=n_components)
+                training_pixels = len(masked_array) if report is None else report["sample_size"]
+                set_training_info(model, metadata["wavelengths"], result_key, training_pixels)
+                fitted.update(significance=significance, report=report, model=model)
+                return scores, {"significance": significance, **(report or {})}, model_datasets(model)
 
-            nmf_result, significance = self.NMF_spectral(
-                masked_array, 
-                n_components=n_components)
+            nmf_result = result_store.get_or_compute(result_key, fit)
+            if fitted:
+                significance, report, model = fitted["significance"], fitted["report"], fitted["model"]
+            else:
+                significance = nmf_result.attrs.get("significance")
+                report = stored_report(nmf_result.attrs)
+                model = model_from_result(nmf_result)
             
             if significance is not None:
                 canvas = self.plot_nmf_significance(significance)
@@ -77,24 +122,32 @@ class NMFOperations:
                 dialog.setWindowTitle("NMF Results")
                 QVBoxLayout(dialog).addWidget(canvas)
                 dialog.exec()
+
+            if report is not None:
+                QMessageBox.information(self.parent, "NMF Sampling", format_report(report, len(non_masked_indices)))
             
-            if "NMF" in self.parent.control_views:
-                control_view = self.parent.control_views["NMF"].widget()
-                control_view.result_data = nmf_result
-            else:
-                print("Warning: NMF control view not found to store results.")
+            self.store_results(nmf_result, model)
             
         except Exception as e:
             QMessageBox.critical(self.parent, "Error", f"NMF failed: {str(e)}")
+
+    def store_results(self, nmf_result, model):
+        """Hand the components and the model they came from to the control view"""
+        if "NMF" in self.parent.control_views:
+            control_view = self.parent.control_views["NMF"].widget()
+            control_view.result_data = nmf_result
+            control_view.fitted_model = model
+        else:
+            print("Warning: NMF control view not found to store results.")
             
-    def NMF_spectral(self, non_masked_pixels, n_components=11, random_state=42):
+    def NMF_spectral(self, band_values, n_components=11, random_state=42):
         """
         Apply Non-negative Matrix Factorization (NMF) to spectral data,
         and return the transformed representation and a significance measure per component.
         
         Parameters:
-            non_masked_pixels: iterable of tuples (mask, pixel_spectrum)
-                where each pixel_spectrum is a 1D array (n_features,)
+            band_values: 2D array, shape (n_samples, n_features)
+                The non-masked pixel spectra, one row per pixel.
             n_components: int, number of NMF components (default 11)
             random_state: int, for reproducibility
             
@@ -103,17 +156,28 @@ class NMFOperations:
                 The activation matrix W.
             significance: 1D array, shape (n_components,)
                 Significance measure for each component computed as the L2 norm of that column in W.
+            model: DimRedModel with H, to apply to other images
         """
-        band_values = np.array([pixels for _, pixels in non_masked_pixels])
-        
         nmf_model = NMF(n_components=n_components, init='nndsvda', random_state=random_state)
         # W: activations, H: endmember spectra
-        W = nmf_model.fit_transform(band_values)
+        W = nmf_model.fit_transform(band_values).astype(get_working_dtype(), copy=False)
         
         # Compute significance as L2 norm of each column of W
         significance = np.linalg.norm(W, axis=0)
         
-        return W, significance
+        return W, significance, model_from_estimator("NMF", nmf_model)
+
+    def NMF_sampled(self, band_values, non_masked_indices, shape, n_components=11, sampling="uniform",
+                    sample_size=DEFAULT_SAMPLE_SIZE, compare_full=False, random_state=42):
+        """
+        Fit NMF on a sample of the pixels and apply it (H fixed) to all of them in parallel chunks.
+        Returns W, significance, the sampling report (see sampling.fit_sample_transform) and the fitted model
+        """
+        nmf_model = NMF(n_components=n_components, init='nndsvda', random_state=random_state)
+        W, nmf_model, report = fit_sample_transform(
+            nmf_model, band_values, non_masked_indices, shape, sampling, sample_size, compare_full, random_state)
+        
+        return W, np.linalg.norm(W, axis=0), report, model_from_estimator("NMF", nmf_model)
     
     def plot_nmf_significance(self, significance):
         """
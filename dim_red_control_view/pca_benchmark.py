@@ -0,0 +1,120 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+"""
+Wall time and agreement of the PCA solvers, against the full SVD used before.
+Run from the application folder:
+    python -m dim_red_control_view.pca_benchmark --pixels 500000 --bands 224 --components 10
+    python -m dim_red_control_view.pca_benchmark --image scene.hdr --components 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from image_manipulation.gather_scatter import gather_pixels
+from dim_red_control_view.pca_solvers import PCA_SOLVERS, choose_pca_solver, pca_scores
+
+def synthetic_pixels(n_pixels, bands, n_endmembers=8, noise=0.01, seed=0):
+    """Linear mixtures of smooth random spectra plus noise, shaped like gathered image pixels."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, bands)
+    centres = rng.uniform(0, 1, (n_endmembers, 3))
+    endmembers = 0.3 + 0.2 * np.exp(-((x - centres[:, :, np.newaxis]) / 0.08) ** 2).sum(axis=1)
+    abundances = rng.dirichlet(np.ones(n_endmembers), n_pixels)
+    pixels = abundances @ endmembers + rng.normal(0, noise, (n_pixels, bands))
+    return pixels.astype(np.float32)
+
+def image_pixels(path):
+    from image_manipulation.loading import load_image
+    record = load_image(path)
+    return gather_pixels(record.array, record.mask)
+
+def matching_components(reference, scores, min_correlation=0.999):
+    """
+    How many leading components have scores matching the reference (|correlation| >= min_correlation,
+    signs may differ). Noise components with nearly equal eigenvalues can come out in any rotation,
+    so they are expected to stop matching first.
+    """
+    for i in range(min(reference.shape[1], scores.shape[1])):
+        a = reference[:, i] - reference[:, i].mean()
+        b = scores[:, i] - scores[:, i].mean()
+        denominator = np.sqrt((a @ a) * (b @ b))
+        if denominator > 0 and abs(a @ b) / denominator < min_correlation:
+            return i
+    return min(reference.shape[1], scores.shape[1])
+
+def run_benchmark(band_values, n_components, repeats=1):
+    """Best wall time, eigenvalue and score agreement of every solver. Returns a list of dicts."""
+    band_values = np.ascontiguousarray(band_values)
+    results = []
+    reference = None
+    for solver in ["full"] + [s for s in PCA_SOLVERS if s not in ("full", "auto")]:
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            scores, eigenvalues, _ = pca_scores(band_values, n_components, solver=solver)
+            timings.append(time.perf_counter() - start)
+        eigenvalues = np.asarray(eigenvalues, dtype=np.float64)
+        if reference is None:
+            reference = (scores, eigenvalues)
+        
+        ratio = eigenvalues / reference[1].sum()
+        reference_ratio = reference[1] / reference[1].sum()
+        results.append({
+            "solver": solver,
+            "seconds": min(timings),
+            "eigenvalue_error": float(np.max(np.abs(eigenvalues - reference[1]) / reference[1])),
+            "explained_variance_error": float(np.max(np.abs(ratio - reference_ratio))),
+            "matching_components": matching_components(reference[0], scores)
+        })
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the PCA solvers (wall time and explained variance).")
+    parser.add_argument("--image", help="Image to read the pixels from (ENVI, TIFF or PRISMA); synthetic data if omitted")
+    parser.add_argument("--pixels", type=int, default=200000, help="Synthetic pixels")
+    parser.add_argument("--bands", type=int, default=224, help="Synthetic bands")
+    parser.add_argument("--components", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per solver, the best one is reported")
+    args = parser.parse_args(argv)
+
+    band_values = image_pixels(args.image) if args.image else synthetic_pixels(args.pixels, args.bands)
+    n_pixels, bands = band_values.shape
+    print(f"{n_pixels} pixels x {bands} bands, {args.components} components "
+          f"(auto picks {choose_pca_solver(n_pixels, bands, args.components)})")
+
+    results = run_benchmark(band_values, args.components, args.repeats)
+    full_seconds = results[0]["seconds"]
+    print(f"{'solver':<18}{'time (s)':>10}{'speed-up':>10}{'max eig. rel. err':>19}{'max EVR diff':>14}{'matching comp.':>16}")
+    for result in results:
+        print(f"{result['solver']:<18}{result['seconds']:>10.3f}{full_seconds / result['seconds']:>9.1f}x"
+              f"{result['eigenvalue_error']:>19.2e}{result['explained_variance_error']:>14.2e}{result['matching_components']:>16}")
+
+if __name__ == "__main__":
+    main()
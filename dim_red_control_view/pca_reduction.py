@@ -33,7 +33,12 @@ from sklearn.decomposition import PCA
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
+from dim_red_control_view.streaming_pca import block_rows, fit_streaming_pca, needs_streaming, project_blocks, write_streamed
+from dim_red_control_view.dim_red_model import (DimRedModel, apply_model, model_datasets, model_from_estimator,
+                                                model_from_result, set_training_info)
+from dim_red_control_view.pca_solvers import choose_pca_solver, pca_scores
+from dim_red_control_view.sampling import DEFAULT_SAMPLE_SIZE, fit_sample_transform, format_report, stored_report
 
 class PCAOperations:
     def __init__(self, parent):
@@ -44,11 +49,17 @@ class PCAOperations:
         self.parent = parent
         self.main_window = parent.parent  
 
-    def execute(self, path, n_components):
-        """Execute PCA with given parameters"""
+    def execute(self, path, n_components, streaming=None, solver="auto", sampling="none",
+                sample_size=DEFAULT_SAMPLE_SIZE, compare_full=False, model=None):
+        """
+        Execute PCA with given parameters
+        streaming = run out-of-core (two passes over row blocks); None picks it for large images
+        solver = in-memory solver (pca_solvers.PCA_SOLVERS), "auto" chooses by image shape
+        sampling = in memory, fit on a sample of the pixels (sampling.SAMPLING_STRATEGIES) and apply it to all
+        model = saved DimRedModel to apply instead of fitting (n_components and the options above are ignored)
+        """
         try:
             image_data = self.main_window.image_data[path]
-            array = image_data["array"]
             metadata = image_data["metadata"]
             non_masked_indices = image_data["non_masked_indices"]
             
@@ -64,12 +75,69 @@ class PCAOperations:
                     if cols != mask_cols or rows != mask_rows:
                         QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")    
                         return
+
+            if model is not None:
+                # Saved model: no fitting, one streaming pass over the image
+                pca_result = apply_model(self.main_window.result_store, path, image_data, non_masked_indices, model, "PCA")
+                self.store_results(pca_result, model)
+                QMessageBox.information(self.parent, "Success", f"PCA model applied to {len(non_masked_indices)} pixels.")
+                return
                 
-            masked_array = manipulation.apply_mask(array, non_masked_indices)
+            if streaming is None:
+                streaming = needs_streaming(len(non_masked_indices), metadata["bands"])
+            params = {"n_components": n_components}
+            if streaming:
+                params["mode"] = "streaming"
+            else:
+                if solver == "auto":
+                    solver = choose_pca_solver(len(non_masked_indices), metadata["bands"], n_components)
+                params["solver"] = solver
+                if sampling != "none":
+                    params.update(sampling=sampling, sample_size=sample_size)
+
+            result_store = self.main_window.result_store
+            result_key = result_store.key(path, "PCA", params, non_masked_indices)
+            fitted = {}
+
+            def fit():
+                if streaming:
+                    scores, fitted["eigenvalues"], fitted["model"] = self.PCA_streaming(
+                        image_data["array"],
+                        non_masked_indices,
+                        n_components=n_components,
+                        result_key=result_key,
+                        wavelengths=metadata["wavelengths"])
+                    return scores
 
-            pca_result, eigenvalues = self.PCA_spectral(
-                masked_array, 
-                n_components=n_components)
+                masked_array = gather_pixels(image_data["array"], non_masked_indices)
+                report = None
+                if "sampling" in params:
+                    scores, eigenvalues, report, model = self.PCA_sampled(
+                        masked_array,
+                        non_masked_indices,
+                        (metadata["rows"], metadata["cols"]),
+                        n_components=n_components,
+                        solver=solver,
+                        sampling=sampling,
+                        sample_size=sample_size,
+                        compare_full=compare_full)
+                else:
+                    scores, eigenvalues, model = self.PCA_spectral(
+                        masked_array, 
+                        n_components=n_components,
+                        solver=solver)
+                training_pixels = len(masked_array) if report is None else report["sample_size"]
+                set_training_info(model, metadata["wavelengths"], result_key, training_pixels)
+                fitted.update(eigenvalues=eigenvalues, report=report, model=model)
+                return scores, {"eigenvalues": eigenvalues, **(report or {})}, model_datasets(model)
+
+            pca_result = result_store.get_or_compute(result_key, fit, streamed=streaming)
+            if fitted:
+                eigenvalues, report, model = fitted["eigenvalues"], fitted.get("report"), fitted["model"]
+            else:
+                eigenvalues = pca_result.attrs.get("eigenvalues")
+                report = stored_report(pca_result.attrs)
+                model = model_from_result(pca_result)
 
             if eigenvalues is not None:
                 canvas = self.plot_eigenvalues(eigenvalues)
@@ -78,27 +146,62 @@ class PCAOperations:
                 QVBoxLayout(dialog).addWidget(canvas)
                 dialog.exec()
 
-            if "PCA" in self.parent.control_views:
-                control_view = self.parent.control_views["PCA"].widget()
-                control_view.result_data = pca_result
-            else:
-                print("Warning: PCA control view not found to store results.")
+            if report is not None:
+                QMessageBox.information(self.parent, "PCA Sampling", format_report(report, len(non_masked_indices)))
+
+            self.store_results(pca_result, model)
 
         except Exception as e:
             QMessageBox.critical(self.parent, "Error", f"PCA failed: {str(e)}")
+
+    def store_results(self, pca_result, model):
+        """Hand the scores and the model they came from to the control view"""
+        if "PCA" in self.parent.control_views:
+            control_view = self.parent.control_views["PCA"].widget()
+            control_view.result_data = pca_result
+            control_view.fitted_model = model
+        else:
+            print("Warning: PCA control view not found to store results.")
             
-    def PCA_spectral(self, non_masked_pixels, n_components=11, random_state=42):
+    def PCA_spectral(self, band_values, n_components=11, random_state=42, solver="full"):
         """ 
-        Apply PCA to spectral data, and return results and eigenvalues 
+        Apply PCA to spectral data, and return results, eigenvalues and the fitted model
         """
-        band_values = np.array([pixels for _, pixels in non_masked_pixels])
-        
-        pca = PCA(n_components=n_components, random_state=random_state, svd_solver='full')
-        results_pca = pca.fit_transform(band_values)
-        
-        eigenvalues = pca.explained_variance_
+        return pca_scores(band_values, n_components, solver=solver, random_state=random_state)
+
+    def PCA_sampled(self, band_values, non_masked_indices, shape, n_components=11, solver="full", sampling="uniform",
+                    sample_size=DEFAULT_SAMPLE_SIZE, compare_full=False, random_state=42):
+        """
+        Fit PCA on a sample of the pixels and apply it to all of them in parallel chunks.
+        The sample is small, so anything but the randomized solver fits it with the full SVD.
+        Returns results, eigenvalues, the sampling report (see sampling.fit_sample_transform) and the fitted model
+        """
+        pca = PCA(n_components=n_components, random_state=random_state,
+                  svd_solver='randomized' if solver == "randomized" else 'full')
+        results_pca, pca, report = fit_sample_transform(
+            pca, band_values, non_masked_indices, shape, sampling, sample_size, compare_full, random_state)
         
-        return results_pca, eigenvalues
+        return results_pca, pca.explained_variance_, report, model_from_estimator("PCA", pca)
+
+    def PCA_streaming(self, image_array, non_masked_indices, n_components=11, result_key=None, wavelengths=None):
+        """
+        Out-of-core PCA: the band covariance is accumulated over row blocks, then a second
+        pass projects each block straight into the result store, so the pixel matrix is
+        never held in memory. Returns results (h5py dataset), eigenvalues and the fitted model
+        """
+        _, cols, bands = image_array.shape
+        chunk_rows = block_rows(cols, bands)
+        mean, components, eigenvalues = fit_streaming_pca(image_array, non_masked_indices, n_components, chunk_rows)
+        model = DimRedModel("PCA", components, mean, wavelengths=wavelengths, fingerprint=result_key or "",
+                            training_pixels=len(non_masked_indices), stats=eigenvalues)
+        shape = (len(non_masked_indices), len(eigenvalues))
+
+        results_pca = write_streamed(
+            self.main_window.result_store, result_key, shape,
+            lambda out, dtype: project_blocks(image_array, non_masked_indices, mean, components, out, chunk_rows, dtype),
+            attrs={"eigenvalues": eigenvalues},
+            datasets=model_datasets(model))
+        return results_pca, eigenvalues, model
     
     def plot_eigenvalues(self, eigenvalues):
         """
@@ -0,0 +1,86 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+
+from sklearn.decomposition import PCA
+
+from image_manipulation.working_dtype import get_working_dtype
+from dim_red_control_view.streaming_pca import CovarianceAccumulator, pca_from_covariance
+from dim_red_control_view.dim_red_model import DimRedModel, model_from_estimator
+
+PCA_SOLVERS = {
+    "auto": "Auto (by image shape)",
+    "covariance_eigh": "Covariance eigendecomposition",
+    "randomized": "Randomized SVD",
+    "full": "Full SVD"
+}
+# Pixels per GEMM when building the covariance and projecting
+DEFAULT_CHUNK_PIXELS = 65536
+
+def choose_pca_solver(n_pixels, bands, n_components):
+    """
+    Solver for an (n_pixels, bands) matrix. Images are tall (millions of pixels, a few
+    hundred bands), where the bands x bands covariance is cheap and exact; randomized
+    SVD is used when only a few components of a large, squarer matrix are wanted.
+    """
+    if bands <= 1000 and n_pixels >= 10 * bands:
+        return "covariance_eigh"
+    if min(n_pixels, bands) > 500 and n_components < 0.8 * min(n_pixels, bands):
+        return "randomized"
+    return "full"
+
+def covariance_eigh_pca(band_values, n_components, chunk_pixels=DEFAULT_CHUNK_PIXELS, dtype=None):
+    """
+    PCA from eigh of the band covariance, accumulated with one GEMM per chunk of pixels.
+    Returns scores, eigenvalues and the fitted model, like the sklearn path.
+    """
+    n_pixels, bands = band_values.shape
+    accumulator = CovarianceAccumulator(bands)
+    for start in range(0, n_pixels, chunk_pixels):
+        accumulator.partial_fit(band_values[start:start + chunk_pixels])
+    components, eigenvalues = pca_from_covariance(accumulator.covariance(), n_components)
+
+    scores = np.empty((n_pixels, len(eigenvalues)), dtype=dtype or get_working_dtype())
+    for start in range(0, n_pixels, chunk_pixels):
+        block = np.asarray(band_values[start:start + chunk_pixels], dtype=np.float64) - accumulator.mean
+        scores[start:start + chunk_pixels] = block @ components.T
+    return scores, eigenvalues, DimRedModel("PCA", components, accumulator.mean, stats=eigenvalues)
+
+def pca_scores(band_values, n_components, solver="auto", random_state=42):
+    """PCA scores, eigenvalues and fitted model (DimRedModel) of an (n_pixels, bands) matrix with the given solver"""
+    if solver == "auto":
+        solver = choose_pca_solver(band_values.shape[0], band_values.shape[1], n_components)
+    if solver not in PCA_SOLVERS:
+        raise ValueError(f"Error running PCA: unknown solver {solver}")
+    
+    if solver == "covariance_eigh":
+        return covariance_eigh_pca(band_values, n_components)
+    
+    pca = PCA(n_components=n_components, random_state=random_state, svd_solver=solver)
+    results_pca = pca.fit_transform(band_values).astype(get_working_dtype(), copy=False)
+    return results_pca, pca.explained_variance_, model_from_estimator("PCA", pca)
@@ -0,0 +1,191 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from sklearn.base import clone
+
+from image_manipulation.valid_mask import as_valid_mask
+from image_manipulation.working_dtype import get_working_dtype
+
+SAMPLING_STRATEGIES = {
+    "none": "All pixels",
+    "uniform": "Uniform random",
+    "grid": "Stratified spatial grid",
+    "ppi": "PPI-weighted"
+}
+DEFAULT_SAMPLE_SIZE = 100000
+# Pixels per transform call, and threads transforming them (sklearn transforms are BLAS bound)
+DEFAULT_CHUNK_PIXELS = 65536
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+# Random projections used to score how extreme (pure) a pixel is for the PPI-weighted sample,
+# and pixels their 1% tails are estimated from
+PURITY_PROJECTIONS = 64
+PURITY_PROBE_PIXELS = 200000
+
+def uniform_sample(n_pixels, sample_size, rng):
+    return np.sort(rng.choice(n_pixels, size=sample_size, replace=False))
+
+def grid_sample(non_masked_indices, shape, sample_size, rng, per_cell=32):
+    """
+    Stratified spatial sample: the image is split in a grid of about sample_size / per_cell
+    cells and every cell with valid pixels gives the same number of random pixels, so
+    small bright areas are as represented as large uniform ones.
+    """
+    mask = as_valid_mask(non_masked_indices, shape)
+    rows, cols = shape
+    n_side = max(1, int(np.ceil(np.sqrt(sample_size / per_cell))))
+    cell_rows, cell_cols = max(1, int(np.ceil(rows / n_side))), max(1, int(np.ceil(cols / n_side)))
+    cells = (mask.row_indices // cell_rows) * n_side + mask.col_indices // cell_cols
+
+    # Random order inside each cell, then the first pixels of every cell up to its quota
+    order = np.lexsort((rng.random(len(cells)), cells))
+    sorted_cells = cells[order]
+    first = np.searchsorted(sorted_cells, sorted_cells, side='left')
+    rank = np.arange(len(order)) - first
+    quota = int(np.ceil(sample_size / len(np.unique(cells))))
+    chosen = order[rank < quota]
+    if len(chosen) > sample_size:
+        chosen = rng.choice(chosen, size=sample_size, replace=False)
+    return np.sort(chosen)
+
+def purity_scores(band_values, rng, n_projections=PURITY_PROJECTIONS, chunk_pixels=DEFAULT_CHUNK_PIXELS):
+    """
+    Quick Pixel Purity Index: how many of n_projections random directions put the pixel
+    in the 1% tails of the (centred) data. Cheap stand-in for a full PPI run; the tails
+    are estimated on a random probe of the pixels, then the hits are counted chunk by chunk.
+    """
+    n_pixels, bands = band_values.shape
+    directions = rng.normal(size=(bands, n_projections))
+    directions /= np.linalg.norm(directions, axis=0)
+
+    probe = np.asarray(band_values[uniform_sample(n_pixels, min(n_pixels, PURITY_PROBE_PIXELS), rng)], dtype=np.float64)
+    mean = probe.mean(axis=0)
+    low, high = np.percentile((probe - mean) @ directions, [1, 99], axis=0)
+
+    hits = np.empty(n_pixels, dtype=np.int32)
+    for start in range(0, n_pixels, chunk_pixels):
+        projected = (np.asarray(band_values[start:start + chunk_pixels], dtype=np.float64) - mean) @ directions
+        hits[start:start + chunk_pixels] = ((projected <= low) | (projected >= high)).sum(axis=1)
+    return hits
+
+def ppi_sample(band_values, sample_size, rng):
+    """
+    Weighted sample without replacement (Efraimidis-Spirakis keys), weight = 1 + purity
+    score, so extreme pixels that define the components are much more likely to be in it
+    while every pixel keeps a chance.
+    """
+    weights = 1.0 + purity_scores(band_values, rng)
+    keys = np.log(rng.random(len(weights))) / weights
+    return np.sort(np.argpartition(keys, -sample_size)[-sample_size:])
+
+def sample_indices(strategy, band_values, non_masked_indices, shape, sample_size, random_state=42):
+    """Rows of band_values (gathered pixels) to fit on; all of them for "none" or when the sample covers them all."""
+    n_pixels = band_values.shape[0]
+    if strategy == "none" or sample_size >= n_pixels:
+        return np.arange(n_pixels)
+    if strategy not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Error sampling pixels: unknown strategy {strategy}")
+    
+    rng = np.random.default_rng(random_state)
+    if strategy == "uniform":
+        return uniform_sample(n_pixels, sample_size, rng)
+    if strategy == "grid":
+        return grid_sample(non_masked_indices, shape, sample_size, rng)
+    return ppi_sample(band_values, sample_size, rng)
+
+def _chunks(n_pixels, chunk_pixels):
+    return [(start, min(start + chunk_pixels, n_pixels)) for start in range(0, n_pixels, chunk_pixels)]
+
+def transform_in_chunks(model, band_values, chunk_pixels=DEFAULT_CHUNK_PIXELS, n_threads=DEFAULT_THREADS, dtype=None):
+    """model.transform over chunks of pixels, spread over a thread pool, into one (n_pixels, n_components) array."""
+    n_pixels = band_values.shape[0]
+    n_components = model.components_.shape[0]
+    results = np.empty((n_pixels, n_components), dtype=dtype or get_working_dtype())
+
+    def transform(chunk):
+        start, stop = chunk
+        results[start:stop] = model.transform(band_values[start:stop])
+
+    chunks = _chunks(n_pixels, chunk_pixels)
+    if n_threads > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            list(pool.map(transform, chunks))
+    else:
+        for chunk in chunks:
+            transform(chunk)
+    return results
+
+def reconstruction_error(model, band_values, scores, chunk_pixels=DEFAULT_CHUNK_PIXELS):
+    """Relative reconstruction error ||X - inverse_transform(scores)|| / ||X|| over all pixels, chunk by chunk."""
+    residual = 0.0
+    total = 0.0
+    for start, stop in _chunks(band_values.shape[0], chunk_pixels):
+        block = np.asarray(band_values[start:stop], dtype=np.float64)
+        difference = block - model.inverse_transform(np.asarray(scores[start:stop], dtype=np.float64))
+        residual += np.einsum('ij,ij->', difference, difference)
+        total += np.einsum('ij,ij->', block, block)
+    return float(np.sqrt(residual / total)) if total > 0 else 0.0
+
+def fit_sample_transform(model, band_values, non_masked_indices, shape, strategy, sample_size,
+                         compare_full=False, random_state=42):
+    """
+    Fits model on a sample of the pixels and transforms all of them in parallel chunks.
+    Returns (scores, model, report); report has the sample size and the relative
+    reconstruction error over all pixels, plus the error of a model fitted on every
+    pixel when compare_full is set.
+    """
+    indices = sample_indices(strategy, band_values, non_masked_indices, shape, sample_size, random_state)
+    model.fit(band_values[indices])
+    scores = transform_in_chunks(model, band_values)
+    report = {
+        "sample_size": len(indices),
+        "sample_error": reconstruction_error(model, band_values, scores)
+    }
+    if compare_full:
+        full_model = clone(model)
+        full_scores = full_model.fit_transform(band_values)
+        report["full_error"] = reconstruction_error(full_model, band_values, full_scores)
+    return scores, model, report
+
+def stored_report(attrs):
+    """The report kept with a stored result (its attrs), or None if it was fitted on all pixels."""
+    if "sample_size" not in attrs:
+        return None
+    return {name: attrs[name] for name in ("sample_size", "sample_error", "full_error") if name in attrs}
+
+def format_report(report, n_pixels):
+    """One-paragraph summary of a fit_sample_transform report for the user."""
+    text = (f"Fitted on {report['sample_size']} of {n_pixels} pixels.\n"
+            f"Relative reconstruction error (all pixels): {report['sample_error']:.4%}")
+    if "full_error" in report:
+        text += (f"\nFull fit: {report['full_error']:.4%} "
+                 f"(difference {report['sample_error'] - report['full_error']:+.4%})")
+    return text
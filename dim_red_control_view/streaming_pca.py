@@ -0,0 +1,131 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+
+from image_manipulation.gather_scatter import iter_gather_chunks
+from image_manipulation.working_dtype import get_working_dtype
+
+# Float64 pixels read per block (the row block height follows from the image width and bands)
+DEFAULT_BLOCK_BYTES = 64 * 1024 ** 2
+# Above this many bytes of gathered pixels, PCA streams the image instead of gathering it
+STREAMING_THRESHOLD_BYTES = 1024 ** 3
+
+def block_rows(cols, bands, block_bytes=DEFAULT_BLOCK_BYTES):
+    """Image rows per block, so a gathered float64 block stays around block_bytes."""
+    return max(1, int(block_bytes // max(cols * bands * 8, 1)))
+
+def needs_streaming(n_pixels, bands, threshold_bytes=STREAMING_THRESHOLD_BYTES):
+    """True when the gathered (n_pixels, bands) float64 matrix would exceed threshold_bytes."""
+    return n_pixels * bands * 8 > threshold_bytes
+
+class CovarianceAccumulator:
+    """
+    Mean and band covariance of pixels seen block by block.
+    Each block is centred on its own mean (one GEMM for its scatter matrix) and
+    merged with the running totals (Chan et al.), which keeps the result as
+    accurate as the covariance of all the pixels at once.
+    """
+    def __init__(self, bands):
+        self.n = 0
+        self.mean = np.zeros(bands)
+        self.scatter = np.zeros((bands, bands))
+
+    def partial_fit(self, pixels):
+        pixels = np.asarray(pixels, dtype=np.float64)
+        n_block = pixels.shape[0]
+        if n_block == 0:
+            return self
+        block_mean = pixels.mean(axis=0)
+        centred = pixels - block_mean
+        block_scatter = centred.T @ centred
+
+        n = self.n + n_block
+        delta = block_mean - self.mean
+        self.scatter += block_scatter + np.outer(delta, delta) * (self.n * n_block / n)
+        self.mean += delta * (n_block / n)
+        self.n = n
+        return self
+
+    def covariance(self):
+        if self.n < 2:
+            raise ValueError("Error computing the covariance: at least 2 pixels are needed")
+        return self.scatter / (self.n - 1)
+
+def pca_from_covariance(covariance, n_components):
+    """
+    Principal axes of a band covariance matrix.
+    Returns (components, eigenvalues), components shaped (n_components, bands), by
+    decreasing eigenvalue, each with its largest loading positive.
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    components = eigenvectors[:, order].T
+    signs = np.sign(components[np.arange(len(order)), np.argmax(np.abs(components), axis=1)])
+    signs[signs == 0] = 1
+    return components * signs[:, np.newaxis], np.maximum(eigenvalues[order], 0)
+
+def fit_streaming_pca(image_array, non_masked_indices, n_components, chunk_rows):
+    """First pass: mean, principal components and eigenvalues from the covariance accumulated over row blocks."""
+    accumulator = None
+    for _, _, pixels in iter_gather_chunks(image_array, non_masked_indices, chunk_rows, dtype=np.float64):
+        if accumulator is None:
+            accumulator = CovarianceAccumulator(pixels.shape[1])
+        accumulator.partial_fit(pixels)
+    if accumulator is None:
+        raise ValueError("Error running PCA: the mask leaves no valid pixels")
+    
+    components, eigenvalues = pca_from_covariance(accumulator.covariance(), n_components)
+    return accumulator.mean, components, eigenvalues
+
+def project_blocks(image_array, non_masked_indices, mean, components, out, chunk_rows, dtype=None):
+    """Second pass: writes the scores of every row block into out[start:stop] (array, memmap or h5py dataset)."""
+    for start, stop, pixels in iter_gather_chunks(image_array, non_masked_indices, chunk_rows, dtype=np.float64):
+        pixels -= mean
+        scores = pixels @ components.T
+        out[start:stop] = scores if dtype is None else scores.astype(dtype, copy=False)
+    return out
+
+def write_streamed(result_store, result_key, shape, fill, attrs=None, datasets=None):
+    """
+    Runs fill(out, dtype), which writes an (n_pixels, n_components) result block by block,
+    straight into a result store entry and returns the stored dataset. If the store can't
+    be written the result is filled in memory instead (it is much smaller than the pixels).
+    """
+    if result_key is not None and result_store.enabled:
+        try:
+            with result_store.writer(result_key, shape, attrs=attrs, datasets=datasets) as writer:
+                fill(writer.dataset, get_working_dtype())
+            stored = result_store.get(result_key)
+            if stored is not None:
+                return stored
+        except Exception as e:
+            print(f"Warning: could not stream results to the result store ({e}), keeping them in memory")
+
+    results = np.empty(shape, dtype=get_working_dtype())
+    fill(results, None)
+    return results
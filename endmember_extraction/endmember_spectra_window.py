@@ -31,9 +31,8 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT as NavigationToolbar
 import numpy as np
 
-from collections import defaultdict
-
 from spec_library_managment import saving
+from image_manipulation.valid_mask import as_valid_mask
                             
 class EndmemberSpectraWidget(QWidget):
     def __init__(self, endmembers, non_masked_indices, main_image, metadata, parent=None):
@@ -81,19 +80,7 @@ class EndmemberSpectraWidget(QWidget):
         else:
             wavelengths = np.array(list(range(1, self.main_image.shape[2] + 1)))
         
-        clusters_dict = defaultdict(list)
-        for cluster_label, indices in self.endmembers.items():
-            for idx in indices:
-                position = self.non_masked_indices[idx]
-                clusters_dict[cluster_label].append(position)
-        
-        endmember_dict = {}
-        for cluster_label, pixel_coords in clusters_dict.items():
-            spectra_list = []
-            for row, col in pixel_coords:
-                spectra = self.main_image[row, col, :].squeeze()
-                spectra_list.append(spectra)
-            endmember_dict[cluster_label] = np.array(spectra_list)
+        endmember_dict = self._gather_endmember_spectra()
         
         self.figure.clf()
         ax = self.figure.add_subplot(111)
@@ -123,6 +110,20 @@ class EndmemberSpectraWidget(QWidget):
         ax.legend()
         self.figure.tight_layout()
     
+    def _gather_endmember_spectra(self):
+        """Returns {cluster_label: (n_pixels, n_bands) spectra} for the selected endmembers."""
+        mask = as_valid_mask(self.non_masked_indices, self.main_image.shape[:2])
+        
+        endmember_dict = {}
+        for cluster_label, indices in self.endmembers.items():
+            indices = np.asarray(indices, dtype=np.intp)
+            if indices.size == 0:
+                continue
+            rows = mask.row_indices[indices]
+            cols = mask.col_indices[indices]
+            endmember_dict[cluster_label] = np.asarray(self.main_image[rows, cols, :])
+        return endmember_dict
+    
     def update_data(self, endmembers, non_masked_indices, main_image, metadata):
         """Update the widget with new data and refresh the plot."""
         self.endmembers = endmembers
@@ -147,21 +148,8 @@ class EndmemberSpectraWidget(QWidget):
                 if not output_path.lower().endswith(('.sli', '.hdr')):
                     output_path += '.sli'
 
-                clusters_dict = defaultdict(list)
-                for cluster_label, indices in self.endmembers.items():
-                    for idx in indices:
-                        position = self.non_masked_indices[idx]
-                        clusters_dict[cluster_label].append(position)
-                
-                endmember_dict = {}
-                cluster_labels = []  # Store cluster labels in order
-                for cluster_label, pixel_coords in clusters_dict.items():
-                    spectra_list = []
-                    for row, col in pixel_coords:
-                        spectra = self.main_image[row, col, :].squeeze()
-                        spectra_list.append(spectra)
-                    endmember_dict[cluster_label] = np.array(spectra_list)
-                    cluster_labels.append(str(cluster_label))  # Convert labels to strings
+                endmember_dict = self._gather_endmember_spectra()
+                cluster_labels = [str(cluster_label) for cluster_label in endmember_dict]  # Store cluster labels in order
                 
                 endmember_spectra = {}
                 for cluster_label, spectra in endmember_dict.items():
@@ -30,7 +30,7 @@ from scipy.stats.qmc import Sobol
 
 from PyQt6.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QLabel, QProgressBar
 
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
 
 class PixelPurityIdxOperations:
     def __init__(self, parent):
@@ -52,8 +52,7 @@ class PixelPurityIdxOperations:
                 input_array = self.main_window.image_data[path]["array"]
                 non_masked_indices = self.main_window.image_data[path]["non_masked_indices"]
 
-            non_masked_pixels = manipulation.apply_mask(input_array, non_masked_indices)
-            input_array = np.array([pixels for _, pixels in non_masked_pixels])
+            input_array = gather_pixels(input_array, non_masked_indices)
 
             if input_array is not None:
                 self.setup_visualization()
@@ -26,12 +26,11 @@ If you want to contact the author, please send an email to aethergeoofficial@gma
 """
 
 import os
-import numpy as np
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QLabel, QComboBox, QMessageBox, QFileDialog, QWidget
 
-from image_manipulation.saving import save_image
+from image_manipulation.saving import save_pixels
 
 class PixelPurityIdxControlView(QWidget):
     """Control view for Pixel Purity Index."""
@@ -124,7 +123,7 @@ class PixelPurityIdxControlView(QWidget):
                 self,
                 "Save Normalized Image",
                 "",
-                "TIF Files (*.tif);;All Files (*.*)"
+                "TIF Files (*.tif);;ENVI Files (*.hdr);;All Files (*.*)"
             )
             if not output_path:
                 return
@@ -143,25 +142,14 @@ class PixelPurityIdxControlView(QWidget):
                     non_masked_indices = image_data["non_masked_indices"]
                 
                 if hasattr(self, 'result_data'):
-                    reconstructed = np.full((metadata["rows"], metadata["cols"]), np.nan)
-                    for idx, (row, col) in enumerate(non_masked_indices):
-                        if idx < len(self.result_data):  # Ensure we don't go out of bounds
-                            reconstructed[row, col] = self.result_data[idx]
-
-                    save_image(
+                    self.parent.parent.save_in_background(
                         output_path,
-                        reconstructed,
-                        metadata["map_info"],
-                        metadata["coordinates"],
-                        metadata["cols"],
-                        metadata["rows"],
-                        metadata["pixel_size_x"],
-                        metadata["pixel_size_y"],
-                        metadata["x_origin"],
-                        metadata["y_origin"],
-                        None
+                        save_pixels,
+                        self.result_data,
+                        non_masked_indices,
+                        metadata,
+                        success_message="PPI saved successfully."
                     )
-                    QMessageBox.information(self, "Success", "PPI saved successfully.")
                 
                 else:
                     QMessageBox.warning(self, "Error", "No results available to save. Please run the analysis first.")
@@ -29,7 +29,7 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QMessageBox
 
 from endmember_extraction.umap_visualizer_window import UMAPVisualizerWindow
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
 
 class PointCloudOperations:
     def __init__(self, parent):
@@ -55,7 +55,7 @@ class PointCloudOperations:
                 input_cloud_array = self.main_window.image_data[path]["array"]
                 non_masked_indices = self.main_window.image_data[path]["non_masked_indices"]
 
-            cloud_points = manipulation.retrieve_reduction_on_ppi(input_cloud_array, non_masked_indices)
+            cloud_points = gather_pixels(input_cloud_array, non_masked_indices)
 
             if cloud_points is not None:
                 self.parent.umap_window = UMAPVisualizerWindow(
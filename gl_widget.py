@@ -31,6 +31,8 @@ from PyQt6.QtCore import Qt, QPoint, QPointF
 from OpenGL import GL
 from skimage.transform import resize
 
+from image_manipulation.valid_mask import ValidMask, as_valid_mask
+
 class ImageGLWidget(QOpenGLWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -76,6 +78,9 @@ class ImageGLWidget(QOpenGLWidget):
             original_data = data[1]
             if isinstance(original_data, np.ndarray) and original_data.ndim >= 2:
                 self.original_height, self.original_width = original_data.shape[:2]
+            # The array may be a reduced resolution (overview) of the image the mask belongs to
+            if isinstance(self.non_masked, ValidMask):
+                self.original_height, self.original_width = self.non_masked.shape
             data = original_data
         else:
             self.non_masked = None
@@ -200,15 +205,14 @@ class ImageGLWidget(QOpenGLWidget):
             if self.non_masked is not None and self.original_width > 0 and self.original_height > 0:
                 h_tile, w_tile = data.shape[:2]
 
-                scale_x = w_tile / self.original_width
-                scale_y = h_tile / self.original_height
+                scale_x = self.original_width / w_tile
+                scale_y = self.original_height / h_tile
 
-                valid = np.zeros((h_tile, w_tile), dtype=bool)
-                non_masked_arr = np.array(self.non_masked)
-                if non_masked_arr.size > 0:
-                    r_indices = np.clip((non_masked_arr[:, 0] * scale_y).astype(int), 0, h_tile - 1)
-                    c_indices = np.clip((non_masked_arr[:, 1] * scale_x).astype(int), 0, w_tile - 1)
-                    valid[r_indices, c_indices] = True
+                # Nearest-neighbour lookup of the full-resolution mask at each texture pixel
+                full_valid = as_valid_mask(self.non_masked, (self.original_height, self.original_width)).valid
+                r_indices = np.clip((np.arange(h_tile) * scale_y).astype(int), 0, self.original_height - 1)
+                c_indices = np.clip((np.arange(w_tile) * scale_x).astype(int), 0, self.original_width - 1)
+                valid = full_valid[np.ix_(r_indices, c_indices)]
 
                 #non-valid pixels to black
                 masked_color = np.array([0, 0, 0], dtype=rgb_data.dtype)
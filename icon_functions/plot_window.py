@@ -236,14 +236,15 @@ class PlotWindow(QDialog):
         y_band = self.sliders['Y'].value() - 1
         
         image_array = self.parent.image_data[path]['array']
-        rows, cols, bands = image_array.shape
-        pixels_2d = image_array.reshape(-1, bands)
+        # Only the two plotted bands are read, so memory-mapped images stay on disk
+        x_values = np.ravel(image_array[:, :, x_band])
+        y_values = np.ravel(image_array[:, :, y_band])
         
         self.ax.clear()
         
         self.scatter = self.ax.scatter(
-            pixels_2d[:, x_band],
-            pixels_2d[:, y_band],
+            x_values,
+            y_values,
             c='blue', alpha=0.1, s=1
         )
         
@@ -269,7 +270,7 @@ class PlotWindow(QDialog):
                 self,
                 "Save Selection Mask",
                 "",
-                "TIF Files (*.tif);;All Files (*.*)"
+                "TIF Files (*.tif);;ENVI Files (*.hdr);;All Files (*.*)"
             )
             if not output_path:
                 return
@@ -291,8 +292,9 @@ class PlotWindow(QDialog):
 
                 mask[rows, cols] = 1
 
-            saving.save_image(
+            self.parent.save_in_background(
                 output_path,
+                saving.save_image,
                 mask,
                 metadata["map_info"],
                 metadata["coordinates"],
@@ -302,9 +304,9 @@ class PlotWindow(QDialog):
                 metadata["pixel_size_y"],
                 metadata["x_origin"],
                 metadata["y_origin"],
-                None
+                None,
+                success_message="Selection mask saved successfully."
             )
-            QMessageBox.information(self, "Success", "Selection mask saved successfully.")
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save results: {str(e)}")
\ No newline at end of file
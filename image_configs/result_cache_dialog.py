@@ -0,0 +1,89 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QDialog, QCheckBox, QLabel, QDoubleSpinBox,
+                             QPushButton, QDialogButtonBox, QMessageBox)
+
+class ResultCacheDialog(QDialog):
+    """Settings of the result store: keep results on disk or not, disk budget, and clearing it"""
+    def __init__(self, result_store, parent=None):
+        super().__init__(parent)
+        self.result_store = result_store
+        self.setWindowTitle("Result Cache")
+        
+        self.setStyleSheet("""
+            QDialog {
+                background: #2D2D2D;
+                color: #FFFFFF;
+            }
+            QLabel, QCheckBox {
+                color: #FFFFFF;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+
+        self.enabled_check = QCheckBox("Keep intermediate results on disk between runs")
+        self.enabled_check.setChecked(result_store.enabled)
+        layout.addWidget(self.enabled_check)
+
+        budget_layout = QHBoxLayout()
+        budget_layout.addWidget(QLabel("Disk budget (GB):"))
+        self.budget_spin = QDoubleSpinBox()
+        self.budget_spin.setRange(0.1, 1000)
+        self.budget_spin.setDecimals(1)
+        self.budget_spin.setValue(result_store.max_bytes / 1024 ** 3)
+        budget_layout.addWidget(self.budget_spin)
+        layout.addLayout(budget_layout)
+
+        self.usage_label = QLabel()
+        layout.addWidget(self.usage_label)
+        self.update_usage()
+
+        clear_btn = QPushButton("Clear Cache")
+        clear_btn.clicked.connect(self.clear_cache)
+        layout.addWidget(clear_btn)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def update_usage(self):
+        size_mb = self.result_store.nbytes() / 1024 ** 2
+        self.usage_label.setText(f"{size_mb:.1f} MB used in {self.result_store.directory}")
+
+    def clear_cache(self):
+        """Removes the stored results, except the ones opened in this session"""
+        freed_mb = self.result_store.clear(keep_open=True) / 1024 ** 2
+        self.update_usage()
+        QMessageBox.information(self, "Result Cache", f"{freed_mb:.1f} MB freed. Results used in this session are kept.")
+
+    def accept(self):
+        self.result_store.configure(enabled=self.enabled_check.isChecked(),
+                                    max_bytes=int(self.budget_spin.value() * 1024 ** 3))
+        super().accept()
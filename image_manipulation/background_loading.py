@@ -0,0 +1,59 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+from PyQt6.QtCore import pyqtSignal
+
+from image_manipulation.background_tasks import BackgroundQueue
+from image_manipulation.loading import LoadCancelled
+
+class ImageLoader(BackgroundQueue):
+    """
+    Loads images on a QThreadPool so the GUI thread never blocks on disk reads.
+    Several files are loaded concurrently (one per pool thread); every file reports
+    its own progress and can be cancelled on its own. load_function(path, progress_callback)
+    runs on a worker thread. Signals, delivered on the GUI thread:
+      progress(path, percent), loaded(path, result), failed(path, message), cancelled(path)
+    """
+    loaded = pyqtSignal(str, object)
+
+    cancel_exception = LoadCancelled
+    drop_late_results = True
+
+    def __init__(self, load_function, max_workers=None, parent=None):
+        super().__init__(max_workers, parent)
+        self.load_function = load_function
+        self.loaded.connect(lambda path, result: self._forget(path))
+
+    def load(self, path):
+        """Queues path for loading. Returns False if it is already being loaded."""
+        return self.submit(path, lambda progress_callback: self.load_function(path, progress_callback))
+
+    def is_loading(self, path):
+        return self.is_running(path)
+
+    def finish(self, path, result):
+        self.loaded.emit(path, result)
@@ -0,0 +1,61 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+from PyQt6.QtCore import pyqtSignal
+
+from image_manipulation.background_tasks import BackgroundQueue
+from image_manipulation.saving import SaveCancelled
+
+class ImageSaver(BackgroundQueue):
+    """
+    Background writer queue for the save dialogs, so the GUI never blocks while
+    large rasters are written. Saves run on a QThreadPool, several at a time,
+    each with its own progress and cancellation. Signals, keyed by the requested output path:
+      progress(output_path, percent), saved(output_path, saved_path),
+      failed(output_path, message), cancelled(output_path)
+    """
+    saved = pyqtSignal(str, str)
+
+    cancel_exception = SaveCancelled
+
+    def __init__(self, max_workers=2, parent=None):
+        super().__init__(max_workers, parent)
+        self.saved.connect(lambda output_path, saved_path: self._forget(output_path))
+
+    def save(self, output_path, save_function, *args, **kwargs):
+        """
+        Queues save_function(output_path, *args, progress_callback=..., **kwargs), e.g. saving.save_pixels.
+        Returns False if output_path is already being saved.
+        """
+        return self.submit(output_path, lambda progress_callback: save_function(
+            output_path, *args, progress_callback=progress_callback, **kwargs))
+
+    def is_saving(self, output_path):
+        return self.is_running(output_path)
+
+    def finish(self, output_path, saved_path):
+        self.saved.emit(output_path, str(saved_path))
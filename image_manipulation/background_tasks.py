@@ -0,0 +1,160 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class TaskCancelled(Exception):
+    """Raised by the progress callback of a cancelled TaskRunner task."""
+    pass
+
+class BackgroundTask(QRunnable):
+    """
+    Runs work(progress_callback) on a worker thread and reports back through the
+    signals of the BackgroundQueue that created it, under the task key.
+    """
+    def __init__(self, key, work, queue):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.work = work
+        self.queue = queue
+        self.cancel_event = threading.Event()
+        self.last_percent = -1
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise self.queue.cancel_exception(self.key)
+
+    def report_progress(self, done, total):
+        """Progress callback handed to the work function; raises the queue's cancel exception once cancel() was called."""
+        self.check_cancelled()
+        
+        percent = int(100 * done / total) if total else 100
+        if percent != self.last_percent:
+            self.last_percent = percent
+            self.queue.progress.emit(self.key, percent)
+
+    def run(self):
+        try:
+            self.check_cancelled()
+            result = self.work(self.report_progress)
+            if self.queue.drop_late_results:
+                self.check_cancelled()
+        except self.queue.cancel_exception:
+            self.queue.cancelled.emit(self.key)
+        except Exception as e:
+            self.queue.failed.emit(self.key, str(e))
+        else:
+            self.queue.finish(self.key, result)
+
+class BackgroundQueue(QObject):
+    """
+    Runs tasks on a QThreadPool, several at a time, each keyed by a string (a path)
+    with its own progress and cancellation. Subclasses add the signal of a finished
+    task and emit it from finish(). The signals are delivered on the thread the
+    queue lives in (the GUI thread):
+      progress(key, percent), failed(key, message), cancelled(key)
+    cancel_exception is raised from the progress callback of a cancelled task.
+    With drop_late_results a task cancelled while it was finishing reports cancelled.
+    """
+    progress = pyqtSignal(str, int)
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal(str)
+
+    cancel_exception = Exception
+    drop_late_results = False
+
+    def __init__(self, max_workers=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_workers is not None:
+            self.pool.setMaxThreadCount(max_workers)
+        self.tasks = {}
+
+        # Connected first, so the task is forgotten before any other slot runs
+        self.failed.connect(lambda key, message: self._forget(key))
+        self.cancelled.connect(self._forget)
+
+    def submit(self, key, work):
+        """Queues work(progress_callback) under key. Returns False if key is already queued."""
+        if key in self.tasks:
+            return False
+        
+        task = BackgroundTask(key, work, self)
+        self.tasks[key] = task
+        self.pool.start(task)
+        return True
+
+    def finish(self, key, result):
+        """Called on the worker thread with the result of a task: emits the subclass signal."""
+        raise NotImplementedError
+
+    def is_running(self, key):
+        return key in self.tasks
+
+    def cancel(self, key):
+        task = self.tasks.get(key)
+        if task is None:
+            return
+        
+        task.cancel()
+        # A task still waiting in the queue never runs, so report it here
+        if self.pool.tryTake(task):
+            self.cancelled.emit(key)
+
+    def cancel_all(self):
+        for key in list(self.tasks):
+            self.cancel(key)
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _forget(self, key):
+        self.tasks.pop(key, None)
+
+class TaskRunner(BackgroundQueue):
+    """
+    Runs analysis operations off the GUI thread: work(progress_callback) runs on the pool
+    and its result comes back with finished(key, result), on the GUI thread, with
+    progress(key, percent), failed(key, message) and cancelled(key) as for the other queues.
+    """
+    finished = pyqtSignal(str, object)
+
+    cancel_exception = TaskCancelled
+    drop_late_results = True
+
+    def __init__(self, max_workers=2, parent=None):
+        super().__init__(max_workers, parent)
+        self.finished.connect(lambda key, result: self._forget(key))
+
+    def finish(self, key, result):
+        self.finished.emit(key, result)
@@ -0,0 +1,187 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+
+from image_manipulation.lazy_image import is_memmap_backed
+from image_manipulation.valid_mask import as_valid_mask
+from image_manipulation.working_dtype import get_working_dtype
+
+# Rows read/written per block by the chunked variants
+DEFAULT_CHUNK_ROWS = 256
+
+def _as_cube(image_array):
+    """Views a 2D (rows, cols) raster as (rows, cols, 1)."""
+    if image_array.ndim == 2:
+        return image_array[:, :, np.newaxis]
+    if image_array.ndim != 3:
+        raise ValueError("Unsupported image array dimensions")
+    return image_array
+
+def _as_matrix(values):
+    """Views a 1D result (one value per pixel) as (n_pixels, 1)."""
+    if values.ndim == 1:
+        return values.reshape(-1, 1)
+    if values.ndim != 2:
+        raise ValueError("Pixel values must be a 1D or 2D array")
+    return values
+
+def _pixel_dtype(image_array, dtype):
+    """Pixels are gathered in the working dtype (float32 by default), whatever the cube is stored as."""
+    if dtype is not None:
+        return np.dtype(dtype)
+    return get_working_dtype()
+
+def _row_blocks(rows, chunk_rows):
+    for start in range(0, rows, chunk_rows):
+        yield start, min(start + chunk_rows, rows)
+
+def gather_pixels(image_array, non_masked_indices, dtype=None, chunk_rows=None):
+    """
+    Returns the valid pixels of a (rows, cols, bands) cube as an (n_pixels, n_bands) matrix,
+    in the same row-major order as the mask.
+    In-memory cubes are gathered with a single fancy-indexing operation on the flat indices.
+    Memory-mapped cubes (or any cube when chunk_rows is given) are read row block by
+    row block into the preallocated output, so only one block is paged in at a time.
+    """
+    image_array = _as_cube(image_array)
+    rows, cols, bands = image_array.shape
+    mask = as_valid_mask(non_masked_indices, (rows, cols))
+    dtype = _pixel_dtype(image_array, dtype)
+
+    if chunk_rows is None and not is_memmap_backed(image_array):
+        if image_array.flags.c_contiguous:
+            pixels = image_array.reshape(-1, bands)[mask.flat_indices]
+        else:
+            pixels = image_array[mask.row_indices, mask.col_indices]
+        return pixels.astype(dtype, copy=False)
+
+    pixels = np.empty((mask.count, bands), dtype=dtype)
+    for start, stop, block_pixels in iter_gather_chunks(image_array, mask, chunk_rows or DEFAULT_CHUNK_ROWS):
+        pixels[start:stop] = block_pixels
+    return pixels
+
+def iter_gather_chunks(image_array, non_masked_indices, chunk_rows=DEFAULT_CHUNK_ROWS, dtype=None):
+    """
+    Streams the valid pixels of a cube row block by row block.
+    Yields (start, stop, pixels) where pixels is the (stop - start, n_bands) slice
+    of what gather_pixels would return. Row blocks without valid pixels are skipped.
+    """
+    image_array = _as_cube(image_array)
+    rows, cols, _ = image_array.shape
+    mask = as_valid_mask(non_masked_indices, (rows, cols))
+    dtype = _pixel_dtype(image_array, dtype)
+
+    offset = 0
+    for row_start, row_stop in _row_blocks(rows, chunk_rows):
+        block_valid = mask.valid[row_start:row_stop]
+        n_valid = int(np.count_nonzero(block_valid))
+        if n_valid == 0:
+            continue
+        block = np.asarray(image_array[row_start:row_stop])
+        pixels = block[block_valid].astype(dtype, copy=False)
+        yield offset, offset + n_valid, pixels
+        offset += n_valid
+
+def scatter_pixels(values, non_masked_indices, shape, fill_value=np.nan, dtype=None):
+    """
+    Rebuilds a (rows, cols, n_components) cube from an (n_pixels, n_components) result
+    (or a 1D result with one value per pixel). Pixels outside the mask get fill_value.
+    The cube is built in the working dtype unless dtype is given.
+    """
+    dtype = _pixel_dtype(values, dtype)
+    values = _as_matrix(np.asarray(values))
+    rows, cols = shape[:2]
+    mask = as_valid_mask(non_masked_indices, (rows, cols))
+    if values.shape[0] != mask.count:
+        raise ValueError(f"Got {values.shape[0]} pixel values for a mask with {mask.count} valid pixels")
+
+    cube = np.full((rows * cols, values.shape[1]), fill_value, dtype=dtype)
+    cube[mask.flat_indices] = values
+    return cube.reshape(rows, cols, values.shape[1])
+
+def iter_scatter_chunks(values, non_masked_indices, shape, chunk_rows=DEFAULT_CHUNK_ROWS, fill_value=np.nan, dtype=None):
+    """
+    Chunked variant of scatter_pixels.
+    Yields (row_start, row_stop, block) where block is the (row_stop - row_start, cols, n_components)
+    part of the rebuilt cube. values only needs to support slicing (ndarray, np.memmap,
+    h5py dataset), so results that do not fit in RAM can be streamed as well.
+    """
+    rows, cols = shape[:2]
+    mask = as_valid_mask(non_masked_indices, (rows, cols))
+    if values.shape[0] != mask.count:
+        raise ValueError(f"Got {values.shape[0]} pixel values for a mask with {mask.count} valid pixels")
+    n_components = values.shape[1] if len(values.shape) > 1 else 1
+    dtype = _pixel_dtype(values, dtype)
+
+    offset = 0
+    for row_start, row_stop in _row_blocks(rows, chunk_rows):
+        block_valid = mask.valid[row_start:row_stop]
+        n_valid = int(np.count_nonzero(block_valid))
+        block = np.full((row_stop - row_start, cols, n_components), fill_value, dtype=dtype)
+        if n_valid:
+            block[block_valid] = _as_matrix(np.asarray(values[offset:offset + n_valid]))
+        offset += n_valid
+        yield row_start, row_stop, block
+
+def iter_scatter_band_blocks(values, non_masked_indices, shape, chunk_rows=DEFAULT_CHUNK_ROWS, fill_value=np.nan, dtype=None):
+    """
+    Band-first variant of iter_scatter_chunks for writers (rasterio wants (bands, rows, cols)).
+    Yields (row_start, row_stop, block) with block shaped (n_components, row_stop - row_start, cols).
+    One buffer is reused for every block, so a block is only valid until the next one is requested.
+    """
+    rows, cols = shape[:2]
+    mask = as_valid_mask(non_masked_indices, (rows, cols))
+    if values.shape[0] != mask.count:
+        raise ValueError(f"Got {values.shape[0]} pixel values for a mask with {mask.count} valid pixels")
+    n_components = values.shape[1] if len(values.shape) > 1 else 1
+    dtype = _pixel_dtype(values, dtype)
+
+    buffer = np.empty((n_components, min(chunk_rows, rows), cols), dtype=dtype)
+    offset = 0
+    for row_start, row_stop in _row_blocks(rows, chunk_rows):
+        block_valid = mask.valid[row_start:row_stop]
+        n_valid = int(np.count_nonzero(block_valid))
+        block = buffer[:, :row_stop - row_start]
+        block.fill(fill_value)
+        if n_valid:
+            pixels = _as_matrix(np.asarray(values[offset:offset + n_valid]))
+            for band in range(n_components):
+                block[band][block_valid] = pixels[:, band]
+        offset += n_valid
+        yield row_start, row_stop, block
+
+def scatter_pixels_into(out, values, non_masked_indices, chunk_rows=DEFAULT_CHUNK_ROWS, fill_value=np.nan):
+    """
+    Writes the rebuilt cube into a preallocated (rows, cols, n_components) array,
+    e.g. a np.memmap, one row block at a time.
+    """
+    out = _as_cube(out)
+    for row_start, row_stop, block in iter_scatter_chunks(values, non_masked_indices, out.shape,
+                                                          chunk_rows, fill_value, out.dtype):
+        out[row_start:row_stop] = block
+    return out
@@ -0,0 +1,71 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Any
+
+@dataclass
+class ImageMetadata:
+    """
+    Georeferencing and band information of an image, as returned by loading.read_metadata.
+    Field order matches the tuple metadata_extract has always returned, followed by the
+    no-data value declared by the file (ENVI data ignore value, GeoTIFF nodata, PRISMA FillValue).
+    """
+    map_info: Any
+    coordinates: Any
+    cols: int
+    rows: int
+    bands: int
+    interleave: str
+    wavelengths: Any
+    pixel_size_x: float
+    pixel_size_y: float
+    x_origin: float
+    y_origin: float
+    nodata: Any = None
+
+    def as_dict(self):
+        """Dictionary stored in MainWindow.image_data[path]['metadata']."""
+        return asdict(self)
+
+    def as_tuple(self):
+        """The 11-tuple returned by metadata_extract."""
+        return (self.map_info, self.coordinates, self.cols, self.rows, self.bands, self.interleave,
+                self.wavelengths, self.pixel_size_x, self.pixel_size_y, self.x_origin, self.y_origin)
+
+@dataclass
+class ImageRecord:
+    """
+    Everything loading.load_image gets out of one open of a file:
+    the (rows, cols, bands) array (a np.memmap view for ENVI), the ValidMask, the metadata
+    and the subsetting.ImageSubset that was loaded (None for the whole image).
+    """
+    path: str
+    array: Any
+    mask: Any
+    metadata: ImageMetadata
+    subset: Any = None
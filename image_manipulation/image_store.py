@@ -0,0 +1,212 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from image_manipulation.lazy_image import is_memmap_backed
+
+# Used when the physical memory size cannot be queried
+FALLBACK_BUDGET_BYTES = 4 * 1024 ** 3
+
+def default_budget_bytes():
+    """Half of the physical memory of the machine."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // 2
+    except (AttributeError, ValueError, OSError):
+        return FALLBACK_BUDGET_BYTES
+
+def reload_from_source(path, subset=None):
+    """Default reload: reopens only the array (same subset) of the file it was loaded from."""
+    from image_manipulation import loading
+    return loading.load_array(path, subset)
+
+def resident_bytes(image_array):
+    """RAM held by an array; memory-mapped arrays are paged by the OS and count as 0."""
+    if image_array is None or is_memmap_backed(image_array):
+        return 0
+    return image_array.nbytes
+
+class StoredImage(MutableMapping):
+    """
+    One entry of an ImageStore. Behaves like the {'array', 'metadata', 'non_masked_indices'}
+    dict MainWindow.image_data always held (plus the 'subset' that was loaded):
+    reading 'array' reloads it if it was evicted.
+    """
+    def __init__(self, store, path, fields):
+        self.store = store
+        self.path = path
+        self.fields = dict(fields)
+
+    def __getitem__(self, key):
+        if key == 'array':
+            return self.store.get_array(self.path)
+        return self.fields[key]
+
+    def __setitem__(self, key, value):
+        if key == 'array':
+            self.store.set_array(self.path, value)
+        else:
+            self.fields[key] = value
+
+    def __delitem__(self, key):
+        del self.fields[key]
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __repr__(self):
+        return f"StoredImage({self.path!r}, resident={self.store.is_resident(self.path)})"
+
+class ImageStore(MutableMapping):
+    """
+    Process-wide store for the imported images (MainWindow.image_data).
+    Arrays held in RAM count against budget_bytes; when the budget is exceeded the
+    least recently used arrays are dropped and transparently reloaded from their
+    source file (reload_function(path, subset), with the entry's 'subset' if it has one)
+    the next time they are accessed.
+    Memory-mapped arrays (ENVI) are already backed by their file and are never evicted.
+    Metadata and masks always stay in memory.
+    """
+    def __init__(self, budget_bytes=None, reload_function=reload_from_source):
+        self.budget_bytes = budget_bytes if budget_bytes is not None else default_budget_bytes()
+        self.reload_function = reload_function
+        self.entries = OrderedDict()  # path -> StoredImage, least recently used first
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.reload_seconds = 0.0
+
+    def __getitem__(self, path):
+        with self.lock:
+            entry = self.entries[path]
+            self.entries.move_to_end(path)
+            return entry
+
+    def __setitem__(self, path, image_info):
+        with self.lock:
+            entry = StoredImage(self, path, image_info)
+            self.entries[path] = entry
+            self.entries.move_to_end(path)
+            self.enforce_budget(keep=path)
+
+    def __delitem__(self, path):
+        with self.lock:
+            del self.entries[path]
+
+    def __iter__(self):
+        return iter(list(self.entries))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, path):
+        return path in self.entries
+
+    def get_array(self, path):
+        with self.lock:
+            entry = self.entries[path]
+            self.entries.move_to_end(path)
+            image_array = entry.fields.get('array')
+            if image_array is not None:
+                self.hits += 1
+                return image_array
+            
+            self.misses += 1
+            start = time.perf_counter()
+            image_array = self.reload_function(path, entry.fields.get('subset'))
+            self.reload_seconds += time.perf_counter() - start
+            entry.fields['array'] = image_array
+            self.enforce_budget(keep=path)
+            return image_array
+
+    def set_array(self, path, image_array):
+        with self.lock:
+            self.entries[path].fields['array'] = image_array
+            self.entries.move_to_end(path)
+            self.enforce_budget(keep=path)
+
+    def is_resident(self, path):
+        return self.entries[path].fields.get('array') is not None
+
+    def resident_bytes(self):
+        return sum(resident_bytes(entry.fields.get('array')) for entry in self.entries.values())
+
+    def set_budget(self, budget_bytes):
+        with self.lock:
+            self.budget_bytes = budget_bytes
+            self.enforce_budget()
+
+    def enforce_budget(self, keep=None):
+        """Evicts least recently used in-RAM arrays until the budget is met (never "keep")."""
+        with self.lock:
+            used = self.resident_bytes()
+            for path, entry in list(self.entries.items()):
+                if used <= self.budget_bytes:
+                    break
+                if path == keep:
+                    continue
+                
+                size = resident_bytes(entry.fields.get('array'))
+                if size == 0:
+                    continue
+                
+                entry.fields['array'] = None
+                used -= size
+                self.evictions += 1
+                self.evicted_bytes += size
+
+    def stats(self):
+        with self.lock:
+            requests = self.hits + self.misses
+            return {
+                'images': len(self.entries),
+                'resident_images': sum(1 for path in self.entries if self.is_resident(path)),
+                'resident_bytes': self.resident_bytes(),
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes,
+                'reload_seconds': self.reload_seconds,
+                'hit_rate': self.hits / requests if requests else 0.0
+            }
+
+    def __repr__(self):
+        stats = self.stats()
+        return (f"ImageStore({stats['images']} images, {stats['resident_bytes'] / 1024 ** 2:.1f}/"
+                f"{stats['budget_bytes'] / 1024 ** 2:.1f} MB, hits={stats['hits']}, "
+                f"misses={stats['misses']}, evictions={stats['evictions']}, "
+                f"reload time={stats['reload_seconds']:.1f} s)")
@@ -0,0 +1,120 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Sentinels used when the file does not declare its own no-data value
+# (-999999 is a common fill value, -32768 is used by EnMAP)
+DEFAULT_NODATA_VALUES = (-999999, -32768)
+
+# Rows per block: small enough to stay in cache, large enough to keep numpy busy
+DEFAULT_ROW_BLOCK = 256
+
+# Reductions release the GIL, so a few threads help with large cubes and memory maps
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+
+def masked_pixels(block, nodata_values=None):
+    """
+    Returns a (rows, cols) boolean array, True for the invalid pixels of a 2D raster or
+    (rows, cols, bands) cube (or any row/column block of one). A pixel is invalid if:
+      - It contains NaN
+      - Single band: it is 0 or a no-data value
+      - No declared values (nodata_values=None): it is constant across all bands
+        (which covers DEFAULT_NODATA_VALUES, or 0, in all bands)
+      - Values declared by the file (nodata_values): all its bands hold the same declared
+        value, or 0; other constant spectra are kept, the file says what is no-data
+    All criteria are computed in one traversal of the block, without full-size temporaries.
+    """
+    declared = nodata_values is not None
+    nodata_values = tuple(nodata_values) if declared else DEFAULT_NODATA_VALUES
+
+    if block.ndim == 2:
+        masked = np.isnan(block)
+        for value in nodata_values:
+            masked |= block == value
+        return masked
+    elif block.ndim != 3:
+        raise ValueError("Unsupported image array dimensions")
+
+    if block.shape[2] == 1:
+        band = block[:, :, 0]
+        masked = np.isnan(band) | (band == 0)
+        for value in nodata_values:
+            masked |= band == value
+        return masked
+    
+    # min is NaN as soon as one band is NaN, and min == max for constant pixels
+    band_min = block.min(axis=2)
+    masked = np.isnan(band_min)
+    constant = band_min == block.max(axis=2)
+    if not declared:
+        return masked | constant
+    
+    fill = band_min == 0
+    for value in nodata_values:
+        fill |= band_min == value
+    return masked | (constant & fill)
+
+def compute_invalid_mask(image_array, nodata_values=None, row_block=DEFAULT_ROW_BLOCK,
+                         n_threads=DEFAULT_THREADS, progress_callback=None):
+    """
+    Chunked masked_pixels over the whole image: row blocks are processed independently
+    (in n_threads threads when n_threads > 1), so a memory-mapped cube is paged in
+    one block at a time. progress_callback(done_rows, rows) is called from the calling
+    thread as blocks complete; an exception raised by it stops the computation.
+    """
+    rows = image_array.shape[0]
+    masked = np.zeros(image_array.shape[:2], dtype=bool)
+    blocks = [(start, min(start + row_block, rows)) for start in range(0, rows, row_block)]
+
+    def run(bounds):
+        row_start, row_stop = bounds
+        masked[row_start:row_stop] = masked_pixels(np.asarray(image_array[row_start:row_stop]), nodata_values)
+        return row_stop
+
+    if n_threads is None or n_threads <= 1 or len(blocks) <= 1:
+        for bounds in blocks:
+            row_stop = run(bounds)
+            if progress_callback is not None:
+                progress_callback(row_stop, rows)
+        return masked
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        futures = [executor.submit(run, bounds) for bounds in blocks]
+        try:
+            for done, future in enumerate(futures, start=1):
+                future.result()
+                if progress_callback is not None:
+                    progress_callback(min(done * row_block, rows), rows)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return masked
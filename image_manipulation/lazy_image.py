@@ -0,0 +1,94 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+import spectral.io.envi as envi
+
+# ENVI interleave -> shape of the raw file on disk, in terms of (rows, cols, bands)
+_RAW_LAYOUTS = {
+    'bsq': lambda rows, cols, bands: (bands, rows, cols),
+    'bil': lambda rows, cols, bands: (rows, bands, cols),
+    'bip': lambda rows, cols, bands: (rows, cols, bands),
+}
+
+# Axes permutation that turns the raw layout into (rows, cols, bands)
+_TO_BIP = {
+    'bsq': (1, 2, 0),
+    'bil': (0, 2, 1),
+    'bip': (0, 1, 2),
+}
+
+def open_envi_memmap(path, mode='r'):
+    """
+    Opens an ENVI image (.hdr path) as a memory-mapped array with shape (rows, cols, bands).
+    Nothing is read from disk until the array is indexed, and only the touched
+    rows/bands are paged in. The returned array is a strided view over the
+    np.memmap, so the on-disk BSQ/BIL/BIP interleave is kept as is.
+    """
+    img = envi.open(path)
+    return envi_memmap(envi_layout(img), mode)
+
+def envi_layout(img):
+    """
+    Everything envi_memmap needs to map the data file of an opened spectral SpyFile.
+    Closes the file handle spectral keeps open; the dict can be cached and reused.
+    """
+    interleave = str(img.metadata.get('interleave', 'bsq')).lower()
+    if interleave not in _RAW_LAYOUTS:
+        raise ValueError(f"Unsupported ENVI interleave: {interleave}")
+
+    layout = {
+        'filename': img.filename,
+        'dtype': np.dtype(img.dtype),
+        'offset': img.offset,
+        'shape': img.shape,
+        'interleave': interleave
+    }
+    img.fid.close()
+    return layout
+
+def envi_memmap(layout, mode='r'):
+    """Maps the data file described by envi_layout as a (rows, cols, bands) view."""
+    rows, cols, bands = layout['shape']
+    interleave = layout['interleave']
+    raw = np.memmap(
+        layout['filename'],
+        dtype=layout['dtype'],
+        mode=mode,
+        offset=layout['offset'],
+        shape=_RAW_LAYOUTS[interleave](rows, cols, bands)
+    )
+    return np.transpose(raw, _TO_BIP[interleave])
+
+def is_memmap_backed(image_array):
+    """Returns True if the array is a np.memmap or a view of one."""
+    array = image_array
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
@@ -26,132 +26,234 @@ If you want to contact the author, please send an email to aethergeoofficial@gma
 """
 
 import os
+import threading
+from collections import OrderedDict
 import numpy as np
 import rasterio
 import h5py
 import spectral.io.envi as envi
-import spectral as spy
-from scipy.ndimage import zoom
 from pyproj import Transformer
 
-def get_non_masked_indices(image_array):
+from image_manipulation.image_record import ImageMetadata, ImageRecord
+from image_manipulation.invalid_pixels import DEFAULT_THREADS, compute_invalid_mask, masked_pixels
+from image_manipulation.lazy_image import envi_layout, envi_memmap
+from image_manipulation.subsetting import ImageSubset
+from image_manipulation.prisma_reading import find_prisma_root, prisma_cube_shape, read_prisma_cube
+from image_manipulation.tiled_reading import read_tiff_bip
+from image_manipulation.valid_mask import ValidMask
+from image_manipulation.working_dtype import get_working_dtype
+
+# Parsed headers, least recently used first:
+# absolute path -> (file stamps, (ImageMetadata, ENVI data file layout or None))
+_HEADER_CACHE = OrderedDict()
+_HEADER_CACHE_LOCK = threading.Lock()
+HEADER_CACHE_SIZE = 32
+
+class LoadCancelled(Exception):
+    """Raised by a progress callback to stop a load that is still running."""
+    pass
+
+def get_non_masked_indices(image_array, nodata_values=None, n_threads=DEFAULT_THREADS):
     """
-    Returns a list of indices (row, col) for pixels that are considered valid.
+    Returns a ValidMask with the pixels that are considered valid.
     A pixel is considered masked (invalid) if:
       - It contains NaN
       - It is equal to -999999 (for all bands, if multi-band)
       - It is equal to -32768 (for EnMap images)
       - It is equal to 0 (for all bands, if multi-band)
       - It is composed of a constant value across all bands
+    When the file declares its own no-data values (nodata_values), they replace the
+    -999999/-32768 sentinels and the constant-spectrum rule: a pixel is masked when all
+    its bands hold a declared value (or 0).
+    See invalid_pixels.compute_invalid_mask.
     """
-    if image_array.ndim == 2:
-        valid = ~(np.isnan(image_array) | 
-                 (image_array == -999999) | 
-                 (image_array == -32768))
-        indices = np.argwhere(valid)
-        return [tuple(idx) for idx in indices]
-    elif image_array.ndim == 3:
-        mask_nan = np.any(np.isnan(image_array), axis=2)
-        mask_bad = (image_array == -999999).all(axis=2)
-        mask_enmap = (image_array == -32768).all(axis=2)
-        mask_zeros = (image_array == 0).all(axis=2)
-        
-        if image_array.shape[2] > 1:
-            mask_constant = (np.ptp(image_array, axis=2) == 0)
-        else:
-            mask_constant = np.zeros(image_array.shape[:2], dtype=bool)
-            mask_constant = ((image_array[:,:,0] == -999999) | 
-                           (image_array[:,:,0] == -32768) | 
-                           np.isnan(image_array[:,:,0]) | 
-                           (image_array[:,:,0] == 0))
-            
-        valid = ~(mask_nan | mask_bad | mask_enmap | mask_zeros | mask_constant)
-        indices = np.argwhere(valid)
-        return [tuple(idx) for idx in indices]
-    else:
-        raise ValueError("Unsupported image array dimensions")
+    return ValidMask(~compute_invalid_mask(image_array, nodata_values, n_threads=n_threads))
 
-def normal_image_load(path):
-    """ 
-    Takes input images and returns the non-masked indices and the image array.
-    The function supports ENVI and TIFF formats.
-    """
+def _nodata_values(metadata):
+    return None if metadata.nodata is None else (metadata.nodata,)
+
+def _check_path(path):
     if path is None:
         raise ValueError("Path cannot be None")
         
     if not os.path.exists(path):
         raise FileNotFoundError("File not found")
-        
-    file_ext = os.path.splitext(path)[1].lower()
+
+    return os.path.splitext(path)[1].lower()
+
+def _file_stamps(path, header):
+    """Modification time and size of the file and, for ENVI, of its data file."""
+    files = [path] if header[1] is None else [path, header[1]['filename']]
+    return tuple((stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, files))
+
+def _cached_header(path):
+    """Header parsed earlier for path, or None if there is none or a file changed since."""
+    path = os.path.abspath(path)
+    with _HEADER_CACHE_LOCK:
+        entry = _HEADER_CACHE.get(path)
+    if entry is None:
+        return None
+    
+    stamps, header = entry
+    try:
+        if _file_stamps(path, header) != stamps:
+            return None
+    except OSError:
+        return None
+    with _HEADER_CACHE_LOCK:
+        if path in _HEADER_CACHE:
+            _HEADER_CACHE.move_to_end(path)
+    return header
+
+def _cache_header(path, header):
+    path = os.path.abspath(path)
+    stamps = _file_stamps(path, header)
+    with _HEADER_CACHE_LOCK:
+        _HEADER_CACHE[path] = (stamps, header)
+        _HEADER_CACHE.move_to_end(path)
+        while len(_HEADER_CACHE) > HEADER_CACHE_SIZE:
+            _HEADER_CACHE.popitem(last=False)
+
+def clear_header_cache():
+    with _HEADER_CACHE_LOCK:
+        _HEADER_CACHE.clear()
+
+def _tiff_window(subset):
+    """Rasterio window and band list of a subset (None, None reads everything)."""
+    if subset is None:
+        return None, None
+    return subset.window, subset.bands
+
+def _tiff_dtype(src):
+    # Floating point cubes are kept in the working dtype; integer cubes stay
+    # integer (smaller, exact) and are converted when pixels are gathered
+    return get_working_dtype() if np.issubdtype(np.dtype(src.dtypes[0]), np.floating) else None
+
+def load_image(path, progress_callback=None, window=None, geo_window=None, bands=None, wavelength_range=None):
+    """
+    Opens the file once and returns an ImageRecord with the (rows, cols, bands) array,
+    its ValidMask and its ImageMetadata.
+    The function supports ENVI, TIFF and PRISMA (.he5) formats.
+    ENVI images are returned as a memory-mapped view, so only the parts of the file
+    that are actually indexed get read from disk.
+    The last HEADER_CACHE_SIZE parsed headers are cached, checked against the modification
+    time and size of the file (and of the ENVI data file), so opening an unchanged file
+    again skips the header parsing (and, for PRISMA, the walk over the HDF5 tree).
+    progress_callback(done, total), if given, is called as the file is read; it may
+    raise LoadCancelled to abort the load.
+    Only part of the image can be loaded (see subsetting.ImageSubset.resolve):
+      window = (row_start, row_stop, col_start, col_stop) or geo_window = (x_min, y_min, x_max, y_max)
+      bands = 0-based band list or wavelength_range = (min_nm, max_nm)
+    Only the bytes of the subset are read, and the metadata describes the subset.
+    """
+    file_ext = _check_path(path)
     try:
+        header = _cached_header(path)
         if file_ext == ".hdr":
-            image = envi.open(path).load()
-            image_array = np.array(image)
-            non_masked_indices = get_non_masked_indices(image_array)
-            return non_masked_indices, image_array
+            if header is None:
+                img = envi.open(path)
+                header = (_envi_metadata(img), envi_layout(img))
+            subset = ImageSubset.resolve(header[0], window, geo_window, bands, wavelength_range)
+            image_array = envi_memmap(header[1])
+            if subset is not None:
+                image_array = subset.apply(image_array)
+            masked = compute_invalid_mask(image_array, _nodata_values(header[0]),
+                                          progress_callback=progress_callback)
         elif file_ext in ('.tif', '.tiff'):
             with rasterio.open(path) as src:
-                image = src.read()
-                image_array = np.transpose(image, (1, 2, 0))
-                non_masked_indices = get_non_masked_indices(image_array)
-                return non_masked_indices, image_array
+                if header is None:
+                    header = (_tiff_metadata(src), None)
+                subset = ImageSubset.resolve(header[0], window, geo_window, bands, wavelength_range)
+                tiff_window, tiff_bands = _tiff_window(subset)
+                out_rows = src.height if subset is None else subset.row_stop - subset.row_start
+                out_cols = src.width if subset is None else subset.col_stop - subset.col_start
+
+                # Read block by block straight into BIP order, building the mask on the way
+                nodata_values = _nodata_values(header[0])
+                masked = np.zeros((out_rows, out_cols), dtype=bool)
+                total_pixels = out_rows * out_cols
+                done_pixels = [0]
+
+                def mask_block(window, block):
+                    row_slice, col_slice = window.toslices()
+                    masked[row_slice, col_slice] = masked_pixels(block, nodata_values)
+                    if progress_callback is not None:
+                        done_pixels[0] += block.shape[0] * block.shape[1]
+                        progress_callback(done_pixels[0], total_pixels)
+
+                image_array = read_tiff_bip(src, bands=tiff_bands, dtype=_tiff_dtype(src),
+                                            block_callback=mask_block, window=tiff_window)
         elif file_ext == '.he5':
             with h5py.File(path, 'r') as f:
-                prisma_roots = [
-                    '/HDFEOS/SWATHS/PRS_L2D_HCO/',
-                    '/HDFEOS/SWATHS/PRS_L2D_PCO/',
-                    '/HDFEOS/SWATHS/PRS_L1_STD/',
-                    '/HDFEOS/SWATHS/PRS_L2C_PCO/'
-                ]
-                
-                root_path = None
-                for path in prisma_roots:
-                    if path in f:
-                        root_path = path
-                        break
-                
+                if header is None:
+                    header = (_prisma_metadata(f), None)
+                subset = ImageSubset.resolve(header[0], window, geo_window, bands, wavelength_range)
+
+                root_path = find_prisma_root(f)
                 if not root_path:
                     raise ValueError("Could not find a valid PRISMA data path")
                 
-                vnir_path = f"{root_path}Data Fields/VNIR_Cube"
-                swir_path = f"{root_path}Data Fields/SWIR_Cube"
-                
-                if vnir_path not in f or swir_path not in f:
-                    raise ValueError(f"VNIR or SWIR cube not found at expected paths: {vnir_path}, {swir_path}")
-                
-                vnir = f[vnir_path][:]
-                swir = f[swir_path][:]
-                                             
-                vnir_reshaped = np.transpose(vnir, (0, 2, 1))
-                swir_reshaped = np.transpose(swir, (0, 2, 1))
-                
-                if vnir_reshaped.shape[0] != swir_reshaped.shape[0] or vnir_reshaped.shape[1] != swir_reshaped.shape[1]:
+                # Sliced row block by row block into a preallocated working dtype cube,
+                # building the mask on the way (FillValues are already NaN by then)
+                rows, cols, _ = prisma_cube_shape(f, root_path)
+                if subset is not None:
+                    rows, cols = subset.row_stop - subset.row_start, subset.col_stop - subset.col_start
+                masked = np.zeros((rows, cols), dtype=bool)
 
-                    zoom_factors = (
-                        vnir_reshaped.shape[0] / swir_reshaped.shape[0],  # rows
-                        vnir_reshaped.shape[1] / swir_reshaped.shape[1],  # cols
-                        1  # bands (keep as is)
-                    )
-                    
-                    swir_resampled = zoom(swir_reshaped, zoom_factors, order=0)  
-                else:
-                    swir_resampled = swir_reshaped
-                
-                vnir_fill = f[vnir_path].attrs.get('FillValue', -9999)
-                swir_fill = f[swir_path].attrs.get('FillValue', -9999)
-                
-                image_array = np.concatenate((
-                    np.where(vnir_reshaped <= vnir_fill, np.nan, vnir_reshaped),
-                    np.where(swir_resampled <= swir_fill, np.nan, swir_resampled)
-                ), axis=2)
-                
-                non_masked_indices = get_non_masked_indices(image_array)
-                return non_masked_indices, image_array
+                def mask_block(row_start, row_stop, block):
+                    masked[row_start:row_stop] = masked_pixels(block)
+                    if progress_callback is not None:
+                        progress_callback(row_stop, rows)
+
+                image_array = read_prisma_cube(f, root_path, block_callback=mask_block, subset=subset)
         else:
             raise ValueError(f"Unsupported file format: {file_ext}")
+
+        _cache_header(path, header)
+        metadata = header[0] if subset is None else subset.metadata(header[0])
+        return ImageRecord(path, image_array, ValidMask(~masked), metadata, subset)
+    except LoadCancelled:
+        raise
     except Exception as e:
         raise RuntimeError(f"Error loading image: {str(e)}")
 
+def load_array(path, subset=None):
+    """
+    Reopens only the (rows, cols, bands) array of an image opened with load_image, e.g. to
+    bring back a cube evicted from memory: no mask is computed and no metadata is parsed
+    again (the cached header is used). subset = the ImageRecord.subset it was loaded with,
+    so the array matches the stored mask and metadata.
+    ENVI images come back memory-mapped, TIFF and PRISMA read only the subset.
+    """
+    file_ext = _check_path(path)
+    try:
+        if file_ext == ".hdr":
+            header = _cached_header(path)
+            image_array = envi_memmap(header[1] if header is not None else envi_layout(envi.open(path)))
+            return image_array if subset is None else subset.apply(image_array)
+        elif file_ext in ('.tif', '.tiff'):
+            with rasterio.open(path) as src:
+                tiff_window, tiff_bands = _tiff_window(subset)
+                return read_tiff_bip(src, bands=tiff_bands, dtype=_tiff_dtype(src), window=tiff_window)
+        elif file_ext == '.he5':
+            with h5py.File(path, 'r') as f:
+                root_path = find_prisma_root(f)
+                if not root_path:
+                    raise ValueError("Could not find a valid PRISMA data path")
+                return read_prisma_cube(f, root_path, subset=subset)
+        else:
+            raise ValueError(f"Unsupported file format: {file_ext}")
+    except Exception as e:
+        raise RuntimeError(f"Error loading image: {str(e)}")
+
+def normal_image_load(path, progress_callback=None, window=None, geo_window=None, bands=None, wavelength_range=None):
+    """ 
+    Takes input images and returns the non-masked indices and the image array.
+    See load_image, which also returns the metadata read from the same open file.
+    """
+    record = load_image(path, progress_callback, window, geo_window, bands, wavelength_range)
+    return record.mask, record.array
+
 def get_utm_zone(longitude, latitude):
     """
     Calculate UTM zone from WGS84 coordinates with special cases handling.
@@ -211,273 +313,294 @@ def transform_prisma_coords(x_origin, y_origin, pixel_size_x, pixel_size_y, rows
     except Exception as e:
         raise ValueError(f"Coordinate transformation failed: {str(e)}")
 
-def metadata_extract(path):
-    if path is None:
-        raise ValueError("Path cannot be None")
+def read_metadata(path, window=None, geo_window=None, bands=None, wavelength_range=None):
+    """
+    Returns the ImageMetadata of path, reading only the header part of the file.
+    Served from the header cache when the file has not changed since it was last parsed.
+    With a window and/or band subset (see load_image) the metadata describes the subset:
+    size, origin (geotransform) and wavelengths are adjusted.
+    """
+    file_ext = _check_path(path)
+    try:
+        metadata = _read_full_metadata(path, file_ext)
+        subset = ImageSubset.resolve(metadata, window, geo_window, bands, wavelength_range)
+        return metadata if subset is None else subset.metadata(metadata)
+    except Exception as e:
+        raise RuntimeError(f"Error loading image: {str(e)}")
+
+def _read_full_metadata(path, file_ext):
+    header = _cached_header(path)
+    if header is not None:
+        return header[0]
+    
+    if file_ext == ".hdr":
+        img = envi.open(path)
+        header = (_envi_metadata(img), envi_layout(img))
+    elif file_ext == '.tif' or file_ext == '.tiff':
+        with rasterio.open(path) as src:
+            header = (_tiff_metadata(src), None)
+    elif file_ext == '.he5':
+        with h5py.File(path, 'r') as f:
+            header = (_prisma_metadata(f), None)
+    else:
+        raise ValueError(f"Unsupported file format: {file_ext}")
+
+    _cache_header(path, header)
+    return header[0]
+
+def metadata_extract(path, window=None, geo_window=None, bands=None, wavelength_range=None):
+    """
+    Returns (map_info, cords, cols, rows, bands, interleave, wavelengths,
+    pixel_size_x, pixel_size_y, x_origin, y_origin), adjusted to the subset if one is given.
+    """
+    return read_metadata(path, window, geo_window, bands, wavelength_range).as_tuple()
+
+def _envi_metadata(img):
+    map_info = img.metadata.get('map info', None)  # Spatial info
+    cords = img.metadata.get('coordinate system string', None)
+    cols = int(img.metadata['samples'])  # Number of columns
+    rows = int(img.metadata['lines'])      # Number of rows
+    bands = int(img.metadata['bands'])      # Number of bands
+    interleave = img.metadata['interleave'] # Interleave format (e.g., 'bip', 'bil', 'bsq')
+    wavelengths = img.metadata.get('wavelength', None)  # List of wavelengths (if available)
+    nodata = img.metadata.get('data ignore value', None)  # No-data value (if declared)
+    nodata = float(nodata) if nodata is not None else None
+    
+    if map_info and len(map_info) >= 7:
+        x_origin = float(map_info[3])
+        y_origin = float(map_info[4])
+        pixel_size_x = float(map_info[5])  # Pixel width
+        pixel_size_y = float(map_info[6])  # Pixel height
+    else:
+        x_origin = 0
+        y_origin = 0
+        pixel_size_x = 1
+        pixel_size_y = 1
         
-    if not os.path.exists(path):
-        raise FileNotFoundError("File not found")
+    return ImageMetadata(map_info, cords, cols, rows, bands, interleave, wavelengths, pixel_size_x, pixel_size_y, x_origin, y_origin, nodata)
+
+def _tiff_metadata(src):
+    cols = src.width
+    rows = src.height
+    bands = src.count
+    transform = src.transform
+    
+    x_origin = transform[2]  
+    y_origin = transform[5]
+    pixel_size_x = transform[0]
+    pixel_size_y = abs(transform[4])
+    cords = src.crs.to_string() if src.crs else None
         
-    file_ext = os.path.splitext(path)[1].lower()
+    tags = src.tags()
+    wavelengths = None
+        
+    wavelength_tags = ['wavelength', 'WAVELENGTH', 'wavelengths', 'WAVELENGTHS']
+    for tag in wavelength_tags:
+        if tag in tags:
+            try:
+                wavelengths = [float(w) for w in tags[tag].split(',')]
+                break
+            except (ValueError, AttributeError):
+                continue
+        
+    if not wavelengths:
+        try:
+            band_descs = [src.descriptions[i] for i in range(bands)]
+            if all('nm' in desc.lower() for desc in band_descs):
+                wavelengths = [float(desc.split()[0]) for desc in band_descs]
+        except (AttributeError, ValueError, IndexError):
+            wavelengths = None
+        
+    map_info = src.crs.to_dict() if src.crs else None
+    interleave = 'bip'
+    nodata = float(src.nodata) if src.nodata is not None else None
+        
+    return ImageMetadata(map_info, cords, cols, rows, bands, interleave, wavelengths, pixel_size_x, pixel_size_y, x_origin, y_origin, nodata)
+
+def _prisma_metadata(f):
+    # Initialize with defaults
+    x_origin = y_origin = 0
+    pixel_size_x = pixel_size_y = 30  # Default to 30m if no info found
+    rows = cols = bands = 0
+    wavelengths = None
+    nodata = None
+    map_info = None
+    cords = "EPSG:4326"  # Default to WGS84
+    interleave = 'bip'
+    
+    # Try different known paths for PRISMA metadata
     try:
-        if file_ext == ".hdr":
-            img = spy.envi.open(path)
-            map_info = img.metadata.get('map info', None)  # Spatial info
-            cords = img.metadata.get('coordinate system string', None)
-            cols = int(img.metadata['samples'])  # Number of columns
-            rows = int(img.metadata['lines'])      # Number of rows
-            bands = int(img.metadata['bands'])      # Number of bands
-            interleave = img.metadata['interleave'] # Interleave format (e.g., 'bip', 'bil', 'bsq')
-            wavelengths = img.metadata.get('wavelength', None)  # List of wavelengths (if available)
+        # First, find the correct root path for PRISMA data
+        root_path = find_prisma_root(f)
+        
+        if not root_path:
+            # Find any path that might contain PRISMA data
+            for key in f.keys():
+                if 'PRS' in key:
+                    root_path = f'/{key}/'
+                    break
+        
+        if root_path:
+            print(f"Found PRISMA root path: {root_path}")
+            
+            # Get cube dimensions
+            vnir_paths = [
+                f'{root_path}Data Fields/VNIR_Cube',
+                f'{root_path}Data_Fields/VNIR_Cube',
+                f'{root_path}VNIR_Cube'
+            ]
             
-            if map_info and len(map_info) >= 7:
-                x_origin = float(map_info[3])
-                y_origin = float(map_info[4])
-                pixel_size_x = float(map_info[5])  # Pixel width
-                pixel_size_y = float(map_info[6])  # Pixel height
-            else:
-                x_origin = 0
-                y_origin = 0
-                pixel_size_x = 1
-                pixel_size_y = 1
+            swir_paths = [
+                f'{root_path}Data Fields/SWIR_Cube',
+                f'{root_path}Data_Fields/SWIR_Cube',
+                f'{root_path}SWIR_Cube'
+            ]
+            
+            # Try to find VNIR cube
+            vnir_path = None
+            for path in vnir_paths:
+                if path in f:
+                    vnir_path = path
+                    break
+                    
+            # Try to find SWIR cube
+            swir_path = None
+            for path in swir_paths:
+                if path in f:
+                    swir_path = path
+                    break
                 
-            return map_info, cords, cols, rows, bands, interleave, wavelengths, pixel_size_x, pixel_size_y, x_origin, y_origin
-        elif file_ext == '.tif' or file_ext == '.tiff':
-            with rasterio.open(path) as src:
-                cols = src.width
-                rows = src.height
-                bands = src.count
-                transform = src.transform
+            bands = 0
+            rows = cols = 0
+            
+            if vnir_path in f and swir_path in f:
+                vnir_shape = f[vnir_path].shape
+                swir_shape = f[swir_path].shape
                 
-                x_origin = transform[2]  
-                y_origin = transform[5]
-                pixel_size_x = transform[0]
-                pixel_size_y = abs(transform[4])
-                cords = src.crs.to_string() if src.crs else None
-                    
-                tags = src.tags()
-                wavelengths = None
-                    
-                wavelength_tags = ['wavelength', 'WAVELENGTH', 'wavelengths', 'WAVELENGTHS']
-                for tag in wavelength_tags:
-                    if tag in tags:
-                        try:
-                            wavelengths = [float(w) for w in tags[tag].split(',')]
-                            break
-                        except (ValueError, AttributeError):
-                            continue
-                    
-                if not wavelengths:
-                    try:
-                        band_descs = [src.descriptions[i] for i in range(bands)]
-                        if all('nm' in desc.lower() for desc in band_descs):
-                            wavelengths = [float(desc.split()[0]) for desc in band_descs]
-                    except (AttributeError, ValueError, IndexError):
-                        wavelengths = None
-                    
-                map_info = src.crs.to_dict() if src.crs else None
-                interleave = 'bip'
-                    
-                return map_info, cords, cols, rows, bands, interleave, wavelengths, pixel_size_x, pixel_size_y, x_origin, y_origin
-        elif file_ext == '.he5':
-            # Improved PRISMA HDF5 format handling
-            with h5py.File(path, 'r') as f:
-                # Initialize with defaults
-                x_origin = y_origin = 0
-                pixel_size_x = pixel_size_y = 30  # Default to 30m if no info found
-                rows = cols = bands = 0
-                wavelengths = None
-                map_info = None
-                cords = "EPSG:4326"  # Default to WGS84
-                interleave = 'bip'
-                utm_zone = None
+                # PRISMA cubes are (rows, bands, cols)
+                bands_vnir = vnir_shape[1]
+                bands_swir = swir_shape[1]
+                bands = bands_vnir + bands_swir
                 
-                # Try different known paths for PRISMA metadata
-                try:
-                    # First, find the correct root path for PRISMA data
-                    prisma_roots = [
-                        '/HDFEOS/SWATHS/PRS_L2D_HCO/',
-                        '/HDFEOS/SWATHS/PRS_L2D_PCO/',
-                        '/HDFEOS/SWATHS/PRS_L1_STD/',
-                        '/HDFEOS/SWATHS/PRS_L2C_PCO/'
-                    ]
-                    
-                    root_path = None
-                    for path in prisma_roots:
-                        if path in f:
-                            root_path = path
-                            break
-                    
-                    if not root_path:
-                        # Find any path that might contain PRISMA data
-                        for key in f.keys():
-                            if 'PRS' in key:
-                                root_path = f'/{key}/'
-                                break
-                    
-                    if root_path:
-                        print(f"Found PRISMA root path: {root_path}")
-                        
-                        # Get cube dimensions
-                        vnir_paths = [
-                            f'{root_path}Data Fields/VNIR_Cube',
-                            f'{root_path}Data_Fields/VNIR_Cube',
-                            f'{root_path}VNIR_Cube'
-                        ]
-                        
-                        swir_paths = [
-                            f'{root_path}Data Fields/SWIR_Cube',
-                            f'{root_path}Data_Fields/SWIR_Cube',
-                            f'{root_path}SWIR_Cube'
-                        ]
-                        
-                        # Try to find VNIR cube
-                        vnir_path = None
-                        for path in vnir_paths:
-                            if path in f:
-                                vnir_path = path
-                                break
-                                
-                        # Try to find SWIR cube
-                        swir_path = None
-                        for path in swir_paths:
-                            if path in f:
-                                swir_path = path
-                                break
-                            
-                        bands = 0
-                        rows = cols = 0
-                        
-                        if vnir_path in f and swir_path in f:
-                            vnir_shape = f[vnir_path].shape
-                            swir_shape = f[swir_path].shape
-                            
-                            # PRISMA cubes are (rows, bands, cols)
-                            bands_vnir = vnir_shape[1]
-                            bands_swir = swir_shape[1]
-                            bands = bands_vnir + bands_swir
-                            
-                            # Spatial dimensions from VNIR (assuming same as SWIR after resampling)
-                            rows = vnir_shape[0]
-                            cols = vnir_shape[2]
-                            
-                            print(f"PRISMA bands - VNIR: {bands_vnir}, SWIR: {bands_swir}, Total: {bands}")
-                            print(f"Spatial dimensions - Rows: {rows}, Cols: {cols}")
-                        
-                        # Try to get wavelength information
-                        wavelength_paths = [
-                            f'{root_path}Data Fields/VNIR_Cube_Wavelength',  # New potential path
-                            f'{root_path}Data Fields/VNIR_Wavelength',
-                            f'{root_path}Data_Fields/VNIR_Wavelength',
-                            f'{root_path}VNIR_Wavelength',
-                            f'{root_path}Band_Center_Wavelength'  # Alternative naming convention
-                        ]
-                        
-                        for wl_path in wavelength_paths:
-                            if wl_path in f:
-                                try:
-                                    vnir_wavelengths = f[wl_path][:]
-                                    
-                                    # Try to get SWIR wavelengths too
-                                    swir_wl_path = wl_path.replace('VNIR', 'SWIR')
-                                    if swir_wl_path in f:
-                                        swir_wavelengths = f[swir_wl_path][:]
-                                        wavelengths = np.concatenate((vnir_wavelengths, swir_wavelengths)).tolist()
-                                    else:
-                                        wavelengths = vnir_wavelengths.tolist()
-                                    break
-                                except Exception as e:
-                                    print(f"Error reading wavelengths: {e}")
-                        
-                        # Try to get geolocation data
-                        geo_paths = [
-                            f'{root_path}Geolocation Fields/Latitude',
-                            f'{root_path}Geolocation_Fields/Latitude',
-                            f'{root_path}Latitude'
-                        ]
-                        
-                        for geo_path in geo_paths:
-                            if geo_path in f:
-                                try:
-                                    lat = f[geo_path][:]
-                                    lon_path = geo_path.replace('Latitude', 'Longitude')
-                                    
-                                    if lon_path in f:
-                                        lon = f[lon_path][:]
-                                        
-                                        if lat.size >= 4:  # Use corner points for better geolocation
-                                            x_origin = lon[0, 0]
-                                            y_origin = lat[0, 0]
-                                            x_end = lon[-1, -1]
-                                            y_end = lat[-1, -1]
-                                            
-                                            pixel_size_x = (x_end - x_origin) / (cols - 1)
-                                            pixel_size_y = (y_end - y_origin) / (rows - 1)
-                                            
-                                            break
-                                except Exception as e:
-                                    print(f"Error reading geolocation: {e}")
+                # Spatial dimensions from VNIR (assuming same as SWIR after resampling)
+                rows = vnir_shape[0]
+                cols = vnir_shape[2]
+                nodata = f[vnir_path].attrs.get('FillValue', None)
+                nodata = float(np.ravel(nodata)[0]) if nodata is not None else None
                 
-                    # If we couldn't find structured data, try a more general approach
-                    if rows == 0 or cols == 0 or bands == 0:
-                        # Look for any 3D datasets that might be the hyperspectral cube
-                        cube_datasets = []
-                        
-                        def find_cubes(name, obj):
-                            if isinstance(obj, h5py.Dataset) and len(obj.shape) == 3:
-                                cube_datasets.append((name, obj.shape))
+                print(f"PRISMA bands - VNIR: {bands_vnir}, SWIR: {bands_swir}, Total: {bands}")
+                print(f"Spatial dimensions - Rows: {rows}, Cols: {cols}")
+            
+            # Try to get wavelength information
+            wavelength_paths = [
+                f'{root_path}Data Fields/VNIR_Cube_Wavelength',  # New potential path
+                f'{root_path}Data Fields/VNIR_Wavelength',
+                f'{root_path}Data_Fields/VNIR_Wavelength',
+                f'{root_path}VNIR_Wavelength',
+                f'{root_path}Band_Center_Wavelength'  # Alternative naming convention
+            ]
+            
+            for wl_path in wavelength_paths:
+                if wl_path in f:
+                    try:
+                        vnir_wavelengths = f[wl_path][:]
                         
-                        f.visititems(find_cubes)
+                        # Try to get SWIR wavelengths too
+                        swir_wl_path = wl_path.replace('VNIR', 'SWIR')
+                        if swir_wl_path in f:
+                            swir_wavelengths = f[swir_wl_path][:]
+                            wavelengths = np.concatenate((vnir_wavelengths, swir_wavelengths)).tolist()
+                        else:
+                            wavelengths = vnir_wavelengths.tolist()
+                        break
+                    except Exception as e:
+                        print(f"Error reading wavelengths: {e}")
+            
+            # Try to get geolocation data
+            geo_paths = [
+                f'{root_path}Geolocation Fields/Latitude',
+                f'{root_path}Geolocation_Fields/Latitude',
+                f'{root_path}Latitude'
+            ]
+            
+            for geo_path in geo_paths:
+                if geo_path in f:
+                    try:
+                        lat = f[geo_path][:]
+                        lon_path = geo_path.replace('Latitude', 'Longitude')
                         
-                        if cube_datasets:
-                            # Sort by total size, largest first
-                            cube_datasets.sort(key=lambda x: np.prod(x[1]), reverse=True)
+                        if lon_path in f:
+                            lon = f[lon_path][:]
                             
-                            # Use the largest cube
-                            cube_path, cube_shape = cube_datasets[0]
-                            print(f"Using cube from path: {cube_path}, shape: {cube_shape}")
-                            
-                            # Determine data layout
-                            if cube_shape[0] < cube_shape[1] and cube_shape[0] < cube_shape[2]:
-                                # Format is (bands, rows, cols)
-                                bands = cube_shape[0]
-                                rows = cube_shape[1]
-                                cols = cube_shape[2]
-                            else:
-                                # Format is (rows, cols, bands)
-                                rows = cube_shape[0]
-                                cols = cube_shape[1]
-                                bands = cube_shape[2]
-                
-                except Exception as e:
-                    print(f"Error extracting PRISMA metadata: {e}")
-                    
-                print(f"Extracted metadata - Rows: {rows}, Cols: {cols}, Bands: {bands}")
-                print(f"Pixel size - X: {pixel_size_x}, Y: {pixel_size_y}")
-                print(f"Origin - X: {x_origin}, Y: {y_origin}")
-                print(f"Wavelengths: {wavelengths[:5]}... (truncated)" if wavelengths else "Wavelengths: None")
-                
-                if cords == "EPSG:4326":  # If we have WGS84 coordinates
-                    try:
-                        print(f"Converting WGS84 coordinates (lon: {x_origin}, lat: {y_origin})")
-                        utm_coords = transform_prisma_coords(
-                            x_origin, y_origin,
-                            pixel_size_x, pixel_size_y,
-                            rows, cols
-                        )
-                        x_origin = utm_coords['x_origin']
-                        y_origin = utm_coords['y_origin']
-                        pixel_size_x = utm_coords['pixel_size_x']
-                        pixel_size_y = utm_coords['pixel_size_y']
-                        cords = utm_coords['crs']
-                        print(f"Transformed to {cords}")
-                        print(f"New origin (meters) - X: {x_origin:.2f}, Y: {y_origin:.2f}")
-                        print(f"New pixel size (meters) - X: {pixel_size_x:.2f}, Y: {pixel_size_y:.2f}")
+                            if lat.size >= 4:  # Use corner points for better geolocation
+                                x_origin = lon[0, 0]
+                                y_origin = lat[0, 0]
+                                x_end = lon[-1, -1]
+                                y_end = lat[-1, -1]
+                                
+                                pixel_size_x = (x_end - x_origin) / (cols - 1)
+                                pixel_size_y = (y_end - y_origin) / (rows - 1)
+                                
+                                break
                     except Exception as e:
-                        print(f"Warning: Coordinate transformation failed, using original coordinates: {e}")
+                        print(f"Error reading geolocation: {e}")
+    
+        # If we couldn't find structured data, try a more general approach
+        if rows == 0 or cols == 0 or bands == 0:
+            # Look for any 3D datasets that might be the hyperspectral cube
+            cube_datasets = []
+            
+            def find_cubes(name, obj):
+                if isinstance(obj, h5py.Dataset) and len(obj.shape) == 3:
+                    cube_datasets.append((name, obj.shape))
+            
+            f.visititems(find_cubes)
+            
+            if cube_datasets:
+                # Sort by total size, largest first
+                cube_datasets.sort(key=lambda x: np.prod(x[1]), reverse=True)
                 
-                return map_info, cords, cols, rows, bands, interleave, wavelengths, pixel_size_x, pixel_size_y, x_origin, y_origin
-        else:
-            raise ValueError(f"Unsupported file format: {file_ext}")
+                # Use the largest cube
+                cube_path, cube_shape = cube_datasets[0]
+                print(f"Using cube from path: {cube_path}, shape: {cube_shape}")
+                
+                # Determine data layout
+                if cube_shape[0] < cube_shape[1] and cube_shape[0] < cube_shape[2]:
+                    # Format is (bands, rows, cols)
+                    bands = cube_shape[0]
+                    rows = cube_shape[1]
+                    cols = cube_shape[2]
+                else:
+                    # Format is (rows, cols, bands)
+                    rows = cube_shape[0]
+                    cols = cube_shape[1]
+                    bands = cube_shape[2]
+    
     except Exception as e:
-        raise RuntimeError(f"Error loading image: {str(e)}")
\ No newline at end of file
+        print(f"Error extracting PRISMA metadata: {e}")
+        
+    print(f"Extracted metadata - Rows: {rows}, Cols: {cols}, Bands: {bands}")
+    print(f"Pixel size - X: {pixel_size_x}, Y: {pixel_size_y}")
+    print(f"Origin - X: {x_origin}, Y: {y_origin}")
+    print(f"Wavelengths: {wavelengths[:5]}... (truncated)" if wavelengths else "Wavelengths: None")
+    
+    if cords == "EPSG:4326":  # If we have WGS84 coordinates
+        try:
+            print(f"Converting WGS84 coordinates (lon: {x_origin}, lat: {y_origin})")
+            utm_coords = transform_prisma_coords(
+                x_origin, y_origin,
+                pixel_size_x, pixel_size_y,
+                rows, cols
+            )
+            x_origin = utm_coords['x_origin']
+            y_origin = utm_coords['y_origin']
+            pixel_size_x = utm_coords['pixel_size_x']
+            pixel_size_y = utm_coords['pixel_size_y']
+            cords = utm_coords['crs']
+            print(f"Transformed to {cords}")
+            print(f"New origin (meters) - X: {x_origin:.2f}, Y: {y_origin:.2f}")
+            print(f"New pixel size (meters) - X: {pixel_size_x:.2f}, Y: {pixel_size_y:.2f}")
+        except Exception as e:
+            print(f"Warning: Coordinate transformation failed, using original coordinates: {e}")
+    
+    return ImageMetadata(map_info, cords, cols, rows, bands, interleave, wavelengths, pixel_size_x, pixel_size_y, x_origin, y_origin, nodata)
@@ -25,44 +25,26 @@ It is also important to cite that this software is free and open source, in this
 If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
 """
 
-import numpy as np
+from image_manipulation.gather_scatter import gather_pixels, scatter_pixels
 
 def apply_mask(image_array, non_masked_indices):
     """
-    cria uma variavel composta por [(1, array (b1,b2,b3 etc))]
-    depois é preciso reconstruir a imagem associando o idx a lista "non_masked_indices"
+    Returns the non-masked pixels as an (n_pixels, n_bands) matrix.
+    Row i is the pixel at position i of "non_masked_indices", which is what
+    image_recovery uses to rebuild the image.
     """
-    non_masked_pixels = []
-    for idx, (row, col) in enumerate(non_masked_indices, 1):
-        if image_array.shape[2] > 1:  # Multi-band image
-            band_values = image_array[row, col, :]
-        else:  
-            band_values = image_array[row, col]
-        
-        non_masked_pixels.append((idx, band_values))
-        
-    return non_masked_pixels
+    return gather_pixels(image_array, non_masked_indices)
 
 def extract_bands(image_array, non_masked_indices):
     """
-    Returns a list of masked band values (no indices).
+    Returns the masked band values (no indices), one row per valid pixel.
     """
-    extracted_bands = []
-    for row, col in non_masked_indices:  
-        if image_array.ndim == 3:  # Multi-band image
-            band_values = image_array[row, col, :]
-        else:  # Single-band image
-            band_values = image_array[row, col]
-        extracted_bands.append(band_values)
-    return extracted_bands
+    return gather_pixels(image_array, non_masked_indices)
 
 def retrieve_reduction_on_ppi(result_rd_espectral, pure_pixel_indices):  
-    pure_pixel_data = []
-    for row, col in pure_pixel_indices:
-        spectral_data = result_rd_espectral[row, col, :].squeeze()
-        pure_pixel_data.append(spectral_data)  
-        
-    pure_pixel_array = np.array(pure_pixel_data)
+    pure_pixel_array = gather_pixels(result_rd_espectral, pure_pixel_indices)
+    if pure_pixel_array.shape[1] == 1:
+        pure_pixel_array = pure_pixel_array[:, 0]
 
     return pure_pixel_array
 
@@ -71,16 +53,12 @@ def image_recovery(recontruir, non_masked_indices, rows, cols):
     Recontruir = results_ica, 
     Função que recupera a imagem original a partir dos pixeis reduzidos
     """
-    n_pixels, n_bands = recontruir.shape
-    recovered_image = np.full((rows, cols, n_bands), np.nan, dtype=np.float32)
     try:
-        for idx, (row, col) in enumerate(non_masked_indices):
-            if row < rows and col < cols:  
-                recovered_image[row, col, :] = recontruir[idx, :]
+        recovered_image = scatter_pixels(recontruir, non_masked_indices, (rows, cols))
     except Exception as e:
         print(f"Error in image recovery: {e}")
         print(f"Shape of recontruir: {recontruir.shape}")
         print(f"Number of indices: {len(non_masked_indices)}")
         raise
         
-    return recovered_image
\ No newline at end of file
+    return recovered_image
@@ -0,0 +1,166 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+
+from image_manipulation.working_dtype import get_working_dtype
+
+PRISMA_ROOTS = [
+    '/HDFEOS/SWATHS/PRS_L2D_HCO/',
+    '/HDFEOS/SWATHS/PRS_L2D_PCO/',
+    '/HDFEOS/SWATHS/PRS_L1_STD/',
+    '/HDFEOS/SWATHS/PRS_L2C_PCO/'
+]
+
+# Rows of the VNIR/SWIR datasets read per h5py slice
+DEFAULT_ROW_BLOCK = 64
+
+def find_prisma_root(f):
+    """Returns the first known PRISMA swath root present in the open h5py file, or None."""
+    for root_path in PRISMA_ROOTS:
+        if root_path in f:
+            return root_path
+    return None
+
+def _nearest_indices(n_out, n_in):
+    """
+    Source index for every output index of a nearest-neighbour resampling,
+    the same mapping scipy.ndimage.zoom(order=0) uses.
+    """
+    if n_out == n_in:
+        return np.arange(n_out)
+    if n_out == 1:
+        return np.zeros(1, dtype=np.intp)
+    return np.floor(np.arange(n_out) * (n_in - 1) / (n_out - 1) + 0.5).astype(np.intp)
+
+def _cube_datasets(f, root_path):
+    vnir_path = f"{root_path}Data Fields/VNIR_Cube"
+    swir_path = f"{root_path}Data Fields/SWIR_Cube"
+    
+    if vnir_path not in f or swir_path not in f:
+        raise ValueError(f"VNIR or SWIR cube not found at expected paths: {vnir_path}, {swir_path}")
+
+    return f[vnir_path], f[swir_path]
+
+def prisma_cube_shape(f, root_path):
+    """(rows, cols, bands) of the cube read_prisma_cube returns, without reading any data."""
+    vnir, swir = _cube_datasets(f, root_path)
+    return vnir.shape[0], vnir.shape[2], vnir.shape[1] + swir.shape[1]
+
+def _h5_index(selected, n):
+    """h5py indexer for a sorted list of band indexes: a slice when possible."""
+    if len(selected) == n:
+        return slice(None)
+    if selected[-1] - selected[0] + 1 == len(selected):
+        return slice(int(selected[0]), int(selected[-1]) + 1)
+    return selected.tolist()
+
+def _band_plan(bands, n_vnir, n_swir):
+    """
+    Splits the requested 0-based bands (VNIR first, then SWIR) between the two datasets.
+    Returns, per dataset, (sorted bands to read, their order in the output, output positions).
+    """
+    bands = np.arange(n_vnir + n_swir) if bands is None else np.asarray(bands)
+    plans = []
+    for in_sensor, offset in ((bands < n_vnir, 0), (bands >= n_vnir, n_vnir)):
+        wanted = bands[in_sensor] - offset
+        to_read = np.unique(wanted)
+        plans.append((to_read, np.searchsorted(to_read, wanted), np.flatnonzero(in_sensor)))
+    return plans
+
+def _put(block, positions, data):
+    """block[:, :, positions] = data, through a slice when the positions are contiguous."""
+    if positions[-1] - positions[0] + 1 == len(positions):
+        block[:, :, positions[0]:positions[-1] + 1] = data
+    else:
+        block[:, :, positions] = data
+
+def read_prisma_cube(f, root_path, dtype=None, row_block=DEFAULT_ROW_BLOCK, block_callback=None, subset=None):
+    """
+    Reads the VNIR and SWIR cubes of a PRISMA file into one preallocated (rows, cols, bands) array
+    of the working dtype (unless dtype is given).
+    The h5py datasets, stored as (rows, bands, cols), are sliced row block by row block;
+    fill values are set to NaN and the SWIR cube is resampled to the VNIR grid per block,
+    so peak memory stays close to the size of the output cube.
+    subset (a subsetting.ImageSubset on the VNIR grid) limits the rows, columns and bands
+    that are sliced out of the datasets.
+    block_callback(row_start, row_stop, block), if given, is called for every finished block
+    (rows relative to the returned array).
+    """
+    vnir, swir = _cube_datasets(f, root_path)
+    rows, vnir_bands, cols = vnir.shape
+    swir_rows, swir_bands, swir_cols = swir.shape
+
+    vnir_fill = vnir.attrs.get('FillValue', -9999)
+    swir_fill = swir.attrs.get('FillValue', -9999)
+
+    if subset is None:
+        row_start, row_stop, col_start, col_stop, bands = 0, rows, 0, cols, None
+    else:
+        row_start, row_stop = subset.row_start, subset.row_stop
+        col_start, col_stop = subset.col_start, subset.col_stop
+        bands = subset.bands
+    out_bands = vnir_bands + swir_bands if bands is None else len(bands)
+    vnir_plan, swir_plan = _band_plan(bands, vnir_bands, swir_bands)
+
+    # SWIR is resampled to the VNIR grid (nearest neighbour) when the grids differ
+    swir_row_idx = _nearest_indices(rows, swir_rows)
+    swir_col_idx = _nearest_indices(cols, swir_cols)[col_start:col_stop]
+    same_grid = (rows, cols) == (swir_rows, swir_cols)
+
+    dtype = np.dtype(dtype) if dtype is not None else get_working_dtype()
+    image_array = np.empty((row_stop - row_start, col_stop - col_start, out_bands), dtype=dtype)
+    for block_start in range(row_start, row_stop, row_block):
+        block_stop = min(block_start + row_block, row_stop)
+        block = image_array[block_start - row_start:block_stop - row_start]
+
+        to_read, order, positions = vnir_plan
+        if to_read.size:
+            data = vnir[block_start:block_stop, _h5_index(to_read, vnir_bands), col_start:col_stop]
+            data = np.transpose(data, (0, 2, 1))[:, :, order].astype(dtype, copy=False)
+            data[data <= vnir_fill] = np.nan
+            _put(block, positions, data)
+
+        to_read, order, positions = swir_plan
+        if to_read.size:
+            band_index = _h5_index(to_read, swir_bands)
+            if same_grid:
+                data = swir[block_start:block_stop, band_index, col_start:col_stop]
+            else:
+                src_rows = swir_row_idx[block_start:block_stop]
+                first, last = int(src_rows[0]), int(src_rows[-1]) + 1
+                col_first, col_last = int(swir_col_idx[0]), int(swir_col_idx[-1]) + 1
+                data = swir[first:last, band_index, col_first:col_last]
+                data = data[src_rows - first][:, :, swir_col_idx - col_first]
+            data = np.transpose(data, (0, 2, 1))[:, :, order].astype(dtype, copy=False)
+            data[data <= swir_fill] = np.nan
+            _put(block, positions, data)
+
+        if block_callback is not None:
+            block_callback(block_start - row_start, block_stop - row_start, block)
+
+    return image_array
@@ -0,0 +1,397 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import h5py
+import numpy as np
+
+from image_manipulation.working_dtype import get_working_dtype
+
+# Rows (pixels) per HDF5 chunk and per incremental write
+DEFAULT_CHUNK_ROWS = 65536
+
+# Results live in one HDF5 file per key, under ~/.aethergeo/results unless the
+# AETHERGEO_RESULT_STORE environment variable points somewhere else
+DEFAULT_STORE_DIR = os.environ.get(
+    'AETHERGEO_RESULT_STORE',
+    os.path.join(os.path.expanduser('~'), '.aethergeo', 'results')
+)
+
+# Disk budget of the store, least recently used entries are removed past it
+DEFAULT_MAX_BYTES = int(float(os.environ.get('AETHERGEO_RESULT_STORE_MAX_GB', 2)) * 1024 ** 3)
+
+# Enabled flag and disk budget chosen in the UI, kept in the store directory
+SETTINGS_FILE = 'settings.json'
+
+def _source_fingerprint(input_path):
+    """Path, size and modification time of the input, so a changed file never hits an old result."""
+    try:
+        stat = os.stat(input_path)
+        return [os.path.abspath(input_path), stat.st_size, stat.st_mtime_ns]
+    except (OSError, TypeError):
+        return [str(input_path)]
+
+def _array_digest(array):
+    array = np.ascontiguousarray(array)
+    digest = hashlib.sha1(array.view(np.uint8).reshape(-1)).hexdigest() if array.size else ''
+    return f"{array.dtype.str}{array.shape}:{digest}"
+
+def _param_value(value):
+    """Makes a parameter JSON friendly; arrays (spectra, masks...) are reduced to a digest."""
+    if isinstance(value, np.ndarray):
+        return _array_digest(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _param_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_param_value(v) for v in value]
+    return value
+
+def _mask_digest(non_masked_indices):
+    """Digest of the valid pixels the result was computed on."""
+    if non_masked_indices is None:
+        return None
+    valid = getattr(non_masked_indices, 'valid', None)
+    if valid is None:
+        valid = np.asarray(non_masked_indices)
+    return _array_digest(np.packbits(valid)) + str(np.shape(valid))
+
+class ResultWriter:
+    """
+    Writes one result into the store incrementally, block by block.
+    The data goes to a temporary file that only replaces the entry on commit(),
+    so an interrupted run never leaves a half written result behind.
+    Use it as a context manager: leaving the block without an error commits.
+    """
+    def __init__(self, store, key, shape, dtype, attrs=None, datasets=None):
+        self.store = store
+        self.key = key
+        self.shape = tuple(shape)
+        self.path = store.entry_path(key)
+        self.tmp_path = self.path + '.tmp'
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self.file = h5py.File(self.tmp_path, 'w')
+        chunks = (min(store.chunk_rows, max(self.shape[0], 1)),) + self.shape[1:]
+        self.dataset = self.file.create_dataset(
+            'result',
+            shape=self.shape,
+            dtype=np.dtype(dtype),
+            chunks=chunks,
+            compression=store.compression,
+            compression_opts=store.compression_level,
+            shuffle=True
+        )
+        self.dataset.attrs['created'] = time.time()
+        for name, value in (attrs or {}).items():
+            self.dataset.attrs[name] = value
+        # Small arrays kept next to the result (a fitted model...), as "group/name" paths
+        for name, value in (datasets or {}).items():
+            self.file.create_dataset(name, data=value if isinstance(value, str) else np.asarray(value))
+
+    def write(self, start, values):
+        """Writes values (first axis = pixels) at rows start:start + len(values)."""
+        values = np.asarray(values)
+        self.dataset[start:start + values.shape[0]] = values
+
+    def commit(self):
+        self.file.close()
+        # An open handle on the old entry would make the replace fail on Windows
+        self.store.close_entry(self.key)
+        os.replace(self.tmp_path, self.path)
+        self.store.prune()
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+class ResultStore:
+    """
+    Chunked, compressed HDF5 store for intermediate products (PCA/ICA/NMF scores,
+    normalized pixels, SAM angles, cluster labels...), so they survive the session.
+    Entries are keyed by the input image (path, size and mtime), the operation name,
+    its parameters and the mask it ran on. get() reopens an entry lazily: it returns
+    the h5py dataset, which only reads the rows that are sliced, and can be handed
+    straight to the save functions as result_data.
+    Each entry is opened once and its file stays open until the entry is replaced or
+    removed, or close() is called.
+    The store is kept under max_bytes on disk: every get() marks an entry as used
+    (its mtime), and the least recently used entries are removed after each write.
+    Entries open in this session are never removed by prune().
+    enabled and max_bytes default to the settings saved by configure() (see SETTINGS_FILE).
+    get_or_compute() writes new results on a background writer thread.
+    """
+    def __init__(self, directory=None, compression='gzip', compression_level=4, chunk_rows=DEFAULT_CHUNK_ROWS, max_bytes=None, enabled=None):
+        self.directory = directory or DEFAULT_STORE_DIR
+        settings = self._load_settings()
+        self.max_bytes = max_bytes if max_bytes is not None else settings.get('max_bytes', DEFAULT_MAX_BYTES)
+        self.enabled = enabled if enabled is not None else settings.get('enabled', True)
+        self.compression = compression
+        self.compression_level = compression_level if compression == 'gzip' else None
+        self.chunk_rows = chunk_rows
+        self._files = {}
+        self._lock = threading.RLock()
+        self._writer = None
+        self._pending = {}  # key -> future of a background write
+
+    def _settings_path(self):
+        return os.path.join(self.directory, SETTINGS_FILE)
+
+    def _load_settings(self):
+        try:
+            with open(self._settings_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def configure(self, enabled=None, max_bytes=None):
+        """Changes (and saves) whether results are stored and the disk budget, then prunes the store."""
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if max_bytes is not None:
+            self.max_bytes = int(max_bytes)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._settings_path(), 'w', encoding='utf-8') as f:
+                json.dump({'enabled': self.enabled, 'max_bytes': self.max_bytes}, f)
+        except OSError as e:
+            print(f"Warning: could not save the result store settings: {e}")
+        self.prune()
+
+    def key(self, input_path, operation, params=None, non_masked_indices=None):
+        """Key of a result, a hex digest of everything that determines it."""
+        description = {
+            'source': _source_fingerprint(input_path),
+            'operation': operation,
+            'params': _param_value(params or {}),
+            'mask': _mask_digest(non_masked_indices),
+            'dtype': get_working_dtype().name
+        }
+        text = json.dumps(description, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, f"{key}.h5")
+
+    def __contains__(self, key):
+        return self.enabled and os.path.exists(self.entry_path(key))
+
+    def get(self, key):
+        """Returns the stored h5py dataset, or None if there is no (readable) entry for key."""
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Written in the background right now: wait for it rather than computing it again
+            pending.result()
+        if key not in self:
+            return None
+        try:
+            os.utime(self.entry_path(key))
+        except OSError:
+            pass
+        with self._lock:
+            file = self._files.get(key)
+            if file is None or not file.id.valid:
+                try:
+                    file = h5py.File(self.entry_path(key), 'r')
+                except Exception as e:
+                    print(f"Warning: could not read stored result {key}: {e}")
+                    return None
+                self._files[key] = file
+            try:
+                return file['result']
+            except Exception as e:
+                print(f"Warning: could not read stored result {key}: {e}")
+                self.close_entry(key)
+                return None
+
+    def get_or_compute(self, key, compute, streamed=False):
+        """
+        The stored result for key, or the result of compute() stored and returned, so a
+        result from an earlier run (also from a previous session) is never recomputed.
+        compute() returns the values, or (values, attrs, datasets) as taken by put().
+        The computed values are returned as they are and written in the background (see put_in_background).
+        With streamed=True compute() writes into the store itself (see streaming_pca.write_streamed)
+        and what it returns is handed back as is.
+        """
+        result = self.get(key)
+        if result is not None:
+            return result
+        result = compute()
+        if streamed:
+            return result
+        if isinstance(result, tuple):
+            return self.put_in_background(key, *result)
+        return self.put_in_background(key, result)
+
+    def put_in_background(self, key, values, attrs=None, datasets=None):
+        """
+        Queues the write of a full result on the store's writer thread and returns values
+        straight away, so compressing and writing it never holds up the caller (the GUI thread).
+        """
+        if not self.enabled:
+            return values
+        values = np.asarray(values)
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='result-store')
+            future = self._writer.submit(self._write, key, values, attrs, datasets)
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._forget_write(key, done))
+        return values
+
+    def _forget_write(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def flush(self):
+        """Waits for the background writes."""
+        for future in list(self._pending.values()):
+            future.result()
+
+    def close_entry(self, key):
+        """Closes the open file of an entry; datasets returned by get() for it become unusable."""
+        with self._lock:
+            file = self._files.pop(key, None)
+            if file is not None and file.id.valid:
+                file.close()
+
+    def close(self):
+        """Finishes the background writes and closes every open entry."""
+        self.flush()
+        with self._lock:
+            if self._writer is not None:
+                self._writer.shutdown()
+                self._writer = None
+            for key in list(self._files):
+                self.close_entry(key)
+
+    def writer(self, key, shape, dtype=None, attrs=None, datasets=None):
+        """ResultWriter for a result of the given shape, in the working dtype unless dtype is given."""
+        return ResultWriter(self, key, shape, dtype if dtype is not None else get_working_dtype(), attrs, datasets)
+
+    def put(self, key, values, attrs=None, datasets=None):
+        """
+        Stores a full result, in chunk_rows blocks, and returns it reopened from the store.
+        attrs = small extra values kept with it (eigenvalues, kurtosis...).
+        datasets = small arrays stored in the same file, readable from result.file[name].
+        If the store can't be written, values is returned unchanged.
+        """
+        if not self.enabled:
+            return values
+        values = np.asarray(values)
+        if not self._write(key, values, attrs, datasets):
+            return values
+        stored = self.get(key)
+        return stored if stored is not None else values
+
+    def _write(self, key, values, attrs=None, datasets=None):
+        """Writes values in chunk_rows blocks; returns False (with a warning) if the store can't be written."""
+        try:
+            with self.writer(key, values.shape, values.dtype, attrs, datasets) as writer:
+                for start in range(0, values.shape[0], self.chunk_rows):
+                    writer.write(start, values[start:start + self.chunk_rows])
+        except Exception as e:
+            print(f"Warning: could not store result {key}: {e}")
+            return False
+        return True
+
+    def remove(self, key):
+        self.close_entry(key)
+        if os.path.exists(self.entry_path(key)):
+            os.remove(self.entry_path(key))
+
+    def entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [name[:-3] for name in os.listdir(self.directory) if name.endswith('.h5')]
+
+    def _entry_stats(self):
+        """(last use, size, key) of every entry, oldest first."""
+        stats = []
+        for key in self.entries():
+            try:
+                stat = os.stat(self.entry_path(key))
+            except OSError:
+                continue
+            stats.append((stat.st_mtime, stat.st_size, key))
+        return sorted(stats)
+
+    def nbytes(self):
+        """Disk space used by the store."""
+        return sum(size for _, size, _ in self._entry_stats())
+
+    def prune(self, max_bytes=None):
+        """Removes the least recently used entries until the store fits in max_bytes. Returns the bytes freed."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return 0
+        stats = self._entry_stats()
+        total = sum(size for _, size, _ in stats)
+        freed = 0
+        for _, size, key in stats:
+            if total - freed <= max_bytes:
+                break
+            if key in self._files or key in self._pending:
+                continue
+            try:
+                self.remove(key)
+            except OSError as e:
+                print(f"Warning: could not remove stored result {key}: {e}")
+                continue
+            freed += size
+        return freed
+
+    def clear(self, keep_open=False):
+        """
+        Removes every entry and returns the bytes freed. With keep_open=True the entries
+        opened in this session (results still shown or saved from) are kept.
+        """
+        if keep_open:
+            return self.prune(0)
+        freed = self.nbytes()
+        for key in self.entries():
+            self.remove(key)
+        return freed
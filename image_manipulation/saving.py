@@ -28,33 +28,72 @@ If you want to contact the author, please send an email to aethergeoofficial@gma
 import numpy as np
 import os
 import rasterio
+import tempfile
 from rasterio.crs import CRS
+from rasterio.enums import Resampling, WktVersion
+from rasterio.shutil import copy as rio_copy
 from rasterio.transform import from_origin
+from rasterio.windows import Window
+import spectral.io.envi as envi
 
-def image_recovery(recontruir, non_masked_indices, rows, cols):
-    """
-    Recontruir = 2D array (pixels, bands), 
-    Function rebuilds the image taking into account the non-masked indices.
-    """
-    n_pixels, n_bands = recontruir.shape
-    recovered_image = np.full((rows, cols, n_bands), np.nan, dtype=np.float32)
-    try:
-        for idx, (row, col) in enumerate(non_masked_indices):
-            if row < rows and col < cols:  
-                recovered_image[row, col, :] = recontruir[idx, :]
-    except Exception as e:
-        print(f"Error in image recovery: {e}")
-        print(f"Shape of recontruir: {recontruir.shape}")
-        print(f"Number of indices: {len(non_masked_indices)}")
-        raise
-        
-    return recovered_image
+from image_manipulation.gather_scatter import DEFAULT_CHUNK_ROWS, iter_scatter_band_blocks, scatter_pixels
+from image_manipulation.lazy_image import envi_memmap
+from image_manipulation.working_dtype import get_working_dtype
+
+# Tile size of the written GeoTIFFs (GDAL needs a multiple of 16)
+TILE_SIZE = 256
+
+COMPRESSIONS = ('DEFLATE', 'ZSTD', 'LZW', None)
+DEFAULT_COMPRESSION = 'DEFLATE'
 
-def save_image(output_path, image_save, map_info, cords, cols, rows, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths=None):
+# Resampling used to build the overview pyramid of Cloud-Optimized GeoTIFFs
+OVERVIEW_RESAMPLINGS = ('nearest', 'average', 'bilinear', 'cubic', 'lanczos', 'mode', 'gauss')
+DEFAULT_OVERVIEW_RESAMPLING = 'average'
+
+ENVI_EXTENSIONS = ('.hdr', '.img')
+ENVI_INTERLEAVES = ('bsq', 'bil', 'bip')
+DEFAULT_ENVI_INTERLEAVE = 'bsq'
+
+class SaveCancelled(Exception):
+    """Raised from a progress callback to stop a save; the partial output is removed."""
+
+def geotiff_creation_options(dtype, compress=DEFAULT_COMPRESSION):
     """
-    output_path = path to save the image
-    image_save = recovered image array, no metadata 
+    Creation options for a tiled GeoTIFF: DEFLATE/ZSTD/LZW compression with the
+    floating point (3) or horizontal (2) predictor, BigTIFF when the file could pass 4 GB,
+    and compression on all CPUs.
     """
+    if compress not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compress} (use one of {COMPRESSIONS})")
+    
+    options = {
+        'tiled': True,
+        'blockxsize': TILE_SIZE,
+        'blockysize': TILE_SIZE,
+        'BIGTIFF': 'IF_SAFER',
+        'NUM_THREADS': 'ALL_CPUS'
+    }
+    if compress is not None:
+        options['compress'] = compress
+        options['predictor'] = 3 if np.issubdtype(np.dtype(dtype), np.floating) else 2
+    return options
+
+def _resolve_crs(cords):
+    if isinstance(cords, (list, tuple)):
+        wkt_candidate = ",".join(cords)
+        try:
+            crs_obj = CRS.from_wkt(wkt_candidate)
+            return crs_obj.to_wkt()  
+        except Exception as e:
+            raise RuntimeError(f"Invalid CRS provided: {str(e)}")
+    else:
+        try:
+            crs_obj = CRS.from_wkt(cords)
+            return crs_obj.to_wkt()
+        except Exception:
+            return cords
+
+def _check_output_path(output_path):
     if output_path is None:
         raise ValueError("Path cannot be None")
         
@@ -63,32 +102,112 @@ def save_image(output_path, image_save, map_info, cords, cols, rows, pixel_size_
     
     if os.path.exists(output_path):
         raise ValueError("File already exists")
+    return output_path
+
+def is_envi_path(output_path):
+    """Output paths ending in .hdr/.img are written as ENVI, everything else as GeoTIFF."""
+    return output_path is not None and output_path.lower().endswith(ENVI_EXTENSIONS)
+
+def envi_paths(output_path):
+    """Returns the (.hdr, .img) pair for an ENVI output path, refusing to overwrite either."""
+    if output_path is None:
+        raise ValueError("Path cannot be None")
+
+    base = os.path.splitext(output_path)[0] if is_envi_path(output_path) else output_path
+    hdr_path, img_path = base + '.hdr', base + '.img'
+    if os.path.exists(hdr_path) or os.path.exists(img_path):
+        raise ValueError("File already exists")
+    return hdr_path, img_path
+
+def image_recovery(recontruir, non_masked_indices, rows, cols):
+    """
+    Recontruir = 2D array (pixels, bands), 
+    Function rebuilds the image taking into account the non-masked indices.
+    """
+    return scatter_pixels(recontruir, non_masked_indices, (rows, cols))
+
+def iter_array_blocks(image_save, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yields (row_start, row_stop, block) row blocks of an in-memory (rows, cols[, bands]) image."""
+    for row_start in range(0, image_save.shape[0], chunk_rows):
+        row_stop = min(row_start + chunk_rows, image_save.shape[0])
+        yield row_start, row_stop, image_save[row_start:row_stop]
+
+def save_image(output_path, image_save, map_info, cords, cols, rows, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths=None, compress=DEFAULT_COMPRESSION, cog=False, overview_resampling=DEFAULT_OVERVIEW_RESAMPLING, progress_callback=None):
+    """
+    output_path = path to save the image
+    image_save = recovered image array, no metadata 
+    The image is written in the working dtype (float32 by default), as a tiled and
+    compressed GeoTIFF, or a Cloud-Optimized GeoTIFF when cog=True (see save_image_blocks).
+    """
+    if image_save.ndim == 3:
+        img_rows, img_cols, bands = image_save.shape
+    elif image_save.ndim == 2:
+        img_rows, img_cols = image_save.shape
+        bands = 1
+    else:
+        raise ValueError("Unsupported image dimensions")
+
+    return save_image_blocks(output_path, iter_array_blocks(image_save), img_rows, img_cols, bands,
+                             map_info, cords, cols, rows, pixel_size_x, pixel_size_y, x_origin, y_origin,
+                             wavelengths, compress, cog, overview_resampling, progress_callback=progress_callback)
+
+def save_pixels(output_path, values, non_masked_indices, metadata, wavelengths=None, compress=DEFAULT_COMPRESSION, cog=False, overview_resampling=DEFAULT_OVERVIEW_RESAMPLING, progress_callback=None, nodata=np.nan):
+    """
+    Scatter-to-disk writer for the save dialogs.
+    values = (n_pixels, n_components) result (or one value per pixel) of the non-masked pixels,
+    metadata = metadata dict of the source image.
+    Each row of tiles is rebuilt with nodata (NaN by default) in the masked pixels, directly in the band-first
+    layout rasterio writes, and goes to disk straight away. The full (rows, cols, n_components)
+    cube is never allocated, only one reused row-of-tiles buffer.
+    For .hdr/.img paths the tiles go straight into the memory-mapped ENVI file.
+    nodata is declared in the output ('data ignore value' / GeoTIFF nodata).
+    """
+    rows, cols = metadata["rows"], metadata["cols"]
+    n_components = values.shape[1] if len(values.shape) > 1 else 1
+    blocks = iter_scatter_band_blocks(values, non_masked_indices, (rows, cols), chunk_rows=TILE_SIZE,
+                                      fill_value=nodata)
+
+    return save_image_blocks(output_path, blocks, rows, cols, n_components,
+                             metadata["map_info"], metadata["coordinates"], metadata["cols"], metadata["rows"],
+                             metadata["pixel_size_x"], metadata["pixel_size_y"], metadata["x_origin"], metadata["y_origin"],
+                             wavelengths, compress, cog, overview_resampling, bands_first=True,
+                             progress_callback=progress_callback, nodata=nodata)
+
+def save_image_blocks(output_path, blocks, img_rows, img_cols, bands, map_info, cords, cols, rows, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths=None, compress=DEFAULT_COMPRESSION, cog=False, overview_resampling=DEFAULT_OVERVIEW_RESAMPLING, bands_first=False, progress_callback=None, nodata=None):
+    """
+    Streams an image to a tiled, compressed GeoTIFF (BigTIFF if needed) without ever
+    holding the whole (rows, cols, bands) cube in memory.
+    blocks = iterable of (row_start, row_stop, block) with block shaped
+    (row_stop - row_start, img_cols, bands) or (row_stop - row_start, img_cols),
+    e.g. gather_scatter.iter_scatter_chunks. All bands of a block go out in one windowed write.
+    With bands_first=True the blocks are already (bands, row_stop - row_start, img_cols).
+    With cog=True the file gets internal overviews (built with overview_resampling) and the
+    Cloud-Optimized GeoTIFF layout, so viewers can read a reduced resolution directly.
+    A .hdr/.img output path writes an ENVI image instead (see save_envi_blocks).
+    progress_callback(rows_written, img_rows) is called after every block; raising
+    SaveCancelled from it stops the save and removes the partial file.
+    nodata (if not None) is declared as the nodata value of the output.
+    """
+    if is_envi_path(output_path):
+        return save_envi_blocks(output_path, blocks, img_rows, img_cols, bands, map_info, cords,
+                                pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths, nodata,
+                                bands_first=bands_first, progress_callback=progress_callback)
+
+    output_path = _check_output_path(output_path)
+    final_path = output_path
+    temp_paths = []
+    if cog:
+        if overview_resampling not in OVERVIEW_RESAMPLINGS:
+            raise ValueError(f"Unsupported overview resampling: {overview_resampling}")
+        # Streamed into a plain tiled GeoTIFF first, then rewritten with the COG layout;
+        # both go to new temporary files next to the output, so no existing file is touched
+        output_path = _temp_tif(final_path)
+        temp_paths.append(output_path)
     
     try:
-        if image_save.ndim == 3:
-            img_rows, img_cols, bands = image_save.shape
-        elif image_save.ndim == 2:
-            img_rows, img_cols = image_save.shape
-            bands = 1
-            image_save = image_save.reshape(img_rows, img_cols, bands)
-        else:
-            raise ValueError("Unsupported image dimensions")
-        
+        dtype = get_working_dtype()
         transform = from_origin(x_origin, y_origin, pixel_size_x, pixel_size_y)
-        
-        if isinstance(cords, (list, tuple)):
-            wkt_candidate = ",".join(cords)
-            try:
-                crs_obj = CRS.from_wkt(wkt_candidate)
-                crs = crs_obj.to_wkt()  
-            except Exception as e:
-                raise RuntimeError(f"Invalid CRS provided: {str(e)}")
-        else:
-            try:
-                crs_obj = CRS.from_wkt(cords)
-                crs = crs_obj.to_wkt()
-            except Exception:
-                crs = cords
+        crs = _resolve_crs(cords)
         
         with rasterio.open(
             output_path, 'w',
@@ -96,33 +215,209 @@ def save_image(output_path, image_save, map_info, cords, cols, rows, pixel_size_
             height=img_rows,
             width=img_cols,
             count=bands,
-            dtype='float32',
+            dtype=dtype.name,
             transform=transform,
-            crs=crs
+            crs=crs,
+            nodata=nodata,
+            **geotiff_creation_options(dtype, compress)
         ) as dst:
-            for band in range(bands):
-                dst.write(image_save[:, :, band], band + 1)
-                if wavelengths is not None:
-                    dst.set_band_description(band + 1, f"{wavelengths[band]} nm")
-
-            dst.update_tags(
-                map_info=str(map_info),
-                coordinate_system=str(cords),
-                cols=str(cols),
-                rows=str(rows),
-                pixel_size_x=str(pixel_size_x),
-                pixel_size_y=str(pixel_size_y),
-                x_origin=str(x_origin),
-                y_origin=str(y_origin)
-            )
-            
-            if wavelengths is not None:
-                wavelength_str = ','.join(map(str, wavelengths))
-                dst.update_tags(
-                    wavelength=wavelength_str,
-                    WAVELENGTH=wavelength_str,  # Some software looks for uppercase
-                    wavelengths=wavelength_str  # Alternative key
-                )
+            for row_start, row_stop, block in blocks:
+                if block.ndim == 2:
+                    block = block[np.newaxis] if bands_first else block[:, :, np.newaxis]
+                if not bands_first:
+                    block = np.moveaxis(block, -1, 0)
+                window = Window(0, row_start, img_cols, row_stop - row_start)
+                dst.write(block.astype(dtype, copy=False), window=window)
+                if progress_callback is not None:
+                    progress_callback(row_stop, img_rows)
+
+            _write_tags(dst, bands, map_info, cords, cols, rows, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths)
+
+        if cog:
+            cog_path = _temp_tif(final_path)
+            temp_paths.append(cog_path)
+            _write_cog(output_path, cog_path, compress, overview_resampling)
+            # The output only appears once the COG is complete
+            os.replace(cog_path, final_path)
         
     except Exception as e:
-        raise RuntimeError(f"Error saving image: {str(e)}")
\ No newline at end of file
+        # No partial file is left behind, whether the save failed or was cancelled
+        if not cog and os.path.exists(final_path):
+            os.remove(final_path)
+        if isinstance(e, SaveCancelled):
+            raise
+        raise RuntimeError(f"Error saving image: {str(e)}")
+    finally:
+        for path in temp_paths:
+            if os.path.exists(path):
+                os.remove(path)
+    return final_path
+
+def _temp_tif(final_path):
+    """New, empty temporary .tif next to final_path (same filesystem, so os.replace works)."""
+    fd, path = tempfile.mkstemp(dir=os.path.dirname(final_path), suffix='.tif')
+    os.close(fd)
+    return path
+
+def overview_factors(img_rows, img_cols, min_size=TILE_SIZE):
+    """Decimation factors 2, 4, 8... down to the level whose longest side still exceeds min_size."""
+    factors = []
+    factor = 2
+    while max(img_rows, img_cols) / factor >= min_size:
+        factors.append(factor)
+        factor *= 2
+    return factors or [2]
+
+def _write_cog(tmp_path, output_path, compress, overview_resampling):
+    """Builds the overview pyramid into tmp_path, then copies it to output_path with GDAL's COG driver (tmp_path is left to the caller)."""
+    with rasterio.open(tmp_path, 'r+') as dst:
+        dst.build_overviews(overview_factors(dst.height, dst.width), Resampling[overview_resampling])
+        dst.update_tags(ns='rio_overview', resampling=overview_resampling)
+
+    options = {
+        'BLOCKSIZE': TILE_SIZE,
+        'BIGTIFF': 'IF_SAFER',
+        'NUM_THREADS': 'ALL_CPUS',
+        'OVERVIEWS': 'FORCE_USE_EXISTING',
+        'COMPRESS': compress if compress is not None else 'NONE'
+    }
+    if compress is not None:
+        options['PREDICTOR'] = 'YES'
+    rio_copy(tmp_path, output_path, driver='COG', **options)
+
+def _write_tags(dst, bands, map_info, cords, cols, rows, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths):
+    if wavelengths is not None:
+        for band in range(bands):
+            dst.set_band_description(band + 1, f"{wavelengths[band]} nm")
+
+    dst.update_tags(
+        map_info=str(map_info),
+        coordinate_system=str(cords),
+        cols=str(cols),
+        rows=str(rows),
+        pixel_size_x=str(pixel_size_x),
+        pixel_size_y=str(pixel_size_y),
+        x_origin=str(x_origin),
+        y_origin=str(y_origin)
+    )
+    
+    if wavelengths is not None:
+        wavelength_str = ','.join(map(str, wavelengths))
+        dst.update_tags(
+            wavelength=wavelength_str,
+            WAVELENGTH=wavelength_str,  # Some software looks for uppercase
+            wavelengths=wavelength_str  # Alternative key
+        )
+
+def _envi_map_info(map_info):
+    """ENVI 'map info' list (name, ref x, ref y, x, y, pixel size x, pixel size y, ...) or None."""
+    if not isinstance(map_info, (list, tuple)) or len(map_info) < 7:
+        return None
+    try:
+        [float(v) for v in map_info[1:7]]
+    except (TypeError, ValueError):
+        return None
+    return [str(v).strip() for v in map_info]
+
+def envi_header(img_rows, img_cols, bands, dtype, interleave, map_info, cords, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths=None, nodata=None):
+    """
+    Header dict for spectral's write_envi_header.
+    map_info is kept as is only when it is an ENVI map info list (from an ENVI image), otherwise
+    (e.g. the proj dict of a GeoTIFF) it is built from the origin and pixel size.
+    The CRS goes to 'coordinate system string' as ESRI WKT, the dialect GDAL reads back.
+    """
+    dtype = np.dtype(dtype)
+    if dtype.char not in envi.dtype_to_envi:
+        raise ValueError(f"Unsupported ENVI data type: {dtype}")
+
+    header = {
+        'samples': img_cols,
+        'lines': img_rows,
+        'bands': bands,
+        'header offset': 0,
+        'file type': 'ENVI Standard',
+        'data type': envi.dtype_to_envi[dtype.char],
+        'interleave': interleave,
+        'byte order': 0 if dtype.byteorder == '<' or (dtype.byteorder in '=|' and np.little_endian) else 1
+    }
+
+    crs = None
+    if cords is not None:
+        if isinstance(cords, (list, tuple)):
+            cords = ",".join(cords)
+        try:
+            crs = CRS.from_user_input(cords)
+            cords = crs.to_wkt(version=WktVersion.WKT1_ESRI)
+        except Exception:
+            crs = None
+        header['coordinate system string'] = '{' + cords + '}'
+
+    header['map info'] = _envi_map_info(map_info)
+    if header['map info'] is None:
+        header['map info'] = ['Arbitrary', '1', '1', str(x_origin), str(y_origin), str(pixel_size_x), str(pixel_size_y)]
+        if crs is not None and crs.is_projected and crs.linear_units in ('metre', 'meter'):
+            header['map info'].append('units=Meters')
+
+    if wavelengths is not None:
+        header['wavelength'] = [str(w) for w in wavelengths]
+        header['wavelength units'] = 'Nanometers'
+    if nodata is not None:
+        header['data ignore value'] = nodata
+    return header
+
+def create_envi_image(output_path, img_rows, img_cols, bands, map_info, cords, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths=None, nodata=None, interleave=DEFAULT_ENVI_INTERLEAVE, dtype=None):
+    """
+    Writes the .hdr and creates the .img data file as a np.memmap.
+    Returns (hdr_path, cube) where cube is a writable (rows, cols, bands) view of the file
+    in the chosen BSQ/BIL/BIP interleave, so results can be written straight into it
+    (e.g. with gather_scatter.scatter_pixels_into). Call cube.base.flush() when done.
+    The data type is the working dtype unless dtype is given.
+    """
+    interleave = str(interleave).lower()
+    if interleave not in ENVI_INTERLEAVES:
+        raise ValueError(f"Unsupported ENVI interleave: {interleave}")
+    hdr_path, img_path = envi_paths(output_path)
+    dtype = np.dtype(dtype) if dtype is not None else get_working_dtype()
+
+    header = envi_header(img_rows, img_cols, bands, dtype, interleave, map_info, cords,
+                         pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths, nodata)
+    envi.write_envi_header(hdr_path, header)
+
+    layout = {
+        'filename': img_path,
+        'dtype': dtype,
+        'offset': 0,
+        'shape': (img_rows, img_cols, bands),
+        'interleave': interleave
+    }
+    return hdr_path, envi_memmap(layout, 'w+')
+
+def save_envi_blocks(output_path, blocks, img_rows, img_cols, bands, map_info, cords, pixel_size_x, pixel_size_y, x_origin, y_origin, wavelengths=None, nodata=None, interleave=DEFAULT_ENVI_INTERLEAVE, bands_first=False, progress_callback=None):
+    """
+    ENVI counterpart of save_image_blocks: each (row_start, row_stop, block) is copied
+    into the memory-mapped .img, no GeoTIFF conversion or full copy of the cube.
+    """
+    hdr_path, cube = create_envi_image(output_path, img_rows, img_cols, bands, map_info, cords,
+                                       pixel_size_x, pixel_size_y, x_origin, y_origin,
+                                       wavelengths, nodata, interleave)
+    try:
+        for row_start, row_stop, block in blocks:
+            if block.ndim == 2:
+                block = block[np.newaxis] if bands_first else block[:, :, np.newaxis]
+            if bands_first:
+                block = np.moveaxis(block, 0, -1)
+            cube[row_start:row_stop] = block
+            if progress_callback is not None:
+                progress_callback(row_stop, img_rows)
+        cube.base.flush()
+    except Exception as e:
+        # Drop the memmap first, Windows does not remove a mapped file
+        img_path = cube.base.filename
+        del cube
+        for path in (hdr_path, img_path):
+            if os.path.exists(path):
+                os.remove(path)
+        if isinstance(e, SaveCancelled):
+            raise
+        raise RuntimeError(f"Error saving image: {str(e)}")
+    return hdr_path
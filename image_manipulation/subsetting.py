@@ -0,0 +1,179 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+from dataclasses import replace
+
+import numpy as np
+from rasterio.windows import Window
+
+def _checked_bounds(start, stop, size, name):
+    start = 0 if start is None else int(start)
+    stop = size if stop is None else int(stop)
+    start, stop = max(start, 0), min(stop, size)
+    if stop <= start:
+        raise ValueError(f"Empty {name} range in subset")
+    return start, stop
+
+def geo_to_pixel_window(metadata, x_min, y_min, x_max, y_max):
+    """
+    Converts a map window (in the image coordinate system) into a pixel window
+    (row_start, row_stop, col_start, col_stop), covering every pixel it touches.
+    Assumes a north-up image: x grows with columns, y decreases with rows.
+    """
+    col_start = int(np.floor((x_min - metadata.x_origin) / metadata.pixel_size_x))
+    col_stop = int(np.ceil((x_max - metadata.x_origin) / metadata.pixel_size_x))
+    row_start = int(np.floor((metadata.y_origin - y_max) / metadata.pixel_size_y))
+    row_stop = int(np.ceil((metadata.y_origin - y_min) / metadata.pixel_size_y))
+    return row_start, row_stop, col_start, col_stop
+
+def wavelength_bands(metadata, wavelength_min, wavelength_max):
+    """0-based indexes of the bands whose wavelength lies in [wavelength_min, wavelength_max]."""
+    if not metadata.wavelengths:
+        raise ValueError("Image has no wavelengths, a wavelength range cannot be used")
+    
+    wavelengths = np.asarray([float(w) for w in metadata.wavelengths])
+    bands = np.flatnonzero((wavelengths >= wavelength_min) & (wavelengths <= wavelength_max))
+    if bands.size == 0:
+        raise ValueError(f"No bands between {wavelength_min} and {wavelength_max} nm")
+    return bands.tolist()
+
+class ImageSubset:
+    """
+    Region and bands to load from an image, in pixels of the full image:
+    rows [row_start, row_stop), cols [col_start, col_stop) and the 0-based band list
+    (None keeps every band, in order).
+    """
+    def __init__(self, row_start, row_stop, col_start, col_stop, bands=None):
+        self.row_start = row_start
+        self.row_stop = row_stop
+        self.col_start = col_start
+        self.col_stop = col_stop
+        self.bands = bands
+
+    @classmethod
+    def resolve(cls, metadata, window=None, geo_window=None, bands=None, wavelength_range=None):
+        """
+        Builds the subset of an image from its full ImageMetadata. Returns None when nothing is subset.
+          window = (row_start, row_stop, col_start, col_stop), in pixels (None entries mean the edge)
+          geo_window = (x_min, y_min, x_max, y_max), in the image coordinate system
+          bands = list of 0-based band indexes
+          wavelength_range = (min_nm, max_nm)
+        """
+        if window is None and geo_window is None and bands is None and wavelength_range is None:
+            return None
+        if window is not None and geo_window is not None:
+            raise ValueError("Give either a pixel window or a geographic window, not both")
+        if bands is not None and wavelength_range is not None:
+            raise ValueError("Give either a band list or a wavelength range, not both")
+        
+        if geo_window is not None:
+            window = geo_to_pixel_window(metadata, *geo_window)
+        if window is None:
+            window = (None, None, None, None)
+        row_start, row_stop = _checked_bounds(window[0], window[1], metadata.rows, "row")
+        col_start, col_stop = _checked_bounds(window[2], window[3], metadata.cols, "column")
+
+        if wavelength_range is not None:
+            bands = wavelength_bands(metadata, *wavelength_range)
+        if bands is not None:
+            bands = [int(b) for b in bands]
+            if not bands:
+                raise ValueError("Empty band list in subset")
+            if min(bands) < 0 or max(bands) >= metadata.bands:
+                raise ValueError(f"Band index out of range (image has {metadata.bands} bands)")
+
+        return cls(row_start, row_stop, col_start, col_stop, bands)
+
+    @property
+    def row_slice(self):
+        return slice(self.row_start, self.row_stop)
+
+    @property
+    def col_slice(self):
+        return slice(self.col_start, self.col_stop)
+
+    @property
+    def band_index(self):
+        """
+        Band indexer for a (rows, cols, bands) array: a slice when the bands are evenly
+        spaced and increasing (keeps memory-mapped arrays as views), else the list.
+        """
+        if self.bands is None:
+            return slice(None)
+        
+        bands = self.bands
+        if len(bands) == 1:
+            return slice(bands[0], bands[0] + 1)
+        step = bands[1] - bands[0]
+        if step > 0 and all(b - a == step for a, b in zip(bands, bands[1:])):
+            return slice(bands[0], bands[-1] + 1, step)
+        return bands
+
+    @property
+    def window(self):
+        """The region as a rasterio Window (col_off, row_off, width, height)."""
+        return Window(self.col_start, self.row_start, self.col_stop - self.col_start, self.row_stop - self.row_start)
+
+    def file_bands(self, bands=None):
+        """0-based bands of the file for 0-based bands of the subset (all of them when None)."""
+        if self.bands is None:
+            return bands
+        return list(self.bands) if bands is None else [self.bands[b] for b in bands]
+
+    def apply(self, image_array):
+        """Subset of an in-memory or memory-mapped (rows, cols, bands) array."""
+        return image_array[self.row_slice, self.col_slice][:, :, self.band_index]
+
+    def metadata(self, metadata):
+        """
+        ImageMetadata of the subset: new size, origin moved to the window's top-left
+        corner (also in an ENVI map info) and the selected wavelengths.
+        """
+        x_origin = metadata.x_origin + self.col_start * metadata.pixel_size_x
+        y_origin = metadata.y_origin - self.row_start * metadata.pixel_size_y
+
+        map_info = metadata.map_info
+        if isinstance(map_info, list) and len(map_info) >= 7:
+            # ENVI map info: projection, reference pixel x/y (1-based), easting, northing, pixel sizes...
+            map_info = list(map_info)
+            map_info[3] = str(float(map_info[3]) + self.col_start * float(map_info[5]))
+            map_info[4] = str(float(map_info[4]) - self.row_start * float(map_info[6]))
+
+        wavelengths = metadata.wavelengths
+        if self.bands is not None and wavelengths:
+            wavelengths = [wavelengths[b] for b in self.bands]
+
+        return replace(
+            metadata,
+            map_info=map_info,
+            cols=self.col_stop - self.col_start,
+            rows=self.row_stop - self.row_start,
+            bands=len(self.bands) if self.bands is not None else metadata.bands,
+            wavelengths=wavelengths,
+            x_origin=x_origin,
+            y_origin=y_origin
+        )
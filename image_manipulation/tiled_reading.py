@@ -0,0 +1,118 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.windows import Window
+
+def _band_indexes(src, bands):
+    """0-based band list -> rasterio's 1-based indexes (all bands when None)."""
+    if bands is None:
+        return list(range(1, src.count + 1))
+    return [int(b) + 1 for b in bands]
+
+def _clip_window(block_window, window):
+    """Part of block_window inside window (both in full-image pixels), or None."""
+    row_start = max(block_window.row_off, window.row_off)
+    col_start = max(block_window.col_off, window.col_off)
+    row_stop = min(block_window.row_off + block_window.height, window.row_off + window.height)
+    col_stop = min(block_window.col_off + block_window.width, window.col_off + window.width)
+    if row_stop <= row_start or col_stop <= col_start:
+        return None
+    return Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+def iter_tiff_blocks(src, bands=None, window=None):
+    """
+    Walks the internal block windows of a GeoTIFF (tiles or strips, as stored in the file)
+    and yields (window, block_array) with block_array in BIP order: (block_rows, block_cols, bands).
+    src can be a path or an already open rasterio dataset.
+    When window (a rasterio Window) is given, only the parts of the blocks inside it are read.
+    Only one block is held in memory at a time, so scenes larger than RAM can be streamed.
+    """
+    if not hasattr(src, 'block_windows'):
+        with rasterio.open(src) as dataset:
+            yield from iter_tiff_blocks(dataset, bands, window)
+        return
+
+    indexes = _band_indexes(src, bands)
+    for _, block_window in src.block_windows(1):
+        if window is not None:
+            block_window = _clip_window(block_window, window)
+            if block_window is None:
+                continue
+        block = src.read(indexes, window=block_window)
+        yield block_window, np.moveaxis(block, 0, -1)
+
+def read_tiff_bip(src, bands=None, dtype=None, block_callback=None, window=None):
+    """
+    Reads a GeoTIFF into one preallocated (rows, cols, bands) array, block by block,
+    instead of reading the whole (bands, rows, cols) file and transposing it (two full copies).
+    With window (a rasterio Window) only that region is read and returned.
+    block_callback(window, block_array), if given, is called for every block, e.g. to
+    build the valid-pixel mask while the file is being read. Its window is relative to
+    the returned array.
+    """
+    indexes = _band_indexes(src, bands)
+    dtype = np.dtype(dtype) if dtype is not None else np.dtype(src.dtypes[indexes[0] - 1])
+    if window is None:
+        window = Window(0, 0, src.width, src.height)
+    window = window.round_offsets().round_lengths()
+    image_array = np.empty((int(window.height), int(window.width), len(indexes)), dtype=dtype)
+
+    for block_window, block in iter_tiff_blocks(src, bands, window):
+        block_window = Window(block_window.col_off - window.col_off, block_window.row_off - window.row_off,
+                              block_window.width, block_window.height)
+        row_slice, col_slice = block_window.toslices()
+        image_array[row_slice, col_slice] = block
+        if block_callback is not None:
+            block_callback(block_window, block)
+
+    return image_array
+
+def read_overview_bip(path, bands=None, max_size=4096, window=None):
+    """
+    Reads the given bands of a GeoTIFF at a reduced resolution whose longest side is max_size,
+    as (rows, cols, bands). GDAL serves such decimated reads from the internal overview level
+    closest to that size, so only a fraction of the file is read.
+    With window (a rasterio Window, in full resolution pixels) only that region is read.
+    Returns None when the file has no overviews or the region is already smaller than max_size.
+    """
+    with rasterio.open(path) as src:
+        if not src.overviews(1):
+            return None
+        
+        if window is None:
+            window = Window(0, 0, src.width, src.height)
+        scale = max_size / max(window.width, window.height)
+        if scale >= 1:
+            return None
+        
+        indexes = _band_indexes(src, bands)
+        out_shape = (len(indexes), max(1, int(window.height * scale)), max(1, int(window.width * scale)))
+        data = src.read(indexes, window=window, out_shape=out_shape, resampling=Resampling.nearest)
+        return np.moveaxis(data, 0, -1)
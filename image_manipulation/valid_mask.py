@@ -0,0 +1,124 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import numpy as np
+
+class ValidMask:
+    """
+    Compact replacement for the old list of (row, col) tuples.
+    Holds a 2D boolean array of valid pixels and caches the flat (row-major)
+    indices of the valid pixels as an int array, which is what the rest of the
+    code uses to gather and scatter pixel values.
+    Iterating over it still yields (row, col) tuples, in the same order as before.
+    """
+    def __init__(self, valid):
+        valid = np.asarray(valid, dtype=bool)
+        if valid.ndim != 2:
+            raise ValueError("Valid mask must be a 2D array")
+        self.valid = valid
+        self._flat_indices = None
+        self._row_indices = None
+        self._col_indices = None
+
+    @classmethod
+    def from_indices(cls, indices, shape):
+        """Builds a mask from an iterable of (row, col) pairs."""
+        valid = np.zeros(shape, dtype=bool)
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1, 2)
+        if indices.size > 0:
+            valid[indices[:, 0], indices[:, 1]] = True
+        return cls(valid)
+
+    @property
+    def shape(self):
+        return self.valid.shape
+
+    @property
+    def flat_indices(self):
+        """Flat indices of the valid pixels into a (rows * cols) raster."""
+        if self._flat_indices is None:
+            self._flat_indices = np.flatnonzero(self.valid)
+        return self._flat_indices
+
+    @property
+    def row_indices(self):
+        if self._row_indices is None:
+            self._row_indices, self._col_indices = np.divmod(self.flat_indices, self.valid.shape[1])
+        return self._row_indices
+
+    @property
+    def col_indices(self):
+        if self._col_indices is None:
+            self._row_indices, self._col_indices = np.divmod(self.flat_indices, self.valid.shape[1])
+        return self._col_indices
+
+    @property
+    def count(self):
+        if self._flat_indices is None:
+            # Counting does not need the flat indices, so don't build them just for this
+            return int(np.count_nonzero(self.valid))
+        return len(self.flat_indices)
+
+    @property
+    def nbytes(self):
+        cached = [self._flat_indices, self._row_indices, self._col_indices]
+        return self.valid.nbytes + sum(a.nbytes for a in cached if a is not None)
+
+    def coordinates(self):
+        """Returns an (n_pixels, 2) array of (row, col), like np.argwhere."""
+        return np.column_stack((self.row_indices, self.col_indices))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return zip(self.row_indices.tolist(), self.col_indices.tolist())
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return int(self.row_indices[idx]), int(self.col_indices[idx])
+        return self.coordinates()[idx]
+
+    def __repr__(self):
+        return f"ValidMask(shape={self.shape}, valid={self.count})"
+
+def as_valid_mask(non_masked_indices, shape):
+    """
+    Returns non_masked_indices as a ValidMask.
+    Accepts a ValidMask, a 2D boolean array or a sequence of (row, col) pairs.
+    """
+    shape = tuple(shape)
+    if isinstance(non_masked_indices, ValidMask):
+        mask = non_masked_indices
+    elif isinstance(non_masked_indices, np.ndarray) and non_masked_indices.dtype == bool:
+        mask = ValidMask(non_masked_indices)
+    else:
+        return ValidMask.from_indices(list(non_masked_indices), shape)
+
+    if mask.shape != shape:
+        raise ValueError(f"Mask shape {mask.shape} does not match image shape {shape}")
+    return mask
@@ -0,0 +1,55 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import os
+import numpy as np
+
+# Floating point types pixel data can be processed in
+SUPPORTED_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+def _parse_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported working dtype: {dtype} (use float32 or float64)")
+    return dtype
+
+# float32 halves memory and roughly doubles BLAS throughput compared with float64,
+# and is precise enough for reflectance/radiance data. Can be overridden with the
+# AETHERGEO_WORKING_DTYPE environment variable or set_working_dtype.
+_working_dtype = _parse_dtype(os.environ.get('AETHERGEO_WORKING_DTYPE', 'float32'))
+
+def get_working_dtype():
+    """Dtype used for pixel data in memory, in every operation and in saved results."""
+    return _working_dtype
+
+def set_working_dtype(dtype):
+    global _working_dtype
+    _working_dtype = _parse_dtype(dtype)
+
+def as_working_dtype(array):
+    """Casts array to the working dtype, without a copy when it already has it."""
+    return np.asarray(array).astype(_working_dtype, copy=False)
@@ -166,7 +166,7 @@ class BandRatiosControlsView(QWidget):
                 self,
                 "Save Results",
                 "",
-                "TIF Files (*.tif);;All Files (*.*)"
+                "TIF Files (*.tif);;ENVI Files (*.hdr);;All Files (*.*)"
             )
             
             if output_path:
@@ -183,27 +183,14 @@ class BandRatiosControlsView(QWidget):
                 non_masked_indices = image_data["non_masked_indices"]
 
                 if self.result_data is not None:
-                    reconstructed = saving.image_recovery(
-                        self.result_data.reshape(-1, 1),
-                        non_masked_indices,
-                        metadata["rows"],
-                        metadata["cols"]
-                    )
-                    
-                    saving.save_image(
+                    self.parent.parent.save_in_background(
                         output_path,
-                        reconstructed,
-                        metadata["map_info"],
-                        metadata["coordinates"],
-                        metadata["cols"],
-                        metadata["rows"],
-                        metadata["pixel_size_x"],
-                        metadata["pixel_size_y"],
-                        metadata["x_origin"],
-                        metadata["y_origin"],
-                        None
+                        saving.save_pixels,
+                        self.result_data,
+                        non_masked_indices,
+                        metadata,
+                        success_message="Band operation results saved!"
                     )
-                    QMessageBox.information(self, "Success", "Band operation results saved!")
                 else:
                     QMessageBox.warning(self, "Error", "No results to save. Run the analysis first.")
         except Exception as e:
@@ -0,0 +1,253 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from PyQt6.QtWidgets import QMessageBox
+
+from image_manipulation.gather_scatter import gather_pixels
+from image_manipulation.working_dtype import get_working_dtype
+
+# Pixels per block handed to a worker: a few (block, bands) float64 temporaries each
+DEFAULT_BLOCK_PIXELS = 16384
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Worker processes shared by every run, see process_pool
+_POOL = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+def process_pool(n_workers=DEFAULT_WORKERS):
+    """
+    Process pool of n_workers, started on first use and reused by later runs.
+    Workers are spawned, not forked: the GUI process runs Qt and thread pools
+    (loading, saving), and forking a multithreaded process can deadlock the children.
+    """
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != n_workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'))
+            _POOL_WORKERS = n_workers
+        return _POOL
+
+def shutdown_process_pool():
+    """Stops the worker processes (when the application closes, or after the pool broke)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+def band_positions(wavelengths, bands):
+    """x axis of the hull: the wavelengths when they are known, the band numbers otherwise."""
+    if wavelengths is None or len(wavelengths) != bands:
+        return np.arange(bands, dtype=np.float64)
+    return np.asarray([float(w) for w in wavelengths], dtype=np.float64)
+
+def upper_hull_continuum(spectra, x):
+    """
+    Continuum (upper convex hull, interpolated at every band) of a block of spectra
+    sharing the same increasing x, shape (n_pixels, bands).
+    Andrew's monotone chain run for all pixels at once: every pixel keeps its own stack
+    of hull vertices, with the last two held in dense arrays. Band by band, the test
+    against the new point is one dense pass over the block, and only the pixels that
+    pop a vertex go on to the (fancy indexed) pop loop.
+    """
+    y = np.ascontiguousarray(spectra, dtype=np.float64)
+    n, bands = y.shape
+    rows = np.arange(n)
+    flat_y = y.ravel()
+    by_band = np.ascontiguousarray(y.T)
+    base = rows * bands
+    stack = np.empty(n * bands, dtype=np.intp)  # Band index of the hull vertices, per pixel row
+    top = np.zeros(n, dtype=np.intp)
+    # (x, y) of the second to last (a) and last (b) vertex of every stack
+    ax, ay, bx, by = (np.zeros(n) for _ in range(4))
+
+    for j in range(bands):
+        xj, yj = x[j], by_band[j]
+        if j >= 2:
+            # b is under (or on) the chord a -> j: pop it, and keep popping while that holds
+            active = np.flatnonzero((bx - ax) * (yj - ay) - (by - ay) * (xj - ax) >= 0)
+            while active.size:
+                top[active] -= 1
+                bx[active], by[active] = ax[active], ay[active]
+                active = active[top[active] >= 2]
+                k = stack[base[active] + top[active] - 2]
+                ax[active], ay[active] = x[k], flat_y[base[active] + k]
+                cross = ((bx[active] - ax[active]) * (yj[active] - ay[active])
+                         - (by[active] - ay[active]) * (xj - ax[active]))
+                active = active[cross >= 0]
+        stack[base + top] = j
+        top += 1
+        ax, ay, bx, by = bx, by, ax, ay
+        bx.fill(xj)
+        by[:] = yj
+
+    # Hull vertices of each pixel, then the vertices left and right of every band
+    stack = stack.reshape(n, bands)
+    on_hull = np.zeros((n, bands), dtype=bool)
+    in_stack = np.arange(bands) < top[:, np.newaxis]
+    on_hull[np.repeat(rows, top), stack[in_stack]] = True
+    band_idx = np.arange(bands)
+    left = np.maximum.accumulate(np.where(on_hull, band_idx, 0), axis=1)
+    right = np.minimum.accumulate(np.where(on_hull, band_idx, bands - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    y_left = np.take_along_axis(y, left, axis=1)
+    y_right = np.take_along_axis(y, right, axis=1)
+    dx = x[right] - x[left]
+    t = np.divide(x - x[left], dx, out=np.zeros_like(dx), where=dx > 0)
+    return y_left + (y_right - y_left) * t
+
+def remove_continuum_block(spectra, x):
+    """Continuum-removed (spectrum / hull) block; bands where the hull is 0 are left at 1."""
+    continuum = upper_hull_continuum(spectra, x)
+    return np.divide(spectra, continuum, out=np.ones_like(continuum), where=continuum != 0)
+
+def continuum_removal(pixels, x, block_pixels=DEFAULT_BLOCK_PIXELS, n_workers=DEFAULT_WORKERS, progress_callback=None):
+    """
+    Continuum removal of a gathered (n_pixels, bands) matrix, written back into it.
+    x = band positions (wavelengths), sorted here if they are not increasing.
+    Blocks of block_pixels pixels are spread over the shared process pool (the hull is
+    many small vectorized steps, which would contend for the GIL in threads); with
+    n_workers <= 1, or if worker processes can't be started, it runs in this process.
+    progress_callback(pixels_done, n_pixels) is called after every block; an exception
+    raised from it stops the run.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if pixels.ndim != 2 or pixels.shape[1] != len(x):
+        raise ValueError("Expected an (n_pixels, bands) matrix with one position per band")
+    
+    order = np.argsort(x, kind='stable')
+    sorted_x = x[order]
+    is_sorted = np.array_equal(order, np.arange(len(x)))
+    starts = range(0, pixels.shape[0], block_pixels)
+
+    def block(start):
+        if is_sorted:
+            return pixels[start:start + block_pixels]
+        return pixels[start:start + block_pixels][:, order]
+
+    done = set()  # Blocks already written back (the fallback must not process them twice)
+
+    def store(start, result):
+        done.add(start)
+        if is_sorted:
+            pixels[start:start + block_pixels] = result
+        else:
+            pixels[start:start + block_pixels][:, order] = result
+        if progress_callback is not None:
+            progress_callback(min(len(done) * block_pixels, pixels.shape[0]), pixels.shape[0])
+
+    if n_workers > 1 and len(starts) > 1:
+        # At most two blocks per worker in flight, so the copies sent to the workers stay bounded
+        pending = deque()
+        try:
+            pool = process_pool(n_workers)
+            for start in starts:
+                pending.append((start, pool.submit(remove_continuum_block, block(start), sorted_x)))
+                if len(pending) >= 2 * n_workers:
+                    done_start, future = pending.popleft()
+                    store(done_start, future.result())
+            while pending:
+                done_start, future = pending.popleft()
+                store(done_start, future.result())
+            return pixels
+        except (BrokenProcessPool, OSError) as e:
+            print(f"Warning: continuum removal process pool failed ({e}), running in-process")
+            shutdown_process_pool()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    for start in starts:
+        if start not in done:
+            store(start, remove_continuum_block(block(start), sorted_x))
+    return pixels
+
+class ContinuumRemovalOperations:
+    def __init__(self, parent):
+        """
+        Initialize continuum removal operations with parent reference to access necessary data
+        parent: FunctionListItem instance
+        """
+        self.parent = parent
+        self.main_window = parent.parent
+
+    def execute(self, path, mask_path):
+        """Execute convex-hull continuum removal on the selected image"""
+        try:
+            image_data = self.main_window.image_data[path]
+            metadata = image_data["metadata"]
+            # Default: use the image's own non_masked_indices
+            non_masked_indices = image_data["non_masked_indices"]
+
+            if mask_path is not None and mask_path in self.main_window.image_data:
+                cols, rows = metadata["cols"], metadata["rows"]
+                mask_metadata = self.main_window.image_data[mask_path]["metadata"]
+                if cols != mask_metadata["cols"] or rows != mask_metadata["rows"]:
+                    QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")
+                    return
+                non_masked_indices = self.main_window.image_data[mask_path]["non_masked_indices"]
+
+            if metadata["bands"] < 3:
+                QMessageBox.warning(self.parent, "Error", "Continuum removal needs at least 3 bands.")
+                return
+            x = band_positions(metadata["wavelengths"], metadata["bands"])
+
+            result_store = self.main_window.result_store
+            result_key = result_store.key(path, "Continuum Removal", {"x": x}, non_masked_indices)
+
+            def work(progress_callback):
+                return result_store.get_or_compute(
+                    result_key,
+                    lambda: continuum_removal(gather_pixels(image_data["array"], non_masked_indices), x,
+                                              progress_callback=progress_callback).astype(get_working_dtype(), copy=False))
+
+            # Runs on the background task queue, the window stays responsive
+            self.main_window.run_in_background(f"Continuum Removal ({os.path.basename(path)})", work, self.store_results)
+
+        except Exception as e:
+            QMessageBox.critical(self.parent, "Error", f"Continuum removal failed: {str(e)}")
+
+    def store_results(self, result):
+        """Called on the GUI thread once the background run is done"""
+        if "Continuum Removal" in self.parent.control_views:
+            control_view = self.parent.control_views["Continuum Removal"].widget()
+            control_view.result_data = result
+            QMessageBox.information(self.parent, "Success", "Continuum removal completed!")
+        else:
+            print("Warning: Continuum Removal control view not found to store results.")
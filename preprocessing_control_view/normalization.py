@@ -27,10 +27,10 @@ If you want to contact the author, please send an email to aethergeoofficial@gma
 
 import os
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QComboBox, QMessageBox, QFileDialog
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QMessageBox, QFileDialog
 
-from image_manipulation.manipulation import image_recovery
-from image_manipulation.saving import save_image
+from image_manipulation.saving import save_pixels
+from preprocessing_control_view.normalization_engine import SCALERS, load_scaler, save_scaler
 
 class NormalizationControlsView(QWidget):
     """Control view for data normalization."""
@@ -40,6 +40,8 @@ class NormalizationControlsView(QWidget):
         self.run_callback = run_callback
         self.parent = parent  # Parent is FunctionListItem
         self.result_data = None  
+        self.fitted_scaler = None  # Scaler (method + parameters) used for result_data
+        self.loaded_scaler = None  # Parameters loaded from a file, reapplied instead of fitting
         self.setup_ui()
 
     def setup_ui(self):
@@ -66,6 +68,26 @@ class NormalizationControlsView(QWidget):
         layout.addWidget(QLabel("Select Mask (optional):"))
         layout.addWidget(self.mask_combo)
 
+        self.method_combo = QComboBox()
+        self.method_combo.setFixedHeight(35)
+        for method, scaler in SCALERS.items():
+            self.method_combo.addItem(scaler.label, method)
+        layout.addWidget(QLabel("Method:"))
+        layout.addWidget(self.method_combo)
+
+        params_layout = QHBoxLayout()
+        load_params_btn = QPushButton("Load Parameters")
+        load_params_btn.clicked.connect(self.load_parameters)
+        save_params_btn = QPushButton("Save Parameters")
+        save_params_btn.clicked.connect(self.save_parameters)
+        params_layout.addWidget(load_params_btn)
+        params_layout.addWidget(save_params_btn)
+        layout.addLayout(params_layout)
+
+        self.params_label = QLabel("Parameters: fitted on the selected image")
+        self.params_label.setWordWrap(True)
+        layout.addWidget(self.params_label)
+
         run_btn = QPushButton(f"Run {self.function_name}")
         run_btn.clicked.connect(self.execute_function)
         layout.addWidget(run_btn, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -99,10 +121,62 @@ class NormalizationControlsView(QWidget):
 
         if self.run_callback:
             try:
-                self.run_callback(path, mask_path)
+                self.run_callback(path, mask_path, self.method_combo.currentData(), self.loaded_scaler)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Normalization failed: {str(e)}")
 
+    def load_parameters(self):
+        """Load fitted parameters, to normalize with them instead of the selected image's statistics."""
+        if self.loaded_scaler is not None:
+            self.loaded_scaler = None
+            self.params_label.setText("Parameters: fitted on the selected image")
+            self.method_combo.setEnabled(True)
+            return
+        
+        params_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Load Normalization Parameters",
+            "",
+            "Normalization Parameters (*.json);;All Files (*.*)"
+        )
+        if not params_path:
+            return
+        try:
+            self.loaded_scaler = load_scaler(params_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not load parameters: {str(e)}")
+            return
+        
+        self.method_combo.setCurrentIndex(self.method_combo.findData(self.loaded_scaler.method))
+        self.method_combo.setEnabled(False)
+        self.params_label.setText(f"Parameters: {os.path.basename(params_path)} (click Load Parameters again to clear)")
+
+    def save_parameters(self):
+        """Save the method and fitted parameters of the last run."""
+        if self.fitted_scaler is None:
+            QMessageBox.warning(self, "Error", "No fitted parameters to save. Run normalization first.")
+            return
+
+        output_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Normalization Parameters",
+            "",
+            "Normalization Parameters (*.json);;All Files (*.*)"
+        )
+        if not output_path:
+            return
+        if not output_path.lower().endswith('.json'):
+            output_path += '.json'
+        try:
+            path = self.image_combo.currentData()
+            wavelengths = None
+            if path in self.parent.parent.image_data:
+                wavelengths = self.parent.parent.image_data[path]["metadata"]["wavelengths"]
+            save_scaler(self.fitted_scaler, output_path, wavelengths)
+            QMessageBox.information(self, "Success", "Normalization parameters saved.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save parameters: {str(e)}")
+
     def save_dialog(self):
         """Save the normalized image."""
         if self.result_data is None:
@@ -114,7 +188,7 @@ class NormalizationControlsView(QWidget):
                 self,
                 "Save Normalized Image",
                 "",
-                "TIF Files (*.tif);;All Files (*.*)"
+                "TIF Files (*.tif);;ENVI Files (*.hdr);;All Files (*.*)"
             )
             if not output_path:
                 return
@@ -133,28 +207,15 @@ class NormalizationControlsView(QWidget):
                     non_masked_indices = image_data["non_masked_indices"]
                 
                 if hasattr(self, 'result_data'):
-                    reconstructed = image_recovery(
+                    self.parent.parent.save_in_background(
+                        output_path,
+                        save_pixels,
                         self.result_data,
                         non_masked_indices,
-                        metadata["rows"],
-                        metadata["cols"]
-                        
-                    )
-                    
-                    save_image(
-                        output_path,
-                        reconstructed,
-                        metadata["map_info"],
-                        metadata["coordinates"],
-                        metadata["cols"],
-                        metadata["rows"],
-                        metadata["pixel_size_x"],
-                        metadata["pixel_size_y"],
-                        metadata["x_origin"],
-                        metadata["y_origin"],
-                        metadata["wavelengths"]
+                        metadata,
+                        wavelengths=metadata["wavelengths"],
+                        success_message="Normalized image saved successfully."
                     )
-                    QMessageBox.information(self, "Success", "Normalized image saved successfully.")
                 
                 else:
                     QMessageBox.warning(self, "Error", "No results available to save. Please run the analysis first.")
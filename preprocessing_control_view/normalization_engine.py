@@ -0,0 +1,237 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import json
+
+import numpy as np
+
+from preprocessing_control_view.pixel_normalization import DEFAULT_CHUNK_ROWS, apply_in_blocks, minmax_block, row_blocks
+
+class Scaler:
+    """
+    A normalization method. Scene-wide statistics are accumulated block by block with
+    partial_fit (one streaming pass) and turned into parameters by finish_fit.
+    transform_block then normalizes a block of pixels in place using only those
+    parameters, so a fitted scaler can be saved and reapplied to other scenes or tiles.
+    """
+    method = None
+    label = None
+    needs_fit = True
+
+    def __init__(self, params=None):
+        self.params = {name: np.asarray(value, dtype=np.float64) for name, value in (params or {}).items()}
+        self.fitted = not self.needs_fit or bool(self.params)
+
+    def partial_fit(self, block):
+        pass
+
+    def finish_fit(self):
+        self.fitted = True
+
+    def transform_block(self, block):
+        raise NotImplementedError
+
+    @property
+    def bands(self):
+        """Number of bands the parameters were fitted on (None if they don't depend on it)."""
+        for value in self.params.values():
+            if value.ndim == 1:
+                return len(value)
+        return None
+
+    def check_bands(self, bands):
+        if self.bands is not None and self.bands != bands:
+            raise ValueError(f"Parameters were fitted on {self.bands} bands, the image has {bands}")
+
+class PixelMinMaxScaler(Scaler):
+    """Every pixel spectrum scaled to [0, 1] (no scene statistics)."""
+    method = 'pixel_minmax'
+    label = 'Pixel-wise Min-Max'
+    needs_fit = False
+
+    def transform_block(self, block):
+        minmax_block(block)
+
+class BandMinMaxScaler(Scaler):
+    """Every band scaled to [0, 1] with the scene minimum and maximum of that band."""
+    method = 'band_minmax'
+    label = 'Band-wise Min-Max'
+
+    def partial_fit(self, block):
+        block_min = block.min(axis=0).astype(np.float64)
+        block_max = block.max(axis=0).astype(np.float64)
+        if 'min' not in self.params:
+            self.params['min'], self.params['max'] = block_min, block_max
+        else:
+            np.minimum(self.params['min'], block_min, out=self.params['min'])
+            np.maximum(self.params['max'], block_max, out=self.params['max'])
+
+    def transform_block(self, block):
+        min_vals = self.params['min'].astype(block.dtype)
+        range_vals = (self.params['max'] - self.params['min']).astype(block.dtype)
+        range_vals[range_vals == 0] = 1  # Avoid division by zero for flat bands
+        block -= min_vals
+        block /= range_vals
+
+class BandZScoreScaler(Scaler):
+    """Every band centred on its scene mean and divided by its scene standard deviation."""
+    method = 'band_zscore'
+    label = 'Band-wise Z-score'
+
+    def __init__(self, params=None):
+        super().__init__(params)
+        self._count = 0
+        self._mean = None
+        self._m2 = None
+
+    def partial_fit(self, block):
+        """Welford/Chan update: block mean and sum of squared deviations merged into the running ones."""
+        n = block.shape[0]
+        if n == 0:
+            return
+        block_mean = block.mean(axis=0, dtype=np.float64)
+        block_m2 = np.square(block - block_mean.astype(block.dtype), dtype=np.float64).sum(axis=0)
+        if self._mean is None:
+            self._count, self._mean, self._m2 = n, block_mean, block_m2
+            return
+
+        total = self._count + n
+        delta = block_mean - self._mean
+        self._mean = self._mean + delta * (n / total)
+        self._m2 = self._m2 + block_m2 + delta ** 2 * (self._count * n / total)
+        self._count = total
+
+    def finish_fit(self):
+        if self._mean is None:
+            raise ValueError("No pixels to compute the statistics from")
+        self.params['mean'] = self._mean
+        self.params['std'] = np.sqrt(self._m2 / self._count)
+        super().finish_fit()
+
+    def transform_block(self, block):
+        std = self.params['std'].astype(block.dtype)
+        std[std == 0] = 1  # Constant bands are only centred
+        block -= self.params['mean'].astype(block.dtype)
+        block /= std
+
+class L2Scaler(Scaler):
+    """Every pixel spectrum divided by its Euclidean norm (vector normalization, no scene statistics)."""
+    method = 'l2'
+    label = 'L2 (vector) normalization'
+    needs_fit = False
+
+    def transform_block(self, block):
+        norms = np.sqrt(np.einsum('ij,ij->i', block, block))[:, np.newaxis]
+        norms[norms == 0] = 1
+        block /= norms
+
+class BrightnessScaler(Scaler):
+    """
+    Every pixel spectrum divided by its mean brightness (mean over the bands), then
+    multiplied by the mean brightness of the scene, so shading/illumination differences
+    are removed while values stay in the scene's range.
+    """
+    method = 'brightness'
+    label = 'Brightness normalization'
+
+    def __init__(self, params=None):
+        super().__init__(params)
+        self._count = 0
+        self._sum = 0.0
+
+    def partial_fit(self, block):
+        self._sum += float(block.mean(axis=1, dtype=np.float64).sum())
+        self._count += block.shape[0]
+
+    def finish_fit(self):
+        if self._count == 0:
+            raise ValueError("No pixels to compute the statistics from")
+        self.params['scene_brightness'] = np.asarray(self._sum / self._count)
+        super().finish_fit()
+
+    def transform_block(self, block):
+        brightness = block.mean(axis=1, keepdims=True)
+        brightness[brightness == 0] = 1
+        block /= brightness
+        block *= block.dtype.type(self.params['scene_brightness'])
+
+SCALERS = {scaler.method: scaler for scaler in (
+    PixelMinMaxScaler, BandMinMaxScaler, BandZScoreScaler, L2Scaler, BrightnessScaler
+)}
+
+def create_scaler(method, params=None):
+    if method not in SCALERS:
+        raise ValueError(f"Unknown normalization method: {method}")
+    return SCALERS[method](params)
+
+def fit_scaler(scaler, pixels, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Computes the scene statistics of scaler in one streaming pass over pixels:
+    a gathered (n_pixels, bands) matrix, or anything sliceable by rows (np.memmap,
+    h5py dataset), read chunk_rows pixels at a time.
+    """
+    if not scaler.needs_fit:
+        return scaler
+    for start, stop in row_blocks(pixels.shape[0], chunk_rows):
+        scaler.partial_fit(np.asarray(pixels[start:stop]))
+    scaler.finish_fit()
+    return scaler
+
+def normalize_pixels(scaler, pixels, chunk_rows=DEFAULT_CHUNK_ROWS, n_threads=1):
+    """
+    Normalizes a gathered (n_pixels, bands) matrix in place, fitting the scaler
+    first if it has no parameters yet. Returns pixels.
+    """
+    scaler.check_bands(pixels.shape[1])
+    if not scaler.fitted:
+        fit_scaler(scaler, pixels, chunk_rows)
+    return apply_in_blocks(pixels, scaler.transform_block, chunk_rows, n_threads)
+
+def scaler_to_json(scaler, wavelengths=None):
+    description = {
+        'method': scaler.method,
+        'params': {name: value.tolist() for name, value in scaler.params.items()}
+    }
+    if wavelengths is not None:
+        description['wavelengths'] = [float(w) for w in wavelengths]
+    return json.dumps(description)
+
+def scaler_from_json(text):
+    description = json.loads(text)
+    return create_scaler(description['method'], description.get('params'))
+
+def save_scaler(scaler, path, wavelengths=None):
+    """Writes the method and fitted parameters to a JSON file, to reapply them later with load_scaler."""
+    if not scaler.fitted:
+        raise ValueError("Scaler has not been fitted yet")
+    with open(path, 'w') as f:
+        f.write(scaler_to_json(scaler, wavelengths))
+    return path
+
+def load_scaler(path):
+    with open(path, 'r') as f:
+        return scaler_from_json(f.read())
@@ -0,0 +1,77 @@
+"""
+AetherGeo is a software for data analysis, centered around geological applications.>
+Copyright (C) <2025>  <Gonçalo Santos>
+Version 1.0.0
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+A full copy of the GNU General Public License can be found under the License file.
+Otherwise, see <https://www.gnu.org/licenses/>
+
+The author would like to give the sincerest thanks to all the individuals (single and plural) that built and still
+manage and maintain all the libraries that made this application possible. 
+The main interface is built in PyQt6, developed and maintained by Riverbank Computing (https://www.riverbankcomputing.com/software/pyqt/).
+Also, a special thanks to the individuals behind: NumPy, OpenGL, Matplotlib, Spectral, Rasterio, UMAP, Sklearn and SciPy and scikit-image, h5py and pyproj.
+It is also important to cite that this software is free and open source, in this way providing to the community a new accessible tool. 
+
+If you want to contact the author, please send an email to aethergeoofficial@gmail.com or up202004466@up.pt
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Pixels (rows of the gathered matrix) normalized per block
+DEFAULT_CHUNK_ROWS = 65536
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+
+def row_blocks(n_rows, chunk_rows):
+    """(start, stop) of consecutive blocks of chunk_rows rows."""
+    for start in range(0, n_rows, chunk_rows):
+        yield start, min(start + chunk_rows, n_rows)
+
+def minmax_block(block):
+    """Scales every row (pixel spectrum) of block to [0, 1], in place."""
+    min_vals = block.min(axis=1, keepdims=True)
+    range_vals = block.max(axis=1, keepdims=True)
+    range_vals -= min_vals
+    range_vals[range_vals == 0] = 1  # Avoid division by zero for flat pixels
+    block -= min_vals
+    block /= range_vals
+
+def apply_in_blocks(pixels, block_function, chunk_rows=DEFAULT_CHUNK_ROWS, n_threads=1):
+    """
+    Runs block_function(block) in place over blocks of chunk_rows rows of a gathered
+    (n_pixels, bands) matrix; with n_threads > 1 the blocks are spread over a thread pool
+    (NumPy releases the GIL in the reductions and the arithmetic). Returns pixels.
+    """
+    if pixels.ndim != 2:
+        raise ValueError("Expected an (n_pixels, bands) matrix")
+    if not np.issubdtype(pixels.dtype, np.floating):
+        raise ValueError(f"In-place normalization needs a floating point matrix, got {pixels.dtype}")
+
+    blocks = [pixels[start:stop] for start, stop in row_blocks(pixels.shape[0], chunk_rows)]
+    if n_threads > 1 and len(blocks) > 1:
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            list(pool.map(block_function, blocks))
+    else:
+        for block in blocks:
+            block_function(block)
+    return pixels
+
+def pixel_minmax_normalize(pixels, chunk_rows=DEFAULT_CHUNK_ROWS, n_threads=1):
+    """
+    Pixel-wise Min-Max scaling to [0, 1] of a gathered (n_pixels, bands) matrix, in place.
+    Works on blocks of chunk_rows pixels, so the only temporaries are two (chunk_rows, 1)
+    columns per block. Returns pixels.
+    """
+    return apply_in_blocks(pixels, minmax_block, chunk_rows, n_threads)
@@ -113,7 +113,7 @@ class WavelengthsControlsView(QWidget):
                 self,
                 "Save Processed Image",
                 "",
-                "TIF Files (*.tif);;All Files (*.*)"
+                "TIF Files (*.tif);;ENVI Files (*.hdr);;All Files (*.*)"
             )
             if output_path:
                 if not output_path.lower().endswith(('.tif', '.hdr')):
@@ -125,11 +125,12 @@ class WavelengthsControlsView(QWidget):
                 metadata = image_data["metadata"]
                 wavelengths = self.result_data
                 
-                saving.save_image(output_path, array, metadata["map_info"], metadata["coordinates"], 
-                                  metadata["cols"], metadata["rows"], metadata["pixel_size_x"], metadata["pixel_size_y"],
-                                  metadata["x_origin"], metadata["y_origin"], wavelengths)
-                
-                QMessageBox.information(self, "Success", "Image saved successfully.")
+                self.parent.parent.save_in_background(
+                    output_path, saving.save_image, array, metadata["map_info"], metadata["coordinates"], 
+                    metadata["cols"], metadata["rows"], metadata["pixel_size_x"], metadata["pixel_size_y"],
+                    metadata["x_origin"], metadata["y_origin"], wavelengths,
+                    success_message="Image saved successfully."
+                )
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Save failed: {str(e)}")
\ No newline at end of file
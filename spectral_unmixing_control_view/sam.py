@@ -29,7 +29,7 @@ import numpy as np
 
 from PyQt6.QtWidgets import QMessageBox
 
-from image_manipulation import manipulation
+from image_manipulation.gather_scatter import gather_pixels
 
 from spec_library_managment.spec_manipulation import get_spectrum_by_name
 
@@ -46,7 +46,6 @@ class SAMOperations:
         """Execute SAM with given parameters"""
         try:
             image_data = self.main_window.image_data[path]
-            array = image_data["array"]
             metadata = image_data["metadata"]
             # Default: use the image's own non_masked_indices
             non_masked_indices = image_data["non_masked_indices"]
@@ -63,18 +62,19 @@ class SAMOperations:
                         QMessageBox.warning(self.parent, "Error", "Image and mask dimensions do not match.")    
                         return
             
-            masked_array = manipulation.retrieve_reduction_on_ppi(array, non_masked_indices)
-    
             spectral_library = control_view.libraries_combo.currentData()
             spectrum = get_spectrum_by_name(self.main_window.spectral_libraries[spectral_library]['library_array'],
                                             self.main_window.spectral_libraries[spectral_library]['metadata']['spectra_names'], 
                                             spectrum_name)
             
-            if masked_array.shape[1] != len(spectrum):
+            if metadata["bands"] != len(spectrum):
                 QMessageBox.warning(self.parent, "Error", "Spectrum length does not match image bands.")    
                 return
             
-            results = self.sam(masked_array, spectrum)
+            result_store = self.main_window.result_store
+            result_key = result_store.key(path, "SAM", {"spectrum": np.asarray(spectrum)}, non_masked_indices)
+            results = result_store.get_or_compute(
+                result_key, lambda: self.sam(gather_pixels(image_data["array"], non_masked_indices), spectrum))
             
             if "SAM" in self.parent.control_views:
                 control_view = self.parent.control_views["SAM"].widget()
@@ -97,12 +97,13 @@ class SAMOperations:
         Returns:
             sam_scores: numpy array of shape (n_pixels,) containing spectral angles in radians
         """
-        spectrum = spectrum.reshape(-1)
+        # Library spectra are often float64; match the pixels so nothing gets upcast
+        spectrum = np.asarray(spectrum).reshape(-1).astype(masked_array.dtype, copy=False)
         
-        dot_product = np.sum(masked_array * spectrum, axis=1)
+        dot_product = masked_array @ spectrum
         
-        pixel_magnitudes = np.sqrt(np.sum(masked_array**2, axis=1))
-        spectrum_magnitude = np.sqrt(np.sum(spectrum**2))
+        pixel_magnitudes = np.sqrt(np.einsum('ij,ij->i', masked_array, masked_array))
+        spectrum_magnitude = np.sqrt(spectrum @ spectrum)
         
         cos_angle = dot_product / (pixel_magnitudes * spectrum_magnitude)
         